@@ -0,0 +1,357 @@
+"""
+batch_solve.py
+
+Command-line batch runner for collecting solvability statistics.
+
+Solves many deals headlessly (no pygame window) and streams one result per
+deal to a JSONL or CSV file. Deals come from a range of seeds (dealt like
+generate_random_game_state), a range of numbered deals, or a directory of
+board files in the same format as ../boards. Deals are referred to by id ("seed:N", "deal:N"
+for FreeCell-style deal numbers, or "file:PATH"), so any deal can be
+regenerated from its record.
+
+Responsibilities:
+- Spreads deals over a pool of worker processes
+- Enforces a per-deal wall-clock and node budget
+- Appends results as soon as each deal finishes
+- Resumes an interrupted run by skipping deals already in the output file
+  (a partial last line, cut off by the interruption, is dropped first)
+- Records why a deal failed: the exception of a crashed solver is kept in
+  the `error` field
+
+Usage (from the /src directory):
+    python3 batch_solve.py --seeds 0:1000 --solver greedy --time-limit 30 --output ../logs/greedy.jsonl
+    python3 batch_solve.py --deals 1:1000001 --solver ida --time-limit 10 --output ../logs/deals.jsonl
+    python3 batch_solve.py --boards ../boards --solver astar --node-limit 200000 --output ../logs/boards.csv
+    python3 batch_solve.py --seeds 0:100 --solver xbfs --workers 2 --output ../logs/unsolvable.jsonl
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+from solvers.solver_base import SearchStopped
+from solvers.board import deal_board, deal_number_board, load_board
+from solvers.bfs_solver import BFSSolver
+from solvers.dfs_solver import DFSSolver
+from solvers.greedy_solver import GreedySolver
+from solvers.astar_solver import AStarSolver
+from solvers.astar_2_solver import AStar2Solver
+from solvers.ida_star_solver import IDAStarSolver
+from solvers.external_bfs import ExternalBFSSolver
+from solvers.beam_solver import BeamSolver
+from solvers.monte_carlo import NestedMonteCarloSolver
+
+# Solvers selectable with --solver
+SOLVERS = {
+    "dfs": DFSSolver,
+    "bfs": BFSSolver,
+    "greedy": GreedySolver,
+    "astar": AStarSolver,
+    "astar2": AStar2Solver,
+    "ida": IDAStarSolver,
+    "xbfs": ExternalBFSSolver,
+    "beam": BeamSolver,
+    "nmcs": NestedMonteCarloSolver,
+}
+
+# Columns of every result record, in CSV order
+RESULT_FIELDS = ["deal", "solver", "status", "solved", "moves", "nodes_expanded", "time", "error"]
+
+# Largest number of expansions between two budget checks
+BUDGET_CHECK_INTERVAL = 100
+
+
+class BudgetExceeded(SearchStopped):
+    """Raised from a solver's progress callback to stop a deal over budget"""
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+def budget_callback(deadline, node_limit):
+    """
+    Builds a progress callback that aborts the search once the deal is over budget.
+
+    Args:
+        deadline (float or None): time.time() value after which the search stops.
+        node_limit (int or None): Maximum number of node expansions.
+
+    Returns:
+        function: Callback for Solver(progress_callback=...).
+    """
+    def check(solver):
+        if node_limit is not None and solver.nodes_expanded >= node_limit:
+            raise BudgetExceeded("node_limit")
+        if deadline is not None and time.time() >= deadline:
+            raise BudgetExceeded("timeout")
+
+    return check
+
+
+def solve_deal(task):
+    """
+    Worker entry point: solves one deal within its budget.
+
+    Args:
+        task (tuple): (deal id, solver name, time limit, node limit).
+
+    Returns:
+        dict: Result record with the RESULT_FIELDS keys.
+    """
+    return run_deal(task)[0]
+
+
+def run_deal(task):
+    """
+    Solves one deal within its budget, also timing the search alone.
+
+    Args:
+        task (tuple): Same as solve_deal().
+
+    Returns:
+        tuple: (result record, seconds spent in the search itself, or None
+               if the search never started).
+    """
+    deal_id, solver_name, time_limit, node_limit = task
+    start_time = time.time()
+
+    deadline = start_time + time_limit if time_limit is not None else None
+    interval = BUDGET_CHECK_INTERVAL if node_limit is None else max(1, min(BUDGET_CHECK_INTERVAL, node_limit))
+    solver = None
+    error = None
+
+    # Solvers print their own summaries; keep the runner's output readable.
+    # A deal that fails to load is recorded as an error like any other failure.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            solver = SOLVERS[solver_name](
+                load_deal(deal_id),
+                verbose=False,
+                progress_callback=budget_callback(deadline, node_limit),
+                progress_interval=interval,
+            )
+            moves = solver.solve()
+            # An already won board is solved by no moves at all
+            if moves is not None:
+                status = "solved"
+            else:
+                # A dead deal, or an exhaustive search that ran out of states
+                status = "unsolvable" if solver.unsolvable else "unsolved"
+        except BudgetExceeded as exceeded:
+            moves = None
+            status = exceeded.status
+        except Exception as exception:
+            moves = None
+            status = "error"
+            error = f"{type(exception).__name__}: {exception}"
+            traceback.print_exc()
+
+    search_time = None
+    if solver is not None and solver.start_time is not None:
+        search_time = time.time() - solver.start_time
+
+    record = {
+        "deal": deal_id,
+        "solver": solver_name,
+        "status": status,
+        "solved": status == "solved",
+        "moves": len(moves) if moves is not None else None,
+        "nodes_expanded": solver.nodes_expanded if solver is not None else 0,
+        "time": round(time.time() - start_time, 3),
+        "error": error,
+    }
+    return record, search_time
+
+
+def load_deal(deal_id):
+    """
+    Builds the board behind a deal id.
+
+    Args:
+        deal_id (str): "seed:N", "deal:N" or "file:PATH".
+
+    Returns:
+        Board: The packed board.
+    """
+    kind, _, value = deal_id.partition(":")
+    if kind == "seed":
+        return deal_board(int(value))
+    if kind == "deal":
+        return deal_number_board(int(value))
+    return load_board(value)
+
+
+def parse_range(text):
+    """Parses START:STOP (STOP excluded) or a single number into a range"""
+    start, _, stop = text.partition(":")
+    start = int(start)
+    return range(start, int(stop) if stop else start + 1)
+
+
+def collect_deals(args):
+    """
+    Lists the deals selected on the command line.
+
+    Returns:
+        list: Deal ids.
+    """
+    deals = []
+    if args.seeds:
+        deals += [f"seed:{seed}" for seed in parse_range(args.seeds)]
+
+    if args.deals:
+        deals += [f"deal:{number}" for number in parse_range(args.deals)]
+
+    if args.boards:
+        for file_name in sorted(os.listdir(args.boards)):
+            path = os.path.join(args.boards, file_name)
+            if file_name.endswith(".txt") and os.path.isfile(path):
+                deals.append(f"file:{path}")
+
+    return deals
+
+
+def is_csv(path):
+    return path.lower().endswith(".csv")
+
+
+def drop_partial_line(path):
+    """
+    Cuts off the last line of a result file if it has no line end.
+
+    A run killed while writing a record leaves that record incomplete; in
+    CSV the cut row may still parse (with a shortened time, say), and the
+    next record would be appended to it. Dropping it makes the deal run again.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def read_finished(path):
+    """
+    Reads the (deal, solver) pairs already recorded in an output file.
+
+    Run drop_partial_line() first: a truncated last line, left by an
+    interrupted run, is only skipped here when it doesn't parse.
+
+    Args:
+        path (str): JSONL or CSV output file.
+
+    Returns:
+        set: (deal id, solver name) pairs.
+    """
+    finished = set()
+    if not os.path.exists(path):
+        return finished
+
+    with open(path, "r", newline="") as f:
+        if is_csv(path):
+            for row in csv.DictReader(f):
+                if row.get("time"):
+                    finished.add((row["deal"], row["solver"]))
+        else:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                finished.add((record["deal"], record["solver"]))
+
+    return finished
+
+
+class ResultWriter:
+    """
+    Appends result records to a JSONL or CSV file, flushing after each one.
+    The file must end with a complete line (see drop_partial_line()). A CSV
+    file written before a field was added keeps its own columns.
+    """
+
+    def __init__(self, path):
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        fields = RESULT_FIELDS
+        if is_csv(path) and not new_file:
+            with open(path, "r", newline="") as f:
+                fields = next(csv.reader(f))
+
+        self.file = open(path, "a", newline="")
+        self.csv_writer = None
+        if is_csv(path):
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=fields, extrasaction="ignore")
+            if new_file:
+                self.csv_writer.writeheader()
+
+    def write(self, record):
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(record)
+        else:
+            self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many Baker's Dozen deals and record the results.")
+    parser.add_argument("--seeds", help="Seed range START:STOP (STOP excluded) of random deals to solve")
+    parser.add_argument("--deals", help="Range START:STOP of numbered (FreeCell-style) deals to solve")
+    parser.add_argument("--boards", help="Directory of board files (*.txt) to solve")
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default="greedy", help="Solver to run on every deal")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--time-limit", type=float, default=None, help="Wall-clock budget per deal, in seconds")
+    parser.add_argument("--node-limit", type=int, default=None, help="Node expansion budget per deal")
+    parser.add_argument("--output", required=True, help="Result file: .csv for CSV, anything else for JSONL")
+    parser.add_argument("--no-resume", action="store_true", help="Overwrite the output instead of skipping recorded deals")
+    args = parser.parse_args(argv)
+
+    if not args.seeds and not args.deals and not args.boards:
+        parser.error("give --seeds, --deals and/or --boards")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.no_resume and os.path.exists(args.output):
+        os.remove(args.output)
+
+    drop_partial_line(args.output)
+    finished = read_finished(args.output)
+    tasks = [
+        (deal_id, args.solver, args.time_limit, args.node_limit)
+        for deal_id in collect_deals(args)
+        if (deal_id, args.solver) not in finished
+    ]
+    print(f"{len(tasks)} deals to solve ({len(finished)} already recorded) with {args.workers} workers")
+
+    writer = ResultWriter(args.output)
+    solved = 0
+    try:
+        with multiprocessing.Pool(args.workers) as pool:
+            for done, record in enumerate(pool.imap_unordered(solve_deal, tasks), start=1):
+                writer.write(record)
+                solved += record["solved"]
+                print(f"[{done}/{len(tasks)}] {record['deal']}: {record['status']} "
+                      f"({record['nodes_expanded']} nodes, {record['time']:.2f}s)"
+                      + (f" {record['error']}" if record["error"] else ""))
+    finally:
+        writer.close()
+
+    print(f"Solved {solved} of {len(tasks)} deals")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
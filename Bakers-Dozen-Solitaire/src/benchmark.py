@@ -0,0 +1,212 @@
+"""
+benchmark.py
+
+Solver benchmark harness with baseline regression checks.
+
+Runs every solver over a fixed corpus (the ../boards/*.txt files plus a
+fixed set of seeded random deals) and records, for each (solver, deal):
+status, solution length, nodes expanded, wall time, nodes/sec and peak RSS.
+Results are written as JSON so they can be kept as a baseline and compared
+against later runs.
+
+Each run happens in a fresh worker process, one at a time, so timings don't
+compete for cores. Peak RSS is reported as the growth over the worker's own
+peak when the run starts, so pages inherited from this process don't count.
+nodes/sec divides by the time spent searching, deal loading excluded.
+
+Solvers come from batch_solve.SOLVERS. The process-based ones (the
+portfolio, HDA* and parallel DFS) are left out on purpose: a pool worker is daemonic
+and can't start their worker processes, and on several cores they would
+break the one-run-at-a-time rule that keeps timings comparable.
+
+Usage (from the /src directory):
+    python3 benchmark.py --output ../logs/bench_baseline.json
+    python3 benchmark.py --output ../logs/bench.json --baseline ../logs/bench_baseline.json --threshold 0.1
+
+Exits with status 1 when a regression past the threshold is found.
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import sys
+
+from batch_solve import SOLVERS, run_deal
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Corpus: every board file plus these seeded deals (see solvers.board.deal_board)
+BOARDS_DIR = "../boards"
+BENCHMARK_SEEDS = range(5)
+
+# Default per-run budget, so a hard deal can't stall the whole suite
+DEFAULT_TIME_LIMIT = 60.0
+DEFAULT_NODE_LIMIT = 200000
+
+# Metrics compared against the baseline: a higher value is worse for all of them
+COMPARED_METRICS = ["time", "nodes_expanded", "peak_rss_kb", "moves"]
+
+# Runs faster than this (seconds) are too noisy to flag on time alone
+MIN_COMPARED_TIME = 0.1
+
+
+def corpus(boards_dir=BOARDS_DIR, seeds=BENCHMARK_SEEDS):
+    """
+    Returns the deal ids of the benchmark corpus.
+
+    Args:
+        boards_dir (str): Directory of board files.
+        seeds (iterable): Seeds of the random deals.
+
+    Returns:
+        list: Deal ids, as understood by batch_solve.load_deal().
+    """
+    deals = [f"file:{path}" for path in sorted(glob.glob(os.path.join(boards_dir, "*.txt")))]
+    deals += [f"seed:{seed}" for seed in seeds]
+    return deals
+
+
+def peak_rss_kb():
+    """Returns this process's peak resident set size in KiB, or None if unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def benchmark_run(task):
+    """
+    Worker entry point: solves one deal and adds throughput and memory figures.
+
+    Args:
+        task (tuple): Same as batch_solve.solve_deal().
+
+    Returns:
+        dict: The solve_deal() record plus nodes_per_sec (over the search time)
+              and peak_rss_kb (growth of the peak over its value at the start).
+    """
+    start_rss = peak_rss_kb()
+    record, search_time = run_deal(task)
+    record["nodes_per_sec"] = round(record["nodes_expanded"] / search_time) if search_time else None
+    end_rss = peak_rss_kb()
+    record["peak_rss_kb"] = end_rss - start_rss if end_rss is not None else None
+    return record
+
+
+def run_benchmark(solver_names, deals, time_limit, node_limit):
+    """
+    Runs every solver on every deal, each run in a fresh process.
+
+    Returns:
+        list: Result records, in (solver, deal) order.
+    """
+    tasks = [(deal, name, time_limit, node_limit) for name in solver_names for deal in deals]
+    results = []
+
+    # maxtasksperchild=1: a new process per run, so one run's peak doesn't
+    # hide the next one's
+    with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+        for record in pool.imap(benchmark_run, tasks):
+            results.append(record)
+            print(f"{record['solver']:>7} {record['deal']:<40} {record['status']:<10} "
+                  f"moves={record['moves']} nodes={record['nodes_expanded']} "
+                  f"time={record['time']:.2f}s rss={record['peak_rss_kb']}KiB")
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares results against a baseline run.
+
+    A run regresses when it is no longer solved, or when one of
+    COMPARED_METRICS grew by more than `threshold` (a fraction) over the
+    baseline. Runs missing from either side are ignored.
+
+    Args:
+        results (list): Records of this run.
+        baseline (list): Records of the baseline run.
+        threshold (float): Allowed relative increase, e.g. 0.1 for 10%.
+
+    Returns:
+        list: Human-readable regression descriptions.
+    """
+    previous = {(record["solver"], record["deal"]): record for record in baseline}
+    regressions = []
+
+    for record in results:
+        before = previous.get((record["solver"], record["deal"]))
+        if before is None:
+            continue
+        label = f"{record['solver']} on {record['deal']}"
+
+        if before["solved"] and not record["solved"]:
+            regressions.append(f"{label}: no longer solved ({record['status']})")
+            continue
+
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), record.get(metric)
+            if old is None or new is None or old <= 0:
+                continue
+            if metric == "time" and max(old, new) < MIN_COMPARED_TIME:
+                continue
+            change = (new - old) / old
+            if change > threshold:
+                regressions.append(f"{label}: {metric} {old} -> {new} (+{change:.0%})")
+
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the solvers on a fixed deal corpus.")
+    parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVERS), default=sorted(SOLVERS),
+                        help="Solvers to benchmark (default: all)")
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT, help="Wall-clock budget per run, in seconds")
+    parser.add_argument("--node-limit", type=int, default=DEFAULT_NODE_LIMIT, help="Node expansion budget per run")
+    parser.add_argument("--output", required=True, help="JSON file to write the results to")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative increase flagged as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    results = run_benchmark(args.solvers, corpus(), args.time_limit, args.node_limit)
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "time_limit": args.time_limit,
+            "node_limit": args.node_limit,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions past {args.threshold:.0%} against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
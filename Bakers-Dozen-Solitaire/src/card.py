@@ -8,11 +8,10 @@ Cards are Pygame sprites that store their rank, suit, position, and image.
 """
 
 import pygame
-from config import COLOR_BORDER
 
-# Constants for suits and ranks used in deck construction and display
-SUITS = ["Hearts", "Diamonds", "Clubs", "Spades"]
-RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
+# Constants for suits and ranks used in deck construction and display.
+# Defined with the solvers' packed board so both layers share one ordering.
+from solvers.board import SUITS, RANKS
 
 # Internal image cache to avoid reloading images unnecessarily
 _card_image_cache = {}
@@ -8,6 +8,8 @@ This file centralizes all UI styling and ensures consistent rendering across
 menus, gameplay, replay screens, and buttons.
 """
 
+import multiprocessing
+
 import pygame
 
 # Initialize Pygame modules
@@ -20,8 +22,14 @@ clock = pygame.time.Clock()
 
 WINDOW_WIDTH = 1920
 WINDOW_HEIGHT = 1080
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Baker's Dozen Solitaire")
+
+# Spawned solver workers import the main module, and so this one, again:
+# only the main process opens the window
+if multiprocessing.parent_process() is None:
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption("Baker's Dozen Solitaire")
+else:
+    screen = None
 
 # ---------------------------
 # Color palette
@@ -5,13 +5,15 @@ Defines the Deck class used to manage a full set of playing cards
 and handle card dealing for initializing the game.
 
 The deck starts with all 52 standard cards and can deal a specified
-number of cards at a time. Card order is randomized using Python's
-built-in `random.shuffle()`.
+number of cards at a time. Card order is randomized by a private
+`random.Random`, so a deal can be reproduced from its seed. Numbered deals
+(FreeCell style) are available through deal_game_state().
 """
 
 import random
 from card import Card, SUITS, RANKS
 from gamestate import GameState
+from solvers.board import deal_number_board
 
 
 class Deck:
@@ -20,14 +22,20 @@ class Deck:
 
     Attributes:
         cards (list): List of Card objects in current shuffled order.
+        rng (random.Random): Private generator used for the shuffle.
     """
 
-    def __init__(self):
+    def __init__(self, seed=None):
         """
         Initializes a new shuffled deck containing one of each card.
+
+        Args:
+            seed (int, optional): Seed for the shuffle. The same seed always gives
+                                  the same order; None shuffles unpredictably.
         """
+        self.rng = random.Random(seed)
         self.cards = [Card(suit, rank) for suit in SUITS for rank in RANKS]
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
 
     def deal(self, num):
         """
@@ -46,20 +54,41 @@ class Deck:
 
     from gamestate import GameState
 
-def generate_random_game_state():
+def generate_random_game_state(seed=None):
     """
     Creates a new randomized GameState with:
     - A shuffled deck
     - 13 tableau columns of 4 cards each
     - Kings moved to the bottom of each column
     - Empty foundations
+
+    Args:
+        seed (int, optional): Seed for the shuffle, to regenerate a deal.
+                              solvers.board.deal_board(seed) deals the same board.
     """
-    deck = Deck()
+    deck = Deck(seed)
     tableau = [deck.deal(4) for _ in range(13)]
     send_kings_to_back(tableau)
     foundations = {suit: [] for suit in ["Hearts", "Diamonds", "Clubs", "Spades"]}
     return GameState(tableau, foundations)
 
+def deal_game_state(number):
+    """
+    Creates the GameState of numbered deal `number` (FreeCell-style deal
+    numbers, see solvers.board.deal_number_board).
+
+    Args:
+        number (int): Deal number, 0 <= number < 2^31.
+
+    Returns:
+        GameState: The dealt game, with empty foundations.
+    """
+    board = deal_number_board(number)
+    tableau = [[Card(SUITS[code // len(RANKS)], RANKS[code % len(RANKS)]) for code in column]
+               for column in board.tableau]
+    foundations = {suit: [] for suit in ["Hearts", "Diamonds", "Clubs", "Spades"]}
+    return GameState(tableau, foundations)
+
 def send_kings_to_back(tableau):
     """Moves Kings to the bottom of their stacks for improved solvability"""
     for column in tableau:
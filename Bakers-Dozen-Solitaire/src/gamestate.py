@@ -7,6 +7,8 @@ manages card moves, scoring, goal detection, and automatic foundation promotion.
 This is the primary logic layer that abstracts game rules from rendering.
 """
 
+from solvers.board import SUITS, encode_card, generate_moves, top_index
+
 class GameState:
     """
     Represents the full state of a Baker's Dozen Solitaire game.
@@ -15,6 +17,9 @@ class GameState:
         tableau (list of list of Card): 10 tableau columns, each a list of Card objects.
         foundations (dict): Mapping of suits to lists of Card objects (completed piles).
         score (int): Current player score, incremented for foundation placements.
+        index (list): For each card value, a bit set of the columns whose top has
+                      that value (see solvers/board.py), kept up to date by
+                      do_move() and undo_move().
     """
 
     def __init__(self, tableau, foundations):
@@ -28,6 +33,7 @@ class GameState:
         self.tableau = tableau
         self.foundations = foundations
         self.score = 0
+        self.index = list(top_index(self._tops()))
 
     def is_goal_state(self):
         """
@@ -89,29 +95,85 @@ class GameState:
                 - ("foundation", from_col)
                 - ("tableau", from_col, to_col)
         """
+        self.do_move(move)
+
+    def do_move(self, move):
+        """
+        Plays a move in place and returns a record that undo_move() can reverse.
+
+        The record covers the move itself and every card the automatic
+        foundation promotion moves afterwards, so one undo_move() call restores
+        the exact previous state (including score).
+
+        Args:
+            move (tuple): One of:
+                - ("foundation", from_col)
+                - ("tableau", from_col, to_col)
+
+        Returns:
+            list: Steps performed, as (from_col, to_col, card) tuples in order.
+                  to_col is None for a card sent to its foundation.
+        """
+        steps = []
         move_type = move[0]
-        
+        from_col = move[1]
+
+        if not self.tableau[from_col]:
+            return steps
+
         if move_type == "foundation":
-            from_col = move[1]
-            if not self.tableau[from_col]:
-                return
-            card = self.tableau[from_col].pop()
-            self.foundations[card.suit].append(card)
-            self.score += 50
-        
+            self._move_to_foundation(from_col, steps)
+
         elif move_type == "tableau":
-            from_col = move[1]
             to_col = move[2]
-            if not self.tableau[from_col]:
-                return
+            self._toggle_top(from_col)
+            self._toggle_top(to_col)
             card = self.tableau[from_col].pop()
             self.tableau[to_col].append(card)
-        
+            self._toggle_top(from_col)
+            self._toggle_top(to_col)
+            steps.append((from_col, to_col, card))
+
         # Automatically move cards to foundation if all suits have passed a threshold
-        lv = self.get_lowest_value()
-        for col_id, column in enumerate(self.tableau):
-            if column and column[-1].value() == lv:
-                self.apply_move(("foundation", col_id))
+        promoted = True
+        while promoted:
+            promoted = False
+            lv = self.get_lowest_value()
+            for col_id, column in enumerate(self.tableau):
+                if column and column[-1].value() == lv:
+                    self._move_to_foundation(col_id, steps)
+                    promoted = True
+                    break
+
+        return steps
+
+    def undo_move(self, steps):
+        """
+        Reverts a move previously played with do_move().
+
+        Args:
+            steps (list): The record returned by do_move().
+        """
+        for from_col, to_col, card in reversed(steps):
+            self._toggle_top(from_col)
+            if to_col is None:
+                self.foundations[card.suit].pop()
+                self.score -= 50
+            else:
+                self._toggle_top(to_col)
+                self.tableau[to_col].pop()
+                self._toggle_top(to_col)
+            self.tableau[from_col].append(card)
+            self._toggle_top(from_col)
+
+    def _move_to_foundation(self, from_col, steps):
+        """Moves the top card of a column to its foundation and records the step."""
+        self._toggle_top(from_col)
+        card = self.tableau[from_col].pop()
+        self._toggle_top(from_col)
+        self.foundations[card.suit].append(card)
+        self.score += 50
+        steps.append((from_col, None, card))
 
     def get_valid_moves(self):
         """
@@ -122,24 +184,19 @@ class GameState:
                   - ("foundation", from_col)
                   - ("tableau", from_col, to_col)
         """
-        moves = []
-
-        for from_col, column in enumerate(self.tableau):
-            if not column:
-                continue
-            card = column[-1]
-
-            # Valid move to foundation
-            if self.valid_foundation_move(card):
-                moves.append(("foundation", from_col))
+        # Same generator as the solvers, over the packed column tops
+        foundations = [len(self.foundations.get(suit, ())) for suit in SUITS]
+        return generate_moves(self._tops(), foundations, self.index)
 
-            # Valid move to other tableau columns
-            for to_col, target_col in enumerate(self.tableau):
-                if to_col == from_col or not target_col:
-                    continue
+    def _tops(self):
+        """Returns the packed top card of each column, -1 for an empty column."""
+        return [encode_card(column[-1].suit, column[-1].rank) if column else -1 for column in self.tableau]
 
-                top_card = target_col[-1]
-                if card.value() == top_card.value() - 1:
-                    moves.append(("tableau", from_col, to_col))
-        
-        return moves
+    def _toggle_top(self, col):
+        """
+        Flips the top index bit of a column's top card. Called once before and
+        once after a column changes, it moves the bit to the new top.
+        """
+        column = self.tableau[col]
+        if column:
+            self.index[column[-1].value()] ^= 1 << col
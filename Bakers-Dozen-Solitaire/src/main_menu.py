@@ -6,7 +6,7 @@ Displays the main UI menu for Baker's Dozen Solitaire.
 Includes:
 - Main menu with four options (Play, Load, AI, Exit)
 - Dynamic loading of board files for custom game selection
-- AI solver selection menu (DFS, BFS, A*)
+- AI solver selection menu (DFS, BFS, A*, portfolio)
 - Button rendering and menu mode switching
 """
 
@@ -23,7 +23,8 @@ from solvers.bfs_solver import BFSSolver
 from solvers.dfs_solver import DFSSolver
 from solvers.greedy_solver import GreedySolver
 from solvers.astar_solver import AStarSolver
-from solvers.astar_2_solver import a_star,createRootNode,get_solutions
+from solvers.astar_2_solver import a_star_search,get_solutions
+from solvers.portfolio import PortfolioSolver
 from deck import generate_random_game_state
 
 # -------------------------
@@ -132,7 +133,7 @@ def draw_play_ai_menu():
     Draws the AI solver selection screen with available algorithm options.
 
     Returns:
-        list: List of Button objects (exit, DFS, BFS, A*).
+        list: List of Button objects (exit, DFS, BFS, A*, portfolio).
     """
     screen.fill(COLOR_BACKGROUND)
 
@@ -145,17 +146,22 @@ def draw_play_ai_menu():
     button_greedy = Button(button_x, button_y + 200, BUTTON_WIDTH_MENU, BUTTON_HEIGHT_MENU, "GREEDY", normal_button_colors)
     button_a_star = Button(button_x, button_y + 300, BUTTON_WIDTH_MENU, BUTTON_HEIGHT_MENU, "A*", normal_button_colors)
     button_a_star_2 = Button(button_x, button_y + 400, BUTTON_WIDTH_MENU, BUTTON_HEIGHT_MENU, "A* 2", normal_button_colors)
-    button_exit_solver = Button(button_x, button_y + 500, BUTTON_WIDTH_MENU, BUTTON_HEIGHT_MENU, "Exit to Main Menu", exit_button_colors)
+    button_portfolio = Button(button_x, button_y + 500, BUTTON_WIDTH_MENU, BUTTON_HEIGHT_MENU, "PORTFOLIO", normal_button_colors)
+    button_exit_solver = Button(button_x, button_y + 600, BUTTON_WIDTH_MENU, BUTTON_HEIGHT_MENU, "Exit to Main Menu", exit_button_colors)
 
     button_dfs.draw(FONT_MEDIUM)
     button_bfs.draw(FONT_MEDIUM)
     button_greedy.draw(FONT_MEDIUM)
     button_a_star.draw(FONT_MEDIUM)
     button_a_star_2.draw(FONT_MEDIUM)
+    button_portfolio.draw(FONT_MEDIUM)
     button_exit_solver.draw(FONT_MEDIUM)
 
     pygame.display.flip()
-    return [button_exit_solver, button_dfs, button_bfs, button_greedy, button_a_star, button_a_star_2]
+    return [button_exit_solver, button_dfs, button_bfs, button_greedy, button_a_star, button_a_star_2, button_portfolio]
+
+# Node cap of the "A* 2" button (the library default, 2M, can take minutes)
+GUI_MAX_AS_COUNT = 20000
 
 def run_solver_and_replay_2(board_source):
     from game_draw import draw_replay, update_visuals
@@ -168,8 +174,19 @@ def run_solver_and_replay_2(board_source):
     else:
         initial_state = board_source()
 
-    # Run solver with flexible kwargs
-    solved = a_star(initial_state)
+    # The GUI waits for the search: keep it short, keep the window responsive
+    # and show live progress in the title bar
+    steps = a_star_search(initial_state, max_nodes=GUI_MAX_AS_COUNT)
+    while True:
+        try:
+            progress = next(steps)
+        except StopIteration as stop:
+            solved = stop.value
+            break
+        pygame.event.pump()
+        pygame.display.set_caption(f"Solving... {progress.nodes_expanded} nodes, "
+                                   f"{progress.foundations} cards home, {progress.nodes_per_sec:.0f} nodes/s")
+    pygame.display.set_caption("Baker's Dozen Solitaire")
     solution_moves = get_solutions(solved)
 
     if solution_moves:
@@ -195,9 +212,15 @@ def run_solver_and_replay(solver_class, board_source, **solver_kwargs):
     else:
         initial_state = board_source()
 
-    # Run solver with flexible kwargs
+    # Run solver with flexible kwargs; keep the window responsive and show
+    # live progress in the title bar while it searches
     solver = solver_class(initial_state, **solver_kwargs)
-    solution_moves = solver.solve()
+    for progress in solver.search():
+        pygame.event.pump()
+        pygame.display.set_caption(f"Solving... {progress.nodes_expanded} nodes, "
+                                   f"{progress.foundations} cards home, {progress.nodes_per_sec:.0f} nodes/s")
+    pygame.display.set_caption("Baker's Dozen Solitaire")
+    solution_moves = solver.solution
 
     if solution_moves:
         print(f"Solution found in {len(solution_moves)} moves")
@@ -218,91 +241,102 @@ def run_solver_and_replay(solver_class, board_source, **solver_kwargs):
 # Menu Loop
 # -------------------------
 
-mode = "menu"
-board_buttons = []
-board_files = [f for f in os.listdir("../boards") if f.endswith(".txt")]
+def main():
+    """Runs the menu loop until the window is closed."""
+    mode = "menu"
+    board_buttons = []
+    board_files = [f for f in os.listdir("../boards") if f.endswith(".txt")]
 
-running = True
-while running:
-    mouse_position = pygame.mouse.get_pos()
+    running = True
+    while running:
+        mouse_position = pygame.mouse.get_pos()
 
-    # MAIN MENU
-    if mode == "menu":
-        draw_main_menu()
+        # MAIN MENU
+        if mode == "menu":
+            draw_main_menu()
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
-                running = False
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    running = False
 
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if button_play_human.is_clicked(mouse_position):
-                    run_game()
-                    mode = "menu"
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if button_play_human.is_clicked(mouse_position):
+                        run_game()
+                        mode = "menu"
 
-                elif button_load_custom.is_clicked(mouse_position):
-                    mode = "load"
+                    elif button_load_custom.is_clicked(mouse_position):
+                        mode = "load"
 
-                elif button_play_ai.is_clicked(mouse_position):
-                    mode = "ai"
+                    elif button_play_ai.is_clicked(mouse_position):
+                        mode = "ai"
 
-                elif button_exit_game.is_clicked(mouse_position):
-                    running = False
+                    elif button_exit_game.is_clicked(mouse_position):
+                        running = False
 
-    # CUSTOM BOARD MENU
-    elif mode == "load":
-        board_buttons = draw_load_custom_menu(board_files)
+        # CUSTOM BOARD MENU
+        elif mode == "load":
+            board_buttons = draw_load_custom_menu(board_files)
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
 
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                mode = "menu"
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    mode = "menu"
 
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                for button in board_buttons:
-                    if board_buttons[0].is_clicked(mouse_position):
-                        mode = "menu"
-                    elif button.is_clicked(mouse_position):
-                        run_game(os.path.join("../boards", button.text))
-                        mode = "menu"
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    for button in board_buttons:
+                        if board_buttons[0].is_clicked(mouse_position):
+                            mode = "menu"
+                        elif button.is_clicked(mouse_position):
+                            run_game(os.path.join("../boards", button.text))
+                            mode = "menu"
 
-    # AI SOLVER MENU
-    elif mode == "ai":
-        solver_buttons = draw_play_ai_menu()
+        # AI SOLVER MENU
+        elif mode == "ai":
+            solver_buttons = draw_play_ai_menu()
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
 
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                mode = "menu"
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    mode = "menu"
 
 # TODO: SOLVERS
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                for button in solver_buttons:
-                    if solver_buttons[0].is_clicked(mouse_position):
-                        mode = "menu"
-                    elif button.is_clicked(mouse_position):
-                        if button.text == "DFS":
-                            run_solver_and_replay(DFSSolver, "../boards/algorithm_test.txt")
-                            mode == "menu"
-
-                        elif button.text == "BFS":
-                            run_solver_and_replay(BFSSolver, "../boards/algorithm_test.txt")
-                            mode == "menu"
-
-                        elif button.text == "GREEDY":
-                            run_solver_and_replay(GreedySolver, generate_random_game_state)
-                            mode == "menu"
-
-                        elif button.text == "A*":
-                            run_solver_and_replay(AStarSolver, generate_random_game_state)
-                            mode == "menu"
-                        elif button.text == "A* 2":
-                            run_solver_and_replay_2( generate_random_game_state)
-                            mode == "menu"
-    clock.tick(60)
-
-pygame.quit()
-sys.exit()
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    for button in solver_buttons:
+                        if solver_buttons[0].is_clicked(mouse_position):
+                            mode = "menu"
+                        elif button.is_clicked(mouse_position):
+                            if button.text == "DFS":
+                                run_solver_and_replay(DFSSolver, "../boards/algorithm_test.txt")
+                                mode == "menu"
+
+                            elif button.text == "BFS":
+                                run_solver_and_replay(BFSSolver, "../boards/algorithm_test.txt")
+                                mode == "menu"
+
+                            elif button.text == "GREEDY":
+                                run_solver_and_replay(GreedySolver, generate_random_game_state)
+                                mode == "menu"
+
+                            elif button.text == "A*":
+                                run_solver_and_replay(AStarSolver, generate_random_game_state)
+                                mode == "menu"
+                            elif button.text == "A* 2":
+                                run_solver_and_replay_2( generate_random_game_state)
+                                mode == "menu"
+                            elif button.text == "PORTFOLIO":
+                                run_solver_and_replay(PortfolioSolver, generate_random_game_state)
+                                mode == "menu"
+        clock.tick(60)
+
+    pygame.quit()
+    sys.exit()
+
+
+# Solver worker processes started with the spawn method (the default on
+# Windows and macOS) import this module again: the menu must not start then.
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,24 @@
-from copy import deepcopy
 from collections import deque
-from gamestate import GameState 
-import bisect
-class TreeNode:
-    def __init__(self, state, parent=None,prev_move = None, level=0):
-        self.state = state
-        self.parent = parent
-        self.prev_move = prev_move 
-        self.level =level 
-        self.children = []
+from solvers.board import as_board, SUITS, RANKS, NUM_RANKS
+from solvers.solver_base import Solver, VisitedSet, PositionMap, SearchNode, SearchProgress, \
+    DEFAULT_PROGRESS_INTERVAL, DEFAULT_CHECKPOINT_INTERVAL
+from solvers.batch_heuristic import evaluate_batch
+from heapq import heappush, heappop
+from itertools import count as counter
+import time
+class TreeNode(SearchNode):
+    # A SearchNode with the level naming used in this file. Nodes only point
+    # at their parent, and only every DEFAULT_CHECKPOINT_INTERVAL-th level
+    # keeps its board: the others rebuild it by replaying moves from the
+    # nearest ancestor that kept one.
+    __slots__ = ()
 
-    def __eq__(self, other):
-        return (self.state.tableau == other.state.tableau)
+    def __init__(self, state, parent=None,prev_move = None, level=0):
+        super().__init__(state, parent, prev_move, level, 0, level % DEFAULT_CHECKPOINT_INTERVAL == 0)
 
-    def add_child(self, child_node):
-        self.children.append(child_node)
+    @property
+    def level(self):
+        return self.depth
 
     def __str__(self):
         return f"Node - {self.level}:\nPrev move: {self.prev_move}\nValidMoves: {self.state.get_valid_moves()}"
@@ -46,8 +50,8 @@ def buildGameStateString(game_state):
     for i in range(len(tableau)):
         temp=":"
         for card in tableau[i]:
-            temp+=card.suit[0]
-            temp+=card.rank
+            temp+=SUITS[card // NUM_RANKS][0]
+            temp+=RANKS[card % NUM_RANKS]
         s_l.append(temp)
     s_l.sort()
     for i in range(len(s_l)):
@@ -61,8 +65,8 @@ def buildGameStateStringWithF(game_state):
     for i in range(len(tableau)):
         temp=":"
         for card in tableau[i]:
-            temp+=card.suit[0]
-            temp+=str(card.value())
+            temp+=SUITS[card // NUM_RANKS][0]
+            temp+=str(card % NUM_RANKS)
             temp+="-"
         if temp[-1] == "-":
             temp = temp[:-1]
@@ -70,10 +74,7 @@ def buildGameStateStringWithF(game_state):
     s_l.sort()
     for i in range(len(s_l)):
         gs_str+=s_l[i]
-    foundations = game_state.foundations
-    temp = 0
-    for suit in foundations:
-        temp += len(foundations[suit])
+    temp = game_state.foundation_count()
 
     gs_str+="|"
     gs_str+=str(temp)
@@ -88,68 +89,133 @@ def print_tree(node):
 
 def next_foundation(node):
     low={}
-    if node.state.foundations["Spades"]:
-        low["S"]=node.state.foundations["Spades"][-1].value()+1
-    else:
-        low["S"]=0
-    if node.state.foundations["Clubs"]:
-        low["C"]=node.state.foundations["Clubs"][-1].value()+1
-    else:
-        low["C"]=0
-    if node.state.foundations["Hearts"]:
-        low["H"]=node.state.foundations["Hearts"][-1].value()+1
-    else:
-        low["H"]=0
-    if node.state.foundations["Diamonds"]:
-        low["D"]=node.state.foundations["Diamonds"][-1].value()+1
-    else:
-        low["D"]=0
+    for suit, height in zip(SUITS, node.state.foundations):
+        low[suit[0]]=height
     return low;
     
-def a_star(game_state):
-    root = createRootNode(game_state)
-    queue = [(root,evaluate(root))]
+# Expansions after which a_star() gives up and returns its best node
+MAX_AS_COUNT = 2000000
+
+def a_star(game_state, max_nodes=MAX_AS_COUNT):
+    # Runs a_star_search() to the end and returns the node it stopped on
+    steps = a_star_search(game_state, max_nodes=max_nodes)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def a_star_search(game_state, progress_interval=DEFAULT_PROGRESS_INTERVAL, max_nodes=MAX_AS_COUNT, tick=None):
+    # Streaming form of a_star(): yields a SearchProgress every progress_interval
+    # nodes and a final one (done=True), then returns the goal node. A tick
+    # callable, if given, is called with each expanded board and its node
+    # instead, and a snapshot is due whenever it returns True. When
+    # max_nodes is reached it returns the most advanced node seen (most
+    # cards on the foundations) instead of whichever node came up last.
+    #
+    # The open list is a heap of (evaluation, insertion number, node): ties
+    # pop in insertion order, as with the sorted list it replaces. Finding a
+    # shorter path to a queued position pushes it again, and the longer
+    # entry is dropped when popped (lazy deletion). Expanded positions are
+    # never expanded again.
+    start_time = time.time()
+    root = createRootNode(as_board(game_state))
+    tiebreak = counter()
+    queue = [(evaluate(root), next(tiebreak), root)]
+    closed = VisitedSet()
+    # Lowest level each queued position was reached at (boards compared on
+    # key hits, so colliding positions never share a level)
+    best_level = PositionMap()
+    best_level[root] = root.level
 
-    MAX_AS_COUNT=20000 
-    curr_level = root.level
     count = 0
+    best = root
+    best_found = getFoundNr(root)
     
     while(queue):
+        score, _, node = heappop(queue)
+        if node.level > best_level.get(node) or node in closed:
+            continue
+        state = node.state
+        closed.add(node, state)
         count+=1
-        pair = queue.pop(0)
-        node = pair[0]  
 
-        print(str(node.prev_move) + " " + str(pair[1]))
+        found = state.foundation_count()
+        if found > best_found:
+            best, best_found = node, found
+        due = tick(state, node) if tick is not None else count % progress_interval == 0
+        if due:
+            yield SearchProgress(count, len(queue), best_found, get_sol(best, []), time.time() - start_time)
 
-        if(node.state.is_goal_state()):
-            print(count)
+        if(state.is_goal_state()):
+            print(f"Goal found in {count} steps")
+            yield SearchProgress(count, len(queue), found, get_sol(node, []), time.time() - start_time,
+                                 done=True, solution=get_sol(node, []))
             return node
-        if(curr_level < node.level):
-            curr_level = node.level
-            print("new level")
-            print(count)
 
-        if(count >= MAX_AS_COUNT): 
-            print(count)
-            print("Max nodes reached")
-            return node
+        if(count >= max_nodes): 
+            print(f"Max nodes reached ({count})")
+            yield SearchProgress(count, len(queue), best_found, get_sol(best, []), time.time() - start_time,
+                                 done=True)
+            return best
 
         node_list = []  
-        for move in node.state.get_valid_moves():
+        states = []
+        for move in state.get_valid_moves():
             
             if node.prev_move is not None and  move[0] == "tableau" and node.prev_move[0] =="tableau" and node.prev_move[2] == move[1]:
                 continue
-            state = deepcopy(node.state)
-            state.apply_move(move)
-            child_node = TreeNode(state,node,move,node.level + 1)             
-            node.add_child(child_node)
+            child = state.apply_move(move)
+            if child in closed:
+                continue
+            level = best_level.get(child)
+            if level is not None and level <= node.level + 1:
+                continue
+            child_node = TreeNode(child,node,move,node.level + 1)             
+            best_level.set(child_node, child_node.level, child)
             node_list.append(child_node)
+            states.append(child)
         
-        ordered_insert(queue, node_list)
+        ordered_insert(queue, node_list, tiebreak, states)
 
+    yield SearchProgress(count, 0, best_found, get_sol(best, []), time.time() - start_time, done=True)
     return root;
 
 
+class AStar2Solver(Solver):
+    """
+    a_star_search() as a Solver, so it runs wherever the other solvers do
+    (batch runs, benchmarks). Expansions are counted and reported through
+    tick(), so progress callbacks and budgets work as usual.
+
+    The search keeps its own move rule (a card is never moved straight
+    back), so move_pruning has no effect, and prune_dead only screens the
+    initial deal. max_nodes caps the expansions as for a_star().
+    """
+
+    def __init__(self, initial_state, max_nodes=MAX_AS_COUNT, verbose=False, **kwargs):
+        super().__init__(initial_state, **kwargs)
+        self.max_nodes = max_nodes
+        self.verbose = verbose
+
+    def _search(self):
+        steps = a_star_search(self.initial_state, max_nodes=self.max_nodes, tick=self.tick)
+        while True:
+            try:
+                snapshot = next(steps)
+            except StopIteration as stop:
+                node = stop.value
+                break
+            if not snapshot.done:
+                yield self.progress(snapshot.frontier)
+
+        if node.state.is_goal_state():
+            return get_solutions(node)
+        # The open list only runs dry before the cap once every reachable position was expanded
+        self.unsolvable = self.nodes_expanded < self.max_nodes
+        return None
+
+
 #initially 1 ->
 def evaluate(node):
     FOUNDATION_MULT = 35.0 
@@ -164,14 +230,14 @@ def evaluate(node):
     DISPATCH_ACE_MULT = 10.0
 
     n_str = buildGameStateStringWithF(node.state)
-    print(str(node.level)+" - "+n_str)
+    #print(str(node.level)+" - "+n_str)
     if node.state.is_goal_state():
         return 0.0 
     else:
         num_aces = 0 
         ev = 4000 + (node.level * LEVEL_MULT)
         low =next_foundation(node) 
-        print("low " + str(low))
+        #print("low " + str(low))
         split_str = n_str.split("|")
         ev -= int(split_str[1]) * FOUNDATION_MULT
         #print("FOUNDATION R: "+str(int(split_str[1]) * FOUNDATION_MULT))
@@ -244,21 +310,16 @@ def contains_foundation(valid):
     return False
     
 def getFoundNr(node):
-    temp = 0
-    for suit in node.state.foundations:
-        temp += len(node.state.foundations[suit])
-    return temp
-def ordered_insert(queue, node_list):
-    pair_list = []
-    for node in node_list:
-        n_p = (node, evaluate(node))
-        pair_list.append(n_p)
-    for pair in pair_list:
-        bisect.insort(queue, pair,key=lambda x: x[1])
+    return node.state.foundation_count()
+def ordered_insert(queue, node_list, tiebreak, states=None):
+    # All children are scored in one batch; same values as evaluate()
+    for node, score in zip(node_list, evaluate_batch(node_list, states)):
+        heappush(queue, (score, next(tiebreak), node))
 def bfs(game_state):
-    root = createRootNode(game_state)
+    root = createRootNode(as_board(game_state))
     queue = deque([root])
-    #visited = set(buildGameStateString(game_state)) 
+    visited = VisitedSet()
+    visited.add(root)
     MAX_BFS_LEVEL =1 
     curr_level = root.level
     count = 0
@@ -277,25 +338,23 @@ def bfs(game_state):
             return node
 
         for move in node.state.get_valid_moves():
-            if move[0] == "tableau" and node.prev_move[0] =="tableau" and node.prev_move[2] == move[1]:
+            if node.prev_move is not None and move[0] == "tableau" and node.prev_move[0] =="tableau" and node.prev_move[2] == move[1]:
                 continue
             count+=1
-            state = deepcopy(node.state)
-            state.apply_move(move)
-            #state_str = buildGameStateString(state)
-        #    if state_str not in visited:
-            child_node = TreeNode(state,node,move,node.level + 1)             
-            node.add_child(child_node)
-            queue.append(child_node)
-        #        visited.add(state)
+            state = node.state.apply_move(move)
+            if state not in visited:
+                child_node = TreeNode(state,node,move,node.level + 1)             
+                queue.append(child_node)
+                visited.add(child_node, state)
         
     return root;
 
 
 def dfs(game_state):
-    root = createRootNode(game_state)
+    root = createRootNode(as_board(game_state))
     queue = deque([root])
-    visited = set(buildGameStateString(game_state)) 
+    visited = VisitedSet()
+    visited.add(root)
     MAX_DFS_LEVEL =53 
     curr_level = root.level
     count = 0
@@ -306,22 +365,19 @@ def dfs(game_state):
         if(curr_level < node.level):
             curr_level = node.level
             print(curr_level)
-        if(node.level >= MAX_BFS_LEVEL): 
+        if(node.level >= MAX_DFS_LEVEL): 
             print(count)
             print("Max level reached")
             return node
 
         for move in node.state.get_valid_moves():
-            if move[0] == "tableau" and node.prev_move[0] =="tableau" and node.prev_move[2] == move[1]:
+            if node.prev_move is not None and move[0] == "tableau" and node.prev_move[0] =="tableau" and node.prev_move[2] == move[1]:
                 continue
             count+=1
-            state = deepcopy(node.state)
-            state.apply_move(move)
-            state_str = buildGameStateString(state)
-            if state_str not in visited:
+            state = node.state.apply_move(move)
+            if state not in visited:
                 child_node = TreeNode(state,node,move,node.level + 1)             
-                node.add_child(child_node)
                 queue.append(child_node)
-                visited.add(state)
+                visited.add(child_node, state)
         
     return root;
@@ -1,74 +1,125 @@
 # astar_solver.py
 
-from solvers.solver_base import Solver, SearchNode
-from heapq import heappush, heappop
-from copy import deepcopy
+from solvers.solver_base import Solver, PositionMap
+from solvers.batch_heuristic import default_heuristic_batch
+from solvers.open_list import BucketQueue, DEFAULT_QUANTUM
+from solvers.lower_bound import moves_left_bound
 import time
-import pygame
 
 class AStarSolver(Solver):
-    def __init__(self, initial_state, verbose=True):
-        super().__init__(initial_state)
+    def __init__(self, initial_state, verbose=True, weight=1.0, batch_heuristic=False, tie_break="shallow",
+                 quantum=DEFAULT_QUANTUM, admissible=False, **kwargs):
+        super().__init__(initial_state, **kwargs)
         self.heuristic = self.default_heuristic
+        # Optionally scores all children of an expansion in one NumPy call (same
+        # values). Off by default: the board keeps the heuristic terms up to
+        # date, so the scalar heuristic is O(1) and cheaper than packing arrays.
+        # Set to None when replacing self.heuristic
+        self.heuristic_batch = default_heuristic_batch if batch_heuristic else None
         self.verbose = verbose
-
-    def solve(self):
+        # Open list settings, see solvers/open_list.py. With a weight that is
+        # not a multiple of 0.5, pass a matching quantum to keep f exact.
+        self.tie_break = tie_break
+        self.quantum = quantum
+        # Weighted A*: weight > 1 trusts the heuristic more, trading solution
+        # length for fewer expansions
+        self.weight = weight
+        # Admissible A*: score with a lower bound on the moves left (see
+        # solvers/lower_bound.py) and reopen positions reached again by a
+        # shorter path, so with weight 1 the solution is a shortest one.
+        # Many nodes then share the optimal f; tie_break="deep" reaches the
+        # goal among them faster
+        self.admissible = admissible
+        self.best_depth = PositionMap()  # position -> smallest depth seen, when admissible
+        if admissible:
+            self.heuristic = moves_left_bound
+            self.heuristic_batch = None
+            self.shortest = weight == 1
+
+    def _search(self):
         start_time = time.time()
-        root = SearchNode(self.initial_state)
-        open_list = []
-        heappush(open_list, (self.f(root), root))
-        self.visited.add(root)
+        root = self.make_node(self.initial_state)
+        root.f = self.f(root)
+        open_list = BucketQueue(self.quantum, self.tie_break)
+        open_list.push(root.f, root)
+        self.mark(root, self.initial_state)
 
         while open_list:
-            pygame.event.pump()
-            _, current = heappop(open_list)
-            self.nodes_expanded += 1
+            current = open_list.pop()
+            state = current.state
+            if self.admissible and current.depth > self.best_depth.get(current, state=state):
+                continue  # Reached again by a shorter path since it was queued
+            if self.tick(state, current):
+                yield self.progress(len(open_list))
 
             if self.verbose:
-                print(f"Expanding move: {current.prev_move} | f(n): {self.f(current):.2f}")
+                print(f"Expanding move: {current.prev_move} | f(n): {current.f:.2f}")
 
-            if current.state.is_goal_state():
+            if state.is_goal_state():
                 end_time = time.time()
                 print(f"Goal found in {self.nodes_expanded} steps")
                 print(f"Time taken: {end_time - start_time:.2f} seconds")
                 return self.extract_solution(current)
 
-            for move in current.state.get_valid_moves():
-                new_state = deepcopy(current.state)
-                new_state.apply_move(move)
-                child = SearchNode(new_state, parent=current, prev_move=move, depth=current.depth + 1)
+            children = []
+            states = []
+            parent_key = current.parent.key if current.parent is not None else None
+            for move in self.legal_moves(state, current.prev_move, parent_key):
+                new_state = state.apply_move(move)
+
+                if self.is_new(new_state, current.depth + 1) and not self.dead(new_state):
+                    child = self.make_node(new_state, parent=current, prev_move=move)
+                    self.mark(child, new_state)
+                    children.append(child)
+                    states.append(new_state)
 
-                if child not in self.visited:
-                    self.visited.add(child)
-                    heappush(open_list, (self.f(child), child))
+            for child, score in zip(children, self.score_states(states)):
+                child.f = child.depth + self.weight * score
+                open_list.push(child.f, child)
 
         print("No solution found.")
         return None
 
+    def is_new(self, state, depth):
+        """Checks whether a position is worth queuing at a given depth"""
+        if self.admissible:
+            known = self.best_depth.get(state)
+            return known is None or depth < known
+        return state not in self.visited
+
+    def mark(self, node, state=None):
+        """Records a queued node (whose board is `state`, if given) for is_new()"""
+        if self.admissible:
+            self.best_depth.set(node, node.depth, state)
+        else:
+            self.visited.add(node, state)
+
     def f(self, node):
-        """Total cost function f(n) = g(n) + h(n)"""
-        return node.depth + self.heuristic(node.state)
+        """Total cost function f(n) = g(n) + w * h(n)"""
+        return node.depth + self.weight * self.heuristic(node.state)
+
+    def score_states(self, states):
+        """Heuristic values of several states, batched when possible"""
+        if self.heuristic_batch is not None:
+            return self.heuristic_batch(states)
+        return [self.heuristic(state) for state in states]
 
     def default_heuristic(self, state):
         score = 1000
 
+        # Every term is kept up to date by the board as moves are played
+
         # Foundation progress
-        score -= sum(len(pile) for pile in state.foundations.values()) * 10
+        score -= state.foundation_count() * 10
 
         # Empty columns
-        score -= sum(1 for col in state.tableau if not col) * 3
+        score -= state.empty_columns() * 3
 
         # Ordered cards
-        for col in state.tableau:
-            for i in range(len(col) - 1):
-                above = col[i]
-                below = col[i + 1]
-                if above.value() == below.value() + 1:
-                    score -= 2
-                    if above.suit == below.suit:
-                        score -= 2
+        score -= state.ordered_pairs() * 2
+        score -= state.suited_pairs() * 2
 
         # Available moves
-        score -= len(state.get_valid_moves()) * 1.5
+        score -= state.move_count() * 1.5
 
         return score
@@ -0,0 +1,211 @@
+# batch_heuristic.py
+
+"""
+Batched heuristic evaluation over NumPy arrays.
+
+Scoring one state at a time costs a Python loop over every card. Here a
+batch of boards (the children of one expansion, or a slice of a frontier)
+is packed into a single int array and scored with array operations:
+
+    cards       (batch, columns, depth)  packed card codes, -1 past the top
+    lengths     (batch, columns)         cards in each column
+    foundations (batch, 4)               foundation heights, SUITS order
+
+default_heuristic_batch() reproduces AStarSolver / GreedySolver
+.default_heuristic and evaluate_batch() reproduces astar_2_solver.evaluate.
+Both give bit-for-bit the same floats as the scalar versions (the float
+operations are performed in the same order), so a solver using them
+expands exactly the same nodes.
+
+NumPy is optional: without it both functions fall back to the scalar
+heuristics and HAVE_NUMPY is False.
+"""
+
+from itertools import chain
+
+from solvers.board import SUITS, NUM_RANKS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the scalar heuristics still work
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# astar_2_solver.evaluate weights
+FOUNDATION_MULT = 35.0
+ORDERED_MULT = 2.0
+SUIT_ORDERED_MULT = 2.5
+LEVEL_MULT = 10.0
+EMPTY_MULT = 0.5
+VALID_MOVES_MULT = 1.0
+BLOCKED_MULT = 0.5
+DIST_TO_LOWEST = 4.5
+DIST_TO_LOWEST_2 = 3.0
+DISPATCH_ACE_MULT = 10.0
+
+# Text of each card in buildGameStateStringWithF, used to reproduce the
+# column order evaluate() accumulates its per-column scores in
+_PILE_TOKEN = [SUITS[code // NUM_RANKS][0] + str(code % NUM_RANKS) for code in range(len(SUITS) * NUM_RANKS)]
+
+
+def encode_batch(boards):
+    """
+    Packs boards into arrays.
+
+    Args:
+        boards (list): Boards (or MutableBoards) with the same number of columns.
+
+    Returns:
+        tuple: (cards, lengths, foundations) arrays as described above.
+    """
+    columns = [column for board in boards for column in board.tableau]
+    lengths = np.fromiter(map(len, columns), dtype=np.intp, count=len(columns))
+    flat = np.fromiter(chain.from_iterable(columns), dtype=np.int16, count=int(lengths.sum()))
+
+    # Scatter the concatenated columns into a padded (columns, depth) grid
+    depth = max(1, int(lengths.max()))
+    starts = np.cumsum(lengths) - lengths
+    rows = np.repeat(np.arange(len(columns)), lengths)
+    offsets = np.arange(len(flat)) - np.repeat(starts, lengths)
+    cards = np.full((len(columns), depth), -1, dtype=np.int16)
+    cards[rows, offsets] = flat
+
+    shape = (len(boards), len(boards[0].tableau))
+    cards = cards.reshape(shape + (depth,))
+    lengths = lengths.reshape(shape)
+    foundations = np.array([board.foundations for board in boards], dtype=np.int16)
+    return cards, lengths, foundations
+
+
+def _move_sources(cards, lengths, foundations):
+    """
+    Finds the legal moves of every column top.
+
+    Returns:
+        tuple: (to_foundation, targets) - whether each column's top card can go to
+               its foundation, and how many columns it can be moved onto.
+    """
+    present = lengths > 0
+    top = np.take_along_axis(cards, np.maximum(lengths - 1, 0)[..., None].astype(np.intp), axis=2)[..., 0]
+    top_value = np.where(present, top % NUM_RANKS, -1)
+    top_suit = np.where(present, top // NUM_RANKS, 0)
+
+    to_foundation = present & (top_value == np.take_along_axis(foundations, top_suit.astype(np.intp), axis=1))
+    onto = (top_value[:, :, None] + 1 == top_value[:, None, :]) & present[:, :, None]
+    targets = onto.sum(axis=2)
+    return to_foundation, targets
+
+
+def default_heuristic_batch(boards):
+    """
+    Scores boards with AStarSolver.default_heuristic (GreedySolver's is identical).
+
+    Args:
+        boards (list): Boards to score.
+
+    Returns:
+        list: One float per board, equal to the scalar heuristic.
+    """
+    if not boards:
+        return []
+    if np is None:
+        from solvers.astar_solver import AStarSolver
+        return [AStarSolver.default_heuristic(None, board) for board in boards]
+
+    cards, lengths, foundations = encode_batch(boards)
+
+    # Ordered pairs: the card below is one rank lower, optionally of the same suit
+    above, below = cards[:, :, :-1], cards[:, :, 1:]
+    paired = below >= 0
+    ordered = paired & (above % NUM_RANKS == below % NUM_RANKS + 1)
+    suited = ordered & (above // NUM_RANKS == below // NUM_RANKS)
+
+    to_foundation, targets = _move_sources(cards, lengths, foundations)
+    moves = to_foundation.sum(axis=1) + targets.sum(axis=1)
+
+    # Every term but the last is an integer, as in the scalar version
+    score = (1000
+             - foundations.sum(axis=1, dtype=np.int64) * 10
+             - (lengths == 0).sum(axis=1) * 3
+             - ordered.sum(axis=(1, 2)) * 2
+             - suited.sum(axis=(1, 2)) * 2)
+    return (score.astype(np.float64) - moves * 1.5).tolist()
+
+
+def evaluate_batch(nodes, states=None):
+    """
+    Scores astar_2_solver TreeNodes exactly like astar_2_solver.evaluate,
+    without its debug output.
+
+    Args:
+        nodes (list): TreeNodes (state and level are used).
+        states (list, optional): The nodes' boards, when the caller has them
+                                 (saves rebuilding them from checkpoints).
+
+    Returns:
+        list: One float per node, equal to evaluate(node).
+    """
+    if not nodes:
+        return []
+    if np is None:
+        from solvers.astar_2_solver import evaluate
+        return [evaluate(node) for node in nodes]
+
+    boards = states if states is not None else [node.state for node in nodes]
+    cards, lengths, foundations = encode_batch(boards)
+    batch, columns, depth = cards.shape
+
+    present = cards >= 0
+    values = cards % NUM_RANKS
+    suits = cards // NUM_RANKS
+    length = lengths.astype(np.float64)
+    pile = np.maximum(lengths, 1).astype(np.float64)
+
+    # Distance of the next foundation card from the bottom of its column
+    lowest = np.take_along_axis(foundations[:, None, :], np.where(present, suits, 0).reshape(batch, 1, -1).astype(np.intp),
+                                axis=2).reshape(batch, columns, depth)
+    next_up = present & (values == lowest)
+    weight = np.where(values < NUM_RANKS / 2, DIST_TO_LOWEST, DIST_TO_LOWEST_2)
+    e = np.zeros((batch, columns))
+    for i in range(depth):
+        share = np.where(length > 1, (i / np.maximum(length - 1, 1)) * weight[:, :, i], weight[:, :, i])
+        e = e + np.where(next_up[:, :, i], share, 0.0)
+
+    # Any descending pair counts, split by whether the suits match
+    paired = present[:, :, 1:]
+    descending = paired & (values[:, :, :-1] > values[:, :, 1:])
+    same_suit = suits[:, :, :-1] == suits[:, :, 1:]
+    ordered_suit = (descending & same_suit).sum(axis=2)
+    ordered = (descending & ~same_suit).sum(axis=2)
+    e = e + (ordered / pile) * ORDERED_MULT
+    e = e + (ordered_suit / pile) * SUIT_ORDERED_MULT
+    e = np.where(lengths > 0, e, 0.0)
+
+    to_foundation, targets = _move_sources(cards, lengths, foundations)
+    different_valid = (to_foundation | (targets > 0)).sum(axis=1)
+
+    # The string evaluate() parses splits into one leading "" plus one entry
+    # per column, and every "" (empty column) counts as empty.
+    empty = 1 + (lengths == 0).sum(axis=1)
+    entries = columns + 1
+
+    ev = 4000 + np.array([node.level for node in nodes], dtype=np.float64) * LEVEL_MULT
+    ev = ev - foundations.sum(axis=1) * FOUNDATION_MULT
+    ev = ev - different_valid * VALID_MOVES_MULT
+
+    # Same accumulation order as evaluate(): columns sorted by their text
+    order = np.array([sorted(range(columns), key=lambda col: "-".join([_PILE_TOKEN[c] for c in board.tableau[col]]))
+                      for board in boards], dtype=np.intp)
+    e = np.take_along_axis(e, order, axis=1)
+    for col in range(columns):
+        ev = ev - e[:, col]
+
+    ev = ev - EMPTY_MULT * (empty / 13.0)
+    ev = ev + ((entries - empty) - different_valid) * BLOCKED_MULT
+    # evaluate() compares the rank text to the int 0, so it never counts an ace
+    ev = ev - 4 * DISPATCH_ACE_MULT
+    ev = ev / 7000.0
+
+    goal = foundations.sum(axis=1) == len(SUITS) * NUM_RANKS
+    return np.where(goal, 0.0, ev).tolist()
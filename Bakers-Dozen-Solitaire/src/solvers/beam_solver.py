@@ -0,0 +1,179 @@
+# beam_solver.py
+
+"""
+Beam search: a breadth-first sweep that keeps only the best `beam_width`
+positions of each depth.
+
+Greedy and A* keep every generated node, so their memory and run time
+depend on how lost the heuristic gets on a deal. A beam holds at most
+beam_width positions per depth, so a run costs about
+beam_width * branching factor expansions per move of the solution, whatever
+the deal. The price is completeness: a beam can drop every position that
+leads to a win. With max_width set, a failed run restarts from scratch with
+a beam `widen` times wider, up to max_width.
+
+Expanding a depth (building, pruning and scoring every child) can be spread
+over worker processes; only the selection of the next beam runs in the
+main process.
+"""
+
+import heapq
+import multiprocessing
+import time
+
+from solvers.solver_base import Solver, VisitedSet
+from solvers.greedy_solver import GreedySolver
+from solvers.deadlock import is_dead
+from solvers.move_pruning import prune_moves
+
+DEFAULT_BEAM_WIDTH = 500
+
+# Beam width growth factor between two restarts
+DEFAULT_WIDEN = 4
+
+# Chunks per worker when a depth is split across processes; more chunks
+# balance the load better, fewer cost less pickling
+CHUNKS_PER_WORKER = 4
+
+
+def default_score(state):
+    """Scores a position with GreedySolver's heuristic (lower is better)."""
+    return GreedySolver.default_heuristic(None, state)
+
+
+def expand_states(task):
+    """
+    Builds and scores the children of several positions. Runs in worker
+    processes, so it only depends on its arguments.
+
+    Args:
+        task (tuple): (heuristic, pruning rules, prune_dead, entries) where
+                      entries lists (state, last move, parent key) triples.
+
+    Returns:
+        list: For each entry, a list of (score, move, child) for its children,
+              dead children left out.
+    """
+    heuristic, rules, prune_dead, entries = task
+    expanded = []
+    for state, last, parent_key in entries:
+        moves = state.get_valid_moves()
+        if rules:
+            moves = prune_moves(state, moves, last, parent_key, rules)
+        children = []
+        for move in moves:
+            child = state.apply_move(move)
+            if not (prune_dead and is_dead(child)):
+                children.append((heuristic(child), move, child))
+        expanded.append(children)
+    return expanded
+
+
+class BeamSolver(Solver):
+    """
+    Beam search with optional restarts at wider beams and optional
+    multi-process expansion.
+
+    After the search, `width` holds the beam width of the last run.
+    """
+
+    def __init__(self, initial_state, beam_width=DEFAULT_BEAM_WIDTH, max_width=None, widen=DEFAULT_WIDEN,
+                 max_depth=300, workers=1, heuristic=None, verbose=False, **kwargs):
+        """
+        Args:
+            beam_width (int): Positions kept per depth on the first run.
+            max_width (int, optional): Widest beam to restart with after a failed
+                                       run (no restart if None).
+            widen (int): Width growth factor between two runs.
+            max_depth (int): Depth at which a run gives up.
+            workers (int): Processes expanding each depth (1 expands in process).
+            heuristic (function, optional): Position score, lower is better;
+                                            default_score() if None. Must be a
+                                            module-level function when workers > 1.
+        """
+        super().__init__(initial_state, **kwargs)
+        self.beam_width = max(1, beam_width)
+        self.max_width = max_width
+        self.widen = max(2, widen)
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+        self.heuristic = default_score if heuristic is None else heuristic
+        self.verbose = verbose
+        self.width = None
+
+    def _search(self):
+        start_time = time.time()
+        pool = multiprocessing.Pool(self.workers) if self.workers > 1 else None
+        try:
+            width = self.beam_width
+            while True:
+                self.width = width
+                solution = yield from self._run(width, pool)
+                if solution is not None or self.max_width is None or width >= self.max_width:
+                    break
+                width = min(width * self.widen, self.max_width)
+                if self.verbose:
+                    print(f"Restarting with a beam of {width}")
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+        if solution is None:
+            print("No solution found.")
+        else:
+            print(f"Goal found in {self.nodes_expanded} steps (beam width {self.width})")
+            print(f"Time taken: {time.time() - start_time:.2f} seconds")
+        return solution
+
+    def _run(self, width, pool):
+        """One beam search of the given width; returns the solution moves or None"""
+        self.visited = VisitedSet()
+        root = self.make_node(self.initial_state)
+        self.visited.add(self.initial_state)
+        if self.initial_state.is_goal_state():
+            return []
+
+        beam = [(root, self.initial_state)]
+        for depth in range(self.max_depth):
+            for node, state in beam:
+                if self.tick(state, node):
+                    yield self.progress(len(beam))
+
+            entries = [(state, node.prev_move, node.parent.key if node.parent is not None else None)
+                       for node, state in beam]
+            candidates = []  # (score, order, parent node, move, child)
+            for (node, _), children in zip(beam, self._expand(entries, pool)):
+                for score, move, child in children:
+                    if child in self.visited:
+                        continue
+                    self.visited.add(child)
+                    if child.is_goal_state():
+                        return self.extract_solution(self.make_node(child, parent=node, prev_move=move))
+                    candidates.append((score, len(candidates), node, move, child))
+
+            if not candidates:
+                if self.verbose:
+                    print(f"Beam of {width} ran out of positions at depth {depth + 1}")
+                return None
+
+            selected = heapq.nsmallest(width, candidates)
+            if self.verbose:
+                print(f"[Depth {depth + 1}] {len(candidates)} children, best score {selected[0][0]:.1f}")
+            beam = [(self.make_node(child, parent=node, prev_move=move), child)
+                    for _, _, node, move, child in selected]
+
+        return None
+
+    def _expand(self, entries, pool):
+        """Runs expand_states() over the entries, in the pool if there is one"""
+        settings = (self.heuristic, self.move_rules(), self.prune_dead)
+        if pool is None:
+            return expand_states(settings + (entries,))
+
+        size = -(-len(entries) // (self.workers * CHUNKS_PER_WORKER))  # ceiling division
+        chunks = [entries[start:start + size] for start in range(0, len(entries), size)]
+        expanded = []
+        for part in pool.map(expand_states, [settings + (chunk,) for chunk in chunks]):
+            expanded.extend(part)
+        return expanded
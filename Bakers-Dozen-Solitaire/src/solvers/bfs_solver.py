@@ -1,32 +1,34 @@
 # bfs_solver.py
 
-from solvers.solver_base import Solver, SearchNode
+from solvers.solver_base import Solver
 from collections import deque
-from copy import deepcopy
 import time
-import pygame
 
 class BFSSolver(Solver):
-    def __init__(self, initial_state, max_depth=100, verbose=False):
-        super().__init__(initial_state)
+    # Breadth-first: every solution found is a shortest one
+    shortest = True
+
+    def __init__(self, initial_state, max_depth=100, verbose=False, **kwargs):
+        super().__init__(initial_state, **kwargs)
         self.max_depth = max_depth
         self.verbose = verbose
 
-    def solve(self):
+    def _search(self):
         start_time = time.time()
-        root = SearchNode(self.initial_state)
+        root = self.make_node(self.initial_state)
         queue = deque([root])
         self.visited.add(root)
 
         while queue:
-            pygame.event.pump()
             current = queue.popleft()
-            self.nodes_expanded += 1
+            state = current.state
+            if self.tick(state, current):
+                yield self.progress(len(queue))
 
             if self.verbose:
                 print(f"[Depth {current.depth}] Trying move: {current.prev_move}")
 
-            if current.state.is_goal_state():
+            if state.is_goal_state():
                 end_time = time.time()
                 print(f"Goal reached in {self.nodes_expanded} steps, {len(self.visited)} unique states")
                 print(f"Time taken: {end_time - start_time:.2f} seconds")
@@ -35,13 +37,13 @@ class BFSSolver(Solver):
             if current.depth >= self.max_depth:
                 continue
 
-            for move in current.state.get_valid_moves():
-                new_state = deepcopy(current.state)
-                new_state.apply_move(move)
-                child = SearchNode(new_state, parent=current, prev_move=move, depth=current.depth + 1)
+            parent_key = current.parent.key if current.parent is not None else None
+            for move in self.legal_moves(state, current.prev_move, parent_key):
+                new_state = state.apply_move(move)
 
-                if child not in self.visited:
-                    self.visited.add(child)
+                if new_state not in self.visited and not self.dead(new_state):
+                    child = self.make_node(new_state, parent=current, prev_move=move)
+                    self.visited.add(child, new_state)
                     queue.append(child)
 
         print("No solution found within depth limit.")
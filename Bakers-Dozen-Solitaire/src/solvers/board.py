@@ -0,0 +1,707 @@
+# board.py
+
+"""
+Compact, immutable board representation used by the solvers.
+
+Each card is encoded as a small int (suit_index * 13 + rank_index), every
+tableau column is a tuple of such ints and the foundations are reduced to
+four height counters (one per suit, in SUITS order). Boards are values:
+apply_move() returns a new Board and never mutates the original, so the
+solvers can share untouched columns between parent and child states instead
+of deep-copying pygame-backed Card objects. MutableBoard holds the same
+data in lists for depth-first walkers that play and take back moves in
+place (do_move / undo_move) on a single board.
+
+The rules mirror GameState exactly (including the automatic foundation
+promotion), and moves use the same tuple format so solutions found on a
+Board can be replayed on a GameState.
+
+Every board also carries a 64-bit Zobrist key. A tableau card contributes
+a random value chosen by (card, card beneath it) and a promoted card one
+chosen by the card alone, so a move only XORs out/in the entries of the
+card(s) it touches and the key is kept up to date in O(1) per card moved.
+The column index is deliberately not part of the key: boards that differ
+only in column order share it (see solvers/canonical.py).
+
+Boards also keep running totals of the heuristic terms (ordered pairs,
+same-suit ordered pairs, empty columns and the set of column tops), updated
+for the cards a move touches, so scoring a child never rescans the board.
+The number of legal moves follows from the tops and foundations alone.
+
+Move generation uses a top index kept the same way: for every card value,
+a bit set of the columns whose top card has that value. A column top can
+only go onto the columns listed under the next value, so generating the
+moves costs one pass over the columns plus one step per legal move, instead
+of comparing every pair of column tops.
+"""
+
+import random
+
+SUITS = ["Hearts", "Diamonds", "Clubs", "Spades"]
+RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
+
+NUM_RANKS = len(RANKS)
+NUM_CARDS = len(SUITS) * NUM_RANKS
+
+_SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+_RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+_SUIT_BY_INITIAL = {suit[0]: suit for suit in SUITS}
+
+# Zobrist tables. A fixed seed keeps keys identical across runs and processes.
+# "Beneath" is another card code, or NUM_CARDS for the bottom of a column.
+_zobrist_rng = random.Random(0xBD5EED)
+_Z_TABLEAU = [_zobrist_rng.getrandbits(64) for _ in range(NUM_CARDS * (NUM_CARDS + 1))]
+_Z_FOUNDATION = [_zobrist_rng.getrandbits(64) for _ in range(NUM_CARDS)]
+
+# Bit masks over a tops set (bit `card` set when the card is a column top),
+# one per card value
+_VALUE_MASKS = [sum(1 << (suit * NUM_RANKS + value) for suit in range(len(SUITS))) for value in range(NUM_RANKS)]
+
+# Indexes of the heuristic totals tuple
+ORDERED, SUITED, EMPTY, TOPS = range(4)
+
+
+def encode_card(suit, rank):
+    """
+    Encodes a suit/rank pair as a packed card int.
+
+    Args:
+        suit (str): Suit name (e.g., "Hearts").
+        rank (str): Rank name (e.g., "K", "3", "A").
+
+    Returns:
+        int: suit_index * 13 + rank_index.
+    """
+    return _SUIT_INDEX[suit] * NUM_RANKS + _RANK_INDEX[rank]
+
+
+def card_suit(code):
+    """Returns the suit index (position in SUITS) of a packed card."""
+    return code // NUM_RANKS
+
+
+def card_value(code):
+    """Returns the rank index of a packed card (same as Card.value())."""
+    return code % NUM_RANKS
+
+
+def card_name(code):
+    """Returns the short text form of a packed card (e.g., "10S", "AH")."""
+    return f"{RANKS[code % NUM_RANKS]}{SUITS[code // NUM_RANKS][0]}"
+
+
+def _z_tableau(card, beneath):
+    """Zobrist value of `card` lying on `beneath` (in any column)."""
+    return _Z_TABLEAU[card * (NUM_CARDS + 1) + beneath]
+
+
+def _pair(under, card):
+    """Returns (ordered, suited) for `card` lying on `under`: 1 when one rank lower, and of the same suit."""
+    if under % NUM_RANKS != card % NUM_RANKS + 1:
+        return 0, 0
+    return 1, 1 if under // NUM_RANKS == card // NUM_RANKS else 0
+
+
+def top_index(tops):
+    """
+    Builds the top index of a board from scratch.
+
+    Args:
+        tops (sequence): Packed top card of each column, -1 for an empty column.
+
+    Returns:
+        tuple: For each card value, a bit set of the columns whose top has that value.
+    """
+    index = [0] * NUM_RANKS
+    for col, top in enumerate(tops):
+        if top >= 0:
+            index[top % NUM_RANKS] |= 1 << col
+    return tuple(index)
+
+
+def _tops(tableau):
+    """Returns the packed top card of each column, -1 for an empty column."""
+    return [column[-1] if column else -1 for column in tableau]
+
+
+def heuristic_totals(tableau):
+    """
+    Computes the heuristic totals of a tableau from scratch.
+
+    Args:
+        tableau (sequence): Columns of packed cards.
+
+    Returns:
+        tuple: (ordered pairs, same-suit ordered pairs, empty columns, tops bit set),
+               indexed by ORDERED, SUITED, EMPTY and TOPS.
+    """
+    ordered = suited = empty = tops = 0
+    for column in tableau:
+        if not column:
+            empty += 1
+            continue
+        tops |= 1 << column[-1]
+        for i in range(len(column) - 1):
+            o, s = _pair(column[i], column[i + 1])
+            ordered += o
+            suited += s
+    return ordered, suited, empty, tops
+
+
+def _lift(totals, index, column, col):
+    """Updates totals and top index (lists) for the top card of column `col` leaving it."""
+    card = column[-1]
+    totals[TOPS] ^= 1 << card
+    index[card % NUM_RANKS] ^= 1 << col
+    if len(column) > 1:
+        under = column[-2]
+        o, s = _pair(under, card)
+        totals[ORDERED] -= o
+        totals[SUITED] -= s
+        totals[TOPS] |= 1 << under
+        index[under % NUM_RANKS] |= 1 << col
+    else:
+        totals[EMPTY] += 1
+
+
+def _drop(totals, index, column, col, card):
+    """Updates totals and top index (lists) for `card` being put on column `col`."""
+    if column:
+        under = column[-1]
+        o, s = _pair(under, card)
+        totals[ORDERED] += o
+        totals[SUITED] += s
+        totals[TOPS] ^= 1 << under
+        index[under % NUM_RANKS] ^= 1 << col
+    else:
+        totals[EMPTY] -= 1
+    totals[TOPS] |= 1 << card
+    index[card % NUM_RANKS] |= 1 << col
+
+
+def count_moves(tops, foundations):
+    """
+    Counts the legal moves from the column tops alone, without generating them.
+
+    Args:
+        tops (int): Bit set of the column top cards.
+        foundations (sequence): Foundation heights in SUITS order.
+
+    Returns:
+        int: len(get_valid_moves()) of the board.
+    """
+    # A top goes to its foundation when it is the next card of its suit
+    moves = 0
+    for suit, height in enumerate(foundations):
+        if height < NUM_RANKS and tops >> (suit * NUM_RANKS + height) & 1:
+            moves += 1
+    # Every top of value v can go on every top of value v + 1
+    counts = [(tops & mask).bit_count() for mask in _VALUE_MASKS]
+    for value in range(NUM_RANKS - 1):
+        moves += counts[value] * counts[value + 1]
+    return moves
+
+
+def zobrist_key(tableau, foundations):
+    """
+    Computes the Zobrist key of a board from scratch.
+
+    Args:
+        tableau (tuple): Column tuples of packed cards.
+        foundations (tuple): Foundation heights in SUITS order.
+
+    Returns:
+        int: 64-bit key.
+    """
+    key = 0
+    for column in tableau:
+        beneath = NUM_CARDS
+        for card in column:
+            key ^= _z_tableau(card, beneath)
+            beneath = card
+    for suit, height in enumerate(foundations):
+        for value in range(height):
+            key ^= _Z_FOUNDATION[suit * NUM_RANKS + value]
+    return key
+
+
+class Board:
+    """
+    Immutable solver-facing game state.
+
+    Attributes:
+        tableau (tuple of tuple of int): Tableau columns, bottom card first.
+        foundations (tuple of int): Number of cards on each foundation, in SUITS order.
+        key (int): 64-bit Zobrist key of the position.
+        totals (tuple): Heuristic totals, see heuristic_totals().
+        index (tuple): Top index, see top_index().
+    """
+
+    __slots__ = ("tableau", "foundations", "key", "totals", "index")
+
+    def __init__(self, tableau, foundations, key=None, totals=None, index=None):
+        """
+        Initializes a board from already packed data.
+
+        Args:
+            tableau (tuple): Tuple of column tuples of packed card ints.
+            foundations (tuple): Four foundation heights in SUITS order.
+            key (int, optional): Precomputed Zobrist key; computed if omitted.
+            totals (tuple, optional): Precomputed heuristic totals; computed if omitted.
+            index (tuple, optional): Precomputed top index; computed if omitted.
+        """
+        self.tableau = tableau
+        self.foundations = foundations
+        self.key = zobrist_key(tableau, foundations) if key is None else key
+        self.totals = heuristic_totals(tableau) if totals is None else totals
+        self.index = top_index(_tops(tableau)) if index is None else index
+
+    @classmethod
+    def from_game_state(cls, game_state):
+        """
+        Packs a GameState (Card objects) into a Board.
+
+        Args:
+            game_state (GameState): The state to convert.
+
+        Returns:
+            Board: Equivalent packed board.
+        """
+        tableau = tuple(
+            tuple(encode_card(card.suit, card.rank) for card in column)
+            for column in game_state.tableau
+        )
+        foundations = tuple(len(game_state.foundations.get(suit, ())) for suit in SUITS)
+        return cls(tableau, foundations)
+
+    def __eq__(self, other):
+        return self.tableau == other.tableau and self.foundations == other.foundations
+
+    def __hash__(self):
+        return self.key
+
+    def __repr__(self):
+        columns = " | ".join(" ".join(card_name(c) for c in column) for column in self.tableau)
+        return f"Board({columns} ; foundations={self.foundations})"
+
+    def is_goal_state(self):
+        """
+        Checks whether every foundation holds all 13 cards.
+
+        Returns:
+            bool: True if the game is won.
+        """
+        return all(height == NUM_RANKS for height in self.foundations)
+
+    def foundation_count(self):
+        """Returns the total number of cards already on the foundations."""
+        return sum(self.foundations)
+
+    def ordered_pairs(self):
+        """Returns the number of cards lying on a card one rank higher."""
+        return self.totals[ORDERED]
+
+    def suited_pairs(self):
+        """Returns the number of ordered pairs whose two cards share a suit."""
+        return self.totals[SUITED]
+
+    def empty_columns(self):
+        """Returns the number of empty tableau columns."""
+        return self.totals[EMPTY]
+
+    def move_count(self):
+        """Returns len(get_valid_moves()) without generating the moves."""
+        return count_moves(self.totals[TOPS], self.foundations)
+
+    def valid_foundation_move(self, code):
+        """
+        Determines whether a packed card can go to its foundation.
+
+        Args:
+            code (int): Packed card.
+
+        Returns:
+            bool: True if the card is the next one its foundation needs.
+        """
+        return code % NUM_RANKS == self.foundations[code // NUM_RANKS]
+
+    def get_lowest_value(self):
+        """
+        Returns the card value that is safe to auto-promote.
+
+        This is the same threshold GameState.get_lowest_value() computes:
+        the smallest foundation height.
+        """
+        return min(self.foundations)
+
+    def apply_move(self, move):
+        """
+        Returns the board reached by playing a move, followed by the
+        automatic foundation promotion GameState performs.
+
+        Args:
+            move (tuple): One of:
+                - ("foundation", from_col)
+                - ("tableau", from_col, to_col)
+
+        Returns:
+            Board: The resulting board (self if the source column is empty).
+        """
+        from_col = move[1]
+        source = self.tableau[from_col]
+        if not source:
+            return self
+
+        tableau = list(self.tableau)
+        foundations = list(self.foundations)
+        totals = list(self.totals)
+        index = list(self.index)
+        card = source[-1]
+        _lift(totals, index, source, from_col)
+        tableau[from_col] = source[:-1]
+        key = self.key ^ _z_tableau(card, source[-2] if len(source) > 1 else NUM_CARDS)
+
+        if move[0] == "foundation":
+            foundations[card // NUM_RANKS] += 1
+            key ^= _Z_FOUNDATION[card]
+        else:
+            to_col = move[2]
+            target = tableau[to_col]
+            key ^= _z_tableau(card, target[-1] if target else NUM_CARDS)
+            _drop(totals, index, target, to_col, card)
+            tableau[to_col] = target + (card,)
+
+        key = _auto_promote(tableau, foundations, key, totals, index)
+        return Board(tuple(tableau), tuple(foundations), key, tuple(totals), tuple(index))
+
+    def get_valid_moves(self):
+        """
+        Generates all legal moves, in the same order as GameState.get_valid_moves().
+
+        Returns:
+            list: Move tuples ("foundation", from_col) / ("tableau", from_col, to_col).
+        """
+        return generate_moves(_tops(self.tableau), self.foundations, self.index)
+
+
+class MutableBoard:
+    """
+    In-place counterpart of Board for depth-first walkers.
+
+    Holds the same packed data in lists so do_move() can play a move (and
+    its auto-promotion cascade) without building a new board, returning an
+    undo record that undo_move() reverses exactly. A DFS or IDA* search can
+    walk one MutableBoard for the whole search, keeping memory proportional
+    to the search depth. Use snapshot() to get an immutable Board to store.
+
+    Attributes:
+        tableau (list of list of int): Tableau columns, bottom card first.
+        foundations (list of int): Foundation heights, in SUITS order.
+        key (int): Zobrist key, identical to the Board key of the same position.
+        totals (list): Heuristic totals, see heuristic_totals().
+        index (list): Top index, see top_index().
+    """
+
+    __slots__ = ("tableau", "foundations", "key", "totals", "index")
+
+    def __init__(self, board):
+        """
+        Initializes a mutable copy of a board.
+
+        Args:
+            board (Board): Position to start from.
+        """
+        self.tableau = [list(column) for column in board.tableau]
+        self.foundations = list(board.foundations)
+        self.key = board.key
+        self.totals = list(board.totals)
+        self.index = list(board.index)
+
+    def snapshot(self):
+        """Returns the current position as an immutable Board."""
+        return Board(tuple(tuple(column) for column in self.tableau), tuple(self.foundations), self.key,
+                     tuple(self.totals), tuple(self.index))
+
+    def is_goal_state(self):
+        """Checks whether every foundation holds all 13 cards."""
+        return all(height == NUM_RANKS for height in self.foundations)
+
+    def foundation_count(self):
+        """Returns the total number of cards already on the foundations."""
+        return sum(self.foundations)
+
+    def get_valid_moves(self):
+        """Generates all legal moves, in the same order as Board.get_valid_moves()."""
+        return generate_moves(_tops(self.tableau), self.foundations, self.index)
+
+    ordered_pairs = Board.ordered_pairs
+    suited_pairs = Board.suited_pairs
+    empty_columns = Board.empty_columns
+    move_count = Board.move_count
+
+    def do_move(self, move):
+        """
+        Plays a move in place, followed by the automatic foundation promotion.
+
+        Args:
+            move (tuple): ("foundation", from_col) or ("tableau", from_col, to_col).
+
+        Returns:
+            tuple: (previous key, previous totals, previous top index, steps) where
+                   steps lists the (from_col, to_col, card) moves performed in order,
+                   to_col being None for a foundation.
+        """
+        key = self.key
+        steps = []
+        tableau = self.tableau
+        foundations = self.foundations
+        totals = self.totals
+        index = self.index
+        saved = tuple(totals)
+        saved_index = tuple(index)
+        from_col = move[1]
+        source = tableau[from_col]
+        if not source:
+            return key, saved, saved_index, steps
+
+        _lift(totals, index, source, from_col)
+        card = source.pop()
+        self.key ^= _z_tableau(card, source[-1] if source else NUM_CARDS)
+        if move[0] == "foundation":
+            foundations[card // NUM_RANKS] += 1
+            self.key ^= _Z_FOUNDATION[card]
+            steps.append((from_col, None, card))
+        else:
+            to_col = move[2]
+            target = tableau[to_col]
+            self.key ^= _z_tableau(card, target[-1] if target else NUM_CARDS)
+            _drop(totals, index, target, to_col, card)
+            target.append(card)
+            steps.append((from_col, to_col, card))
+
+        promoted = True
+        while promoted:
+            promoted = False
+            lowest = min(foundations)
+            for col_id, column in enumerate(tableau):
+                if column and column[-1] % NUM_RANKS == lowest:
+                    _lift(totals, index, column, col_id)
+                    card = column.pop()
+                    self.key ^= _z_tableau(card, column[-1] if column else NUM_CARDS) ^ _Z_FOUNDATION[card]
+                    foundations[card // NUM_RANKS] += 1
+                    steps.append((col_id, None, card))
+                    promoted = True
+                    break
+
+        return key, saved, saved_index, steps
+
+    def undo_move(self, record):
+        """
+        Reverts a move previously played with do_move().
+
+        Args:
+            record (tuple): The value do_move() returned.
+        """
+        key, totals, index, steps = record
+        tableau = self.tableau
+        for from_col, to_col, card in reversed(steps):
+            if to_col is None:
+                self.foundations[card // NUM_RANKS] -= 1
+            else:
+                tableau[to_col].pop()
+            tableau[from_col].append(card)
+        self.key = key
+        self.totals[:] = totals
+        self.index[:] = index
+
+def generate_moves(tops, foundations, index):
+    """
+    Move generator shared by Board, MutableBoard and GameState.
+
+    Args:
+        tops (sequence): Packed top card of each column, -1 for an empty column.
+        foundations (sequence): Foundation heights in SUITS order.
+        index (sequence): Top index of the same columns, see top_index().
+
+    Returns:
+        list: Legal moves, ordered by source column, foundation move first.
+    """
+    moves = []
+    last = NUM_RANKS - 1
+
+    for from_col, card in enumerate(tops):
+        if card < 0:
+            continue
+        value = card % NUM_RANKS
+
+        if value == foundations[card // NUM_RANKS]:
+            moves.append(("foundation", from_col))
+
+        # Walk the set bits of the target columns, lowest column first
+        targets = index[value + 1] if value < last else 0
+        while targets:
+            bit = targets & -targets
+            moves.append(("tableau", from_col, bit.bit_length() - 1))
+            targets ^= bit
+
+    return moves
+
+
+def _auto_promote(tableau, foundations, key, totals, index):
+    """
+    Moves every column top whose value equals the lowest foundation height
+    onto its foundation, repeating until no such card is exposed.
+
+    Operates in place on list copies of the board data, totals and top index.
+
+    Returns:
+        int: The Zobrist key updated for every promoted card.
+    """
+    promoted = True
+    while promoted:
+        promoted = False
+        lowest = min(foundations)
+        for col_id, column in enumerate(tableau):
+            if column and column[-1] % NUM_RANKS == lowest:
+                card = column[-1]
+                _lift(totals, index, column, col_id)
+                key ^= _z_tableau(card, column[-2] if len(column) > 1 else NUM_CARDS)
+                key ^= _Z_FOUNDATION[card]
+                foundations[card // NUM_RANKS] += 1
+                tableau[col_id] = column[:-1]
+                promoted = True
+                break
+    return key
+
+
+def parse_card_code(token):
+    """
+    Parses the text form of a card (e.g., "9H", "10S") into a packed card.
+
+    Args:
+        token (str): Rank followed by suit initial, as used in board files.
+
+    Returns:
+        int: Packed card.
+    """
+    return _SUIT_INDEX[_SUIT_BY_INITIAL[token[-1]]] * NUM_RANKS + _RANK_INDEX[token[:-1]]
+
+
+def load_board(path):
+    """
+    Loads a board file (same format as file_interaction.load_game_from_file)
+    straight into a Board, without creating any pygame Card.
+
+    Args:
+        path (str): Path to the board file.
+
+    Returns:
+        Board: The packed board.
+    """
+    tableau = []
+    foundations = [0] * len(SUITS)
+    reading_foundations = False
+
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            if line.startswith("FOUNDATIONS"):
+                reading_foundations = True
+                continue
+
+            if not reading_foundations:
+                tableau.append(tuple(parse_card_code(token) for token in line.split()))
+            else:
+                suit_name, *cards_str = line.replace(':', '').split()
+                foundations[_SUIT_INDEX[suit_name]] = len(cards_str)
+
+    return Board(tuple(tableau), tuple(foundations))
+
+
+# Baker's Dozen deals 13 columns of 4 cards
+NUM_COLUMNS = 13
+CARDS_PER_COLUMN = 4
+
+
+def deal_board(seed=None):
+    """
+    Deals a random board without creating any pygame Card. For the same
+    seed this is exactly the deal of deck.generate_random_game_state(seed):
+    a deck shuffled by random.Random(seed) is dealt four cards at a time
+    into 13 columns, and Kings are sent to the bottom of their column.
+
+    Args:
+        seed (int, optional): Seed for a private RNG. The same seed always
+                              deals the same board.
+
+    Returns:
+        Board: The packed board.
+    """
+    rng = random.Random(seed)
+    cards = list(range(NUM_CARDS))  # Same order as Deck: suit by suit, rank by rank
+    rng.shuffle(cards)
+
+    tableau = []
+    for _ in range(NUM_COLUMNS):
+        tableau.append(_kings_to_bottom([cards.pop() for _ in range(CARDS_PER_COLUMN)]))
+
+    return Board(tuple(tableau), (0,) * len(SUITS))
+
+
+def deal_number_board(number):
+    """
+    Deals board number `number`, in the style of the numbered FreeCell deals.
+
+    The shuffle is driven by the Microsoft C runtime LCG
+    (state = state * 214013 + 2531011 mod 2^31, output = state >> 16): each
+    step picks a card among those left, swaps it with the last one and deals
+    it. Cards are dealt row by row across the 13 columns, then Kings go to
+    the bottom of their column. The generator is a few integer operations,
+    so the deal doesn't depend on Python's random module and can be
+    reproduced by any tool from the number alone.
+
+    Args:
+        number (int): Deal number, 0 <= number < 2^31.
+
+    Returns:
+        Board: The packed board.
+    """
+    if not 0 <= number < 1 << 31:
+        raise ValueError(f"deal number must be in [0, 2^31), got {number}")
+
+    state = number
+    deck = list(range(NUM_CARDS))
+    dealt = []
+    while deck:
+        state = (state * 214013 + 2531011) & 0x7FFFFFFF
+        index = (state >> 16) % len(deck)
+        deck[index], deck[-1] = deck[-1], deck[index]
+        dealt.append(deck.pop())
+
+    tableau = tuple(_kings_to_bottom(dealt[col::NUM_COLUMNS]) for col in range(NUM_COLUMNS))
+    return Board(tableau, (0,) * len(SUITS))
+
+
+def _kings_to_bottom(column):
+    """Moves Kings to the bottom of a dealt column, like deck.send_kings_to_back()"""
+    kings = [card for card in column if card % NUM_RANKS == NUM_RANKS - 1]
+    others = [card for card in column if card % NUM_RANKS != NUM_RANKS - 1]
+    return tuple(kings + others)
+
+
+def as_board(state):
+    """
+    Returns a Board for either a Board or a GameState.
+
+    Args:
+        state (Board or GameState): State handed to a solver.
+
+    Returns:
+        Board: The packed board.
+    """
+    if isinstance(state, Board):
+        return state
+    return Board.from_game_state(state)
@@ -0,0 +1,44 @@
+# canonical.py
+
+"""
+Canonical-state service shared by every solver for duplicate detection.
+
+Columns in Baker's Dozen are interchangeable: two tableaux that only differ
+in column order have exactly the same future. The canonical form of a board
+sorts its columns, so all 13! orderings of one position collapse to a single
+state. Board.key is already column-order independent, so it doubles as the
+canonical hash; canonical_form() and same_position() are only needed to
+confirm a key match. Solvers keep searching on real boards, so their moves
+replay as-is on the original GameState.
+"""
+
+
+def canonical_form(board):
+    """
+    Returns a hashable, column-order independent description of a board.
+
+    Args:
+        board (Board): The board to describe.
+
+    Returns:
+        tuple: (sorted columns, foundations).
+    """
+    return (tuple(sorted(board.tableau)), board.foundations)
+
+
+def same_position(board, other):
+    """
+    Checks whether two boards are the same position up to column order.
+
+    Args:
+        board (Board or MutableBoard): First board.
+        other (Board or MutableBoard): Second board.
+
+    Returns:
+        bool: True if their canonical forms match.
+    """
+    if board.key != other.key or tuple(board.foundations) != tuple(other.foundations):
+        return False
+    # map(tuple, ...) lets a MutableBoard's list columns compare with a Board's tuples
+    return sorted(map(tuple, board.tableau)) == sorted(map(tuple, other.tableau))
+
@@ -0,0 +1,118 @@
+# deadlock.py
+
+"""
+Detection of provably dead (unwinnable) positions.
+
+A card can only leave its column onto a top card one rank higher, or to its
+foundation; nothing is ever placed on an empty column. Now take a card Y
+lying above a lower card of its own suit: Y can't go to its foundation
+before that card, which it covers, so its only way out is a tableau move
+onto one of the (at most four) cards one rank higher. If none of those can
+ever become a column top while Y is in place, Y never moves and the game
+is lost.
+
+Such cards can also hold each other: Y1 may only fit on a card buried
+under Y2 while Y2 only fits on a card buried under Y1. So the check takes
+every candidate Y as stuck and releases any of them that has a card one
+rank higher which is not on its foundation (Kings have none at all) and
+not buried beneath a card still taken as stuck. Whatever is left when
+nothing more can be released is truly stuck: whichever of those cards
+would move first has no target to move to.
+
+Only cards above a lower card of their suit are candidates, and there are
+few of them, so the whole check is a few dozen operations: cheap enough to
+prune every child during a search and to reject whole deals up front.
+"""
+
+from functools import lru_cache
+
+from solvers.board import NUM_CARDS, NUM_RANKS, SUITS
+
+# The (up to four) cards one rank higher than each card, with their suits
+_TARGETS = tuple(
+    () if card % NUM_RANKS + 1 == NUM_RANKS else
+    tuple((suit, suit * NUM_RANKS + card % NUM_RANKS + 1) for suit in range(len(SUITS)))
+    for card in range(NUM_CARDS)
+)
+
+
+@lru_cache(maxsize=1 << 16)
+def _column_candidates(column):
+    """Returns the cards of a column (a tuple) lying above a lower card of their suit."""
+    candidates = []
+    lowest = [NUM_RANKS] * len(SUITS)  # lowest rank of each suit beneath
+    for card in column:
+        suit, rank = divmod(card, NUM_RANKS)
+        if lowest[suit] < rank:
+            candidates.append(card)
+        elif rank < lowest[suit]:
+            lowest[suit] = rank
+    return tuple(candidates)
+
+
+def stuck_cards(board):
+    """
+    Finds the cards of a board that can provably never move again.
+
+    Args:
+        board (Board or MutableBoard): The position.
+
+    Returns:
+        list: Packed cards that are stuck (empty if none was found).
+    """
+    # Columns barely change from one position to the next, so the per-column
+    # scan is cached and most calls end here
+    tableau = board.tableau
+    candidates = []
+    for column in tableau:
+        candidates.extend(_column_candidates(tuple(column)))
+    if not candidates:
+        return []
+
+    owner = [None] * NUM_CARDS  # card -> its column
+    for col, column in enumerate(tableau):
+        for card in column:
+            owner[card] = col
+
+    # Start from every candidate and release the ones that have a way out,
+    # until the remaining set is consistent: no card in it can ever reach
+    # a target while the others stay put, so none of them ever moves.
+    foundations = board.foundations
+    stuck = set(candidates)
+    changed = True
+    while changed and stuck:
+        changed = False
+        covered = [-1] * len(tableau)  # column -> highest index of a stuck card in it
+        for card in stuck:
+            col = owner[card]
+            index = tableau[col].index(card)
+            if index > covered[col]:
+                covered[col] = index
+
+        for card in list(stuck):
+            for suit, target in _TARGETS[card]:  # Kings have none
+                if foundations[suit] > target % NUM_RANKS:
+                    continue
+                col = owner[target]
+                if col is None:  # Not in this (partial) deal
+                    continue
+                if covered[col] > tableau[col].index(target):
+                    continue
+                stuck.discard(card)
+                changed = True
+                break
+
+    return sorted(stuck)
+
+
+def is_dead(board):
+    """
+    Checks whether a position can provably never be won.
+
+    Args:
+        board (Board or MutableBoard): The position.
+
+    Returns:
+        bool: True if some card is stuck for good (see stuck_cards()).
+    """
+    return bool(stuck_cards(board))
@@ -1,48 +1,75 @@
 # dfs_solver.py
 
-from solvers.solver_base import Solver, SearchNode
-from collections import deque
-from copy import deepcopy
+from solvers.solver_base import Solver
+from solvers.board import MutableBoard
+from solvers.move_pruning import order_moves, REVERSAL, FORCED_FOUNDATION
 import time
-import pygame
 
 class DFSSolver(Solver):
-    def __init__(self, initial_state, max_depth=100, verbose=False):
-        super().__init__(initial_state)
+    # Forcing safe foundation moves never cost expansions on deals 0-19; the
+    # one-target rule did (deals 1, 18 and 19 got slower or unsolved)
+    pruning_rules = frozenset((REVERSAL, FORCED_FOUNDATION))
+
+    def __init__(self, initial_state, max_depth=100, verbose=False, **kwargs):
+        super().__init__(initial_state, **kwargs)
         self.max_depth = max_depth
         self.verbose = verbose
 
-    def solve(self):
+    def _search(self):
+        """
+        Depth-first search that walks a single MutableBoard, playing moves with
+        do_move() and backtracking with undo_move(). Only the current path and
+        one move iterator per depth are kept, besides the visited set.
+        """
         start_time = time.time()
-        root = SearchNode(self.initial_state)
-        stack = deque([root])
-        self.visited.add(root)
-
-        while stack:
-            pygame.event.pump()
-            current = stack.pop()
-            self.nodes_expanded += 1
-
-            if self.verbose:
-                print(f"[Depth {current.depth}] Trying move: {current.prev_move}")
-
-            if current.state.is_goal_state():
-                end_time = time.time()
-                print(f"Goal reached in {self.nodes_expanded} steps, {len(self.visited)} unique states")
-                print(f"Time taken: {end_time - start_time:.2f} seconds")
-                return self.extract_solution(current)
-
-            if current.depth >= self.max_depth:
-                continue
-
-            for move in reversed(current.state.get_valid_moves()):
-                new_state = deepcopy(current.state)
-                new_state.apply_move(move)
-                child = SearchNode(new_state, parent=current, prev_move=move, depth=current.depth + 1)
-
-                if child not in self.visited:
-                    self.visited.add(child)
-                    stack.append(child)
+        board = MutableBoard(self.initial_state)
+        self.visited.add(self.initial_state)
+        path = []     # moves from the root to the current board
+        records = []  # undo record of each move in path
+        pending = []  # untried moves, one iterator per depth
+        expand = True
+
+        while True:
+            if expand:
+                if self.tick(board, path):
+                    yield self.progress(len(path))
+
+                if self.verbose:
+                    print(f"[Depth {len(path)}] Trying move: {path[-1] if path else None}")
+
+                if board.is_goal_state():
+                    end_time = time.time()
+                    print(f"Goal reached in {self.nodes_expanded} steps, {len(self.visited)} unique states")
+                    print(f"Time taken: {end_time - start_time:.2f} seconds")
+                    return path
+
+                if len(path) < self.max_depth:
+                    parent_key = records[-1][0] if records else None  # key before the last move
+                    moves = order_moves(board, self.legal_moves(board, path[-1] if path else None, parent_key))
+                else:
+                    moves = []
+                pending.append(iter(moves))
+
+            expand = False
+            for move in pending[-1]:
+                record = board.do_move(move)
+
+                # Compared in place; only a new position is copied to be stored
+                if board not in self.visited and not self.dead(board):
+                    self.visited.add(board.snapshot())
+                    path.append(move)
+                    records.append(record)
+                    expand = True
+                    break
+
+                board.undo_move(record)
+
+            if not expand:
+                pending.pop()
+                if not path:
+                    break
+                path.pop()
+                board.undo_move(records.pop())
 
         print("No solution found within depth limit.")
         return None
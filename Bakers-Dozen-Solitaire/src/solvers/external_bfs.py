@@ -0,0 +1,355 @@
+# external_bfs.py
+
+"""
+External-memory (disk-backed) breadth-first search.
+
+BFSSolver keeps its queue and visited set as Python objects, so memory runs
+out a few layers deep. This solver keeps nothing but one bounded buffer in
+memory: every depth layer is a file of sorted, fixed-size packed states and
+duplicates are removed after the fact (delayed duplicate detection):
+
+    1. Stream layer d from disk and expand every state. Children go into a
+       buffer of at most `buffer_size` records; a full buffer is sorted,
+       deduplicated and written out as a run file.
+    2. Merge the runs (they are sorted, so this streams) and drop every
+       state present in the "seen" file, which holds all earlier layers in
+       sorted order. What is left is layer d + 1.
+    3. Merge layer d + 1 into the seen file.
+
+A state is packed as its four foundation heights followed by its columns
+sorted (column order doesn't matter, as in solvers/canonical.py), cards
+stored as code + 1 and columns separated by a zero byte, padded to a fixed
+size. Records compare as plain bytes, so sorting and merging never decode
+them.
+
+When the last layer comes out empty without reaching the goal, the whole
+reachable space has been enumerated and the deal is proven unsolvable
+(`exhausted` is set). When the goal turns up, the path is rebuilt by
+walking the layer files back to the root, one layer scan per move. The
+line to the best board expanded so far (best_line) is rebuilt the same
+way, only when a progress snapshot is due or the search ends.
+"""
+
+import heapq
+import os
+import shutil
+import tempfile
+import time
+
+from solvers.solver_base import Solver
+from solvers.board import Board, SUITS, NUM_CARDS
+
+# Records held in memory before a sorted run is written out
+DEFAULT_BUFFER_SIZE = 500000
+
+# Records read or written per file operation
+IO_BLOCK_RECORDS = 4096
+
+# Most run files merged at once; more runs are first merged in passes
+MERGE_FAN_IN = 64
+
+
+def record_size(columns):
+    """Returns the packed size of a board with `columns` tableau columns."""
+    return len(SUITS) + NUM_CARDS + columns - 1
+
+
+def pack_state(board, size):
+    """
+    Packs a board into a fixed-size record, ignoring column order.
+
+    Args:
+        board (Board or MutableBoard): The position.
+        size (int): Record size, see record_size().
+
+    Returns:
+        bytes: The record.
+    """
+    tableau = b"\0".join(bytes([card + 1 for card in column]) for column in sorted(board.tableau))
+    return (bytes(board.foundations) + tableau).ljust(size, b"\0")
+
+
+def unpack_state(record, columns):
+    """
+    Rebuilds a board from a record (columns come back in sorted order).
+
+    Args:
+        record (bytes): Packed state.
+        columns (int): Number of tableau columns.
+
+    Returns:
+        Board: The position, foundations included.
+    """
+    suits = len(SUITS)
+    # Padding zeros follow the last separator, so only the first pieces are columns
+    pieces = record[suits:].split(b"\0")[:columns]
+    # Duplicates are found by comparing records, so the Zobrist key is never
+    # used here: skip computing it
+    return Board(tuple(tuple(byte - 1 for byte in piece) for piece in pieces), tuple(record[:suits]), key=0)
+
+
+def read_records(path, size):
+    """Yields the records of a file, in file order."""
+    block = size * IO_BLOCK_RECORDS
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(block)
+            if not data:
+                return
+            for offset in range(0, len(data), size):
+                yield data[offset:offset + size]
+
+
+def write_records(path, records):
+    """
+    Writes records to a file.
+
+    Returns:
+        int: Number of records written.
+    """
+    count = 0
+    chunk = []
+    with open(path, "wb") as f:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == IO_BLOCK_RECORDS:
+                f.write(b"".join(chunk))
+                count += len(chunk)
+                chunk = []
+        f.write(b"".join(chunk))
+        count += len(chunk)
+    return count
+
+
+def unique(records):
+    """Drops consecutive duplicates from a sorted record stream."""
+    previous = None
+    for record in records:
+        if record != previous:
+            yield record
+            previous = record
+
+
+def difference(records, seen):
+    """Yields the records of a sorted stream that are not in the sorted stream `seen`."""
+    seen = iter(seen)
+    current = next(seen, None)
+    for record in records:
+        while current is not None and current < record:
+            current = next(seen, None)
+        if record != current:
+            yield record
+
+
+class ExternalBFSSolver(Solver):
+    """
+    Layered breadth-first search with the layers on disk. Memory stays at
+    about buffer_size records whatever the size of the layers; the price is
+    rereading the seen file once per layer.
+
+    After the search, `layer_sizes` lists the number of new states per depth
+    and `exhausted` tells whether the whole reachable space was explored
+    without finding the goal, i.e. the deal is unsolvable.
+    """
+
+    # Breadth-first: every solution found is a shortest one
+    shortest = True
+
+    def __init__(self, initial_state, max_depth=None, buffer_size=DEFAULT_BUFFER_SIZE, work_dir=None,
+                 keep_files=False, verbose=False, **kwargs):
+        """
+        Args:
+            max_depth (int, optional): Deepest layer to build (unbounded if None).
+            buffer_size (int): Records held in memory before writing a sorted run.
+            work_dir (str, optional): Directory for the layer files (a fresh temporary
+                                      directory if None).
+            keep_files (bool): Keep the layer files after the search.
+        """
+        super().__init__(initial_state, **kwargs)
+        self.max_depth = max_depth
+        self.buffer_size = max(1, buffer_size)
+        self.work_dir = work_dir
+        self.keep_files = keep_files
+        self.verbose = verbose
+        self.columns = len(self.initial_state.tableau)
+        self.size = record_size(self.columns)
+        self.layer_sizes = []
+        self.exhausted = False
+
+    def _search(self):
+        start_time = time.time()
+        work_dir = tempfile.mkdtemp(prefix="bfs_layers_", dir=self.work_dir)
+        try:
+            solution = yield from self._layers(work_dir)
+        finally:
+            if not self.keep_files:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+        if solution is not None:
+            print(f"Goal reached in {self.nodes_expanded} steps, {sum(self.layer_sizes)} unique states")
+        elif self.exhausted:
+            print(f"Deal proven unsolvable: {sum(self.layer_sizes)} reachable states")
+        else:
+            print("No solution found within depth limit.")
+        print(f"Time taken: {time.time() - start_time:.2f} seconds")
+        return solution
+
+    def _layers(self, work_dir):
+        """Builds the layers one by one; returns the solution moves or None"""
+        size = self.size
+
+        def layer_path(depth):
+            return os.path.join(work_dir, f"layer_{depth}.bin")
+
+        seen_path = os.path.join(work_dir, "seen.bin")
+
+        if self.initial_state.is_goal_state():
+            return []
+
+        root = pack_state(self.initial_state, size)
+        write_records(layer_path(0), [root])
+        write_records(seen_path, [root])
+        self.layer_sizes.append(1)
+
+        # Layer and record of the best board expanded, until best_line is rebuilt
+        self._best_record = None
+
+        depth = 0
+        while self.max_depth is None or depth < self.max_depth:
+            runs = []
+            buffer = []
+            goal = None
+
+            for record in read_records(layer_path(depth), size):
+                board = unpack_state(record, self.columns)
+                best = self.best_foundations
+                due = self.tick(board)
+                if self.best_foundations > best:
+                    self._best_record = (depth, record)
+                if due:
+                    self._trace_best(layer_path)
+                    yield self.progress(self.layer_sizes[-1])
+
+                for move in self.legal_moves(board):
+                    child = board.apply_move(move)
+                    if self.dead(child):
+                        continue
+                    packed = pack_state(child, size)
+                    if child.is_goal_state():
+                        goal = packed
+                    buffer.append(packed)
+
+                if len(buffer) >= self.buffer_size:
+                    runs.append(self._write_run(work_dir, depth, len(runs), buffer))
+                    buffer = []
+
+                if goal is not None:
+                    break
+
+            if goal is not None:
+                if self.verbose:
+                    print(f"Goal found at depth {depth + 1}, rebuilding the path")
+                return self._rebuild(layer_path, depth, goal)
+
+            if buffer:
+                runs.append(self._write_run(work_dir, depth, len(runs), buffer))
+                buffer = []
+            runs = self._merge_runs(work_dir, depth, runs)
+
+            # New layer: merged runs minus every state of the earlier layers
+            children = unique(heapq.merge(*(read_records(run, size) for run in runs)))
+            count = write_records(layer_path(depth + 1),
+                                  self._paced(difference(children, read_records(seen_path, size))))
+            for run in runs:
+                os.remove(run)
+
+            if self.verbose:
+                print(f"[Depth {depth + 1}] {count} new states")
+            if count == 0:
+                self.exhausted = self.unsolvable = True
+                self._trace_best(layer_path)
+                return None
+            self.layer_sizes.append(count)
+
+            merged_path = seen_path + ".new"
+            write_records(merged_path, self._paced(heapq.merge(read_records(seen_path, size),
+                                                               read_records(layer_path(depth + 1), size))))
+            os.replace(merged_path, seen_path)
+            depth += 1
+
+        self._trace_best(layer_path)
+        return None
+
+    def _write_run(self, work_dir, depth, number, buffer):
+        """Sorts and deduplicates a buffer into a run file; returns its path"""
+        path = os.path.join(work_dir, f"run_{depth}_{number}.bin")
+        buffer.sort()
+        write_records(path, self._paced(unique(buffer)))
+        return path
+
+    def _merge_runs(self, work_dir, depth, runs):
+        """Merges runs in passes until at most MERGE_FAN_IN are left; returns their paths"""
+        number = len(runs)
+        while len(runs) > MERGE_FAN_IN:
+            group, runs = runs[:MERGE_FAN_IN], runs[MERGE_FAN_IN:]
+            path = os.path.join(work_dir, f"run_{depth}_{number}.bin")
+            write_records(path, self._paced(unique(heapq.merge(*(read_records(run, self.size) for run in group)))))
+            for run in group:
+                os.remove(run)
+            runs.append(path)
+            number += 1
+        return runs
+
+    def _paced(self, records):
+        """
+        Passes a record stream through, calling the progress callback every
+        progress_interval records. The merge and path rebuilding phases expand
+        nothing, so tick() would not run during them (and must not: it counts
+        expansions); this keeps a budget checked there too.
+        """
+        callback = self.progress_callback
+        if callback is None:
+            yield from records
+            return
+        for count, record in enumerate(records, 1):
+            if count % self.progress_interval == 0:
+                callback(self)
+            yield record
+
+    def _trace_best(self, layer_path):
+        """Rebuilds best_line from the layer files, if the best board changed since the last time"""
+        if self._best_record is not None:
+            depth, record = self._best_record
+            self.best_line = self._rebuild(layer_path, depth - 1, record)
+            self._best_record = None
+
+    def _rebuild(self, layer_path, depth, goal):
+        """
+        Recovers the moves to `goal`, a child of a state in layer `depth`
+        (the root itself when `depth` is -1).
+
+        Each layer is scanned for a parent of the state found so far, giving
+        the chain of packed states back to the root; the chain is then
+        replayed from the real initial board to get moves in real column order.
+        """
+        size = self.size
+        chain = [goal]
+        for d in range(depth, -1, -1):
+            target = chain[-1]
+            for record in self._paced(read_records(layer_path(d), size)):
+                board = unpack_state(record, self.columns)
+                if any(pack_state(board.apply_move(move), size) == target for move in board.get_valid_moves()):
+                    chain.append(record)
+                    break
+        chain.reverse()
+
+        moves = []
+        board = self.initial_state
+        for target in chain[1:]:
+            for move in board.get_valid_moves():
+                child = board.apply_move(move)
+                if pack_state(child, size) == target:
+                    moves.append(move)
+                    board = child
+                    break
+        return moves
@@ -1,71 +1,88 @@
 # greedy_solver.py
 
-from solvers.solver_base import Solver, SearchNode
-from heapq import heappush, heappop
-from copy import deepcopy
+from solvers.solver_base import Solver
+from solvers.batch_heuristic import default_heuristic_batch
+from solvers.open_list import BucketQueue, DEFAULT_QUANTUM
 import time
-import pygame
 
 class GreedySolver(Solver):
-    def __init__(self, initial_state, verbose=True):
-        super().__init__(initial_state)
+    def __init__(self, initial_state, verbose=True, batch_heuristic=False, tie_break="shallow",
+                 quantum=DEFAULT_QUANTUM, **kwargs):
+        super().__init__(initial_state, **kwargs)
         self.heuristic = self.default_heuristic
+        # Optionally scores all children of an expansion in one NumPy call (same
+        # values). Off by default: the board keeps the heuristic terms up to
+        # date, so the scalar heuristic is O(1) and cheaper than packing arrays.
+        # Set to None when replacing self.heuristic
+        self.heuristic_batch = default_heuristic_batch if batch_heuristic else None
         self.verbose = verbose
+        # Open list settings, see solvers/open_list.py
+        self.tie_break = tie_break
+        self.quantum = quantum
 
-    def solve(self):
+    def _search(self):
         start_time = time.time()
-        root = SearchNode(self.initial_state)
-        open_list = []
-        heappush(open_list, (self.heuristic(root.state), root))
+        root = self.make_node(self.initial_state, f=self.heuristic(self.initial_state))
+        open_list = BucketQueue(self.quantum, self.tie_break)
+        open_list.push(root.f, root)
         self.visited.add(root)
 
         while open_list:
-            pygame.event.pump()
-            _, current = heappop(open_list)
-            self.nodes_expanded += 1
+            current = open_list.pop()
+            state = current.state
+            if self.tick(state, current):
+                yield self.progress(len(open_list))
 
             if self.verbose:
-                print(f"Expanding move: {current.prev_move} | Heuristic: {self.heuristic(current.state):.4f}")
+                print(f"Expanding move: {current.prev_move} | Heuristic: {current.f:.4f}")
 
-            if current.state.is_goal_state():
+            if state.is_goal_state():
                 end_time = time.time()
                 print(f"Goal found in {self.nodes_expanded} steps")
                 print(f"Time taken: {end_time - start_time:.2f} seconds")
                 return self.extract_solution(current)
 
-            for move in current.state.get_valid_moves():
-                new_state = deepcopy(current.state)
-                new_state.apply_move(move)
-                child = SearchNode(new_state, parent=current, prev_move=move, depth=current.depth + 1)
+            children = []
+            states = []
+            parent_key = current.parent.key if current.parent is not None else None
+            for move in self.legal_moves(state, current.prev_move, parent_key):
+                new_state = state.apply_move(move)
 
-                if child not in self.visited:
-                    self.visited.add(child)
-                    heappush(open_list, (self.heuristic(child.state), child))
+                if new_state not in self.visited and not self.dead(new_state):
+                    child = self.make_node(new_state, parent=current, prev_move=move)
+                    self.visited.add(child, new_state)
+                    children.append(child)
+                    states.append(new_state)
+
+            for child, score in zip(children, self.score_states(states)):
+                child.f = score
+                open_list.push(child.f, child)
 
         return None
 
+    def score_states(self, states):
+        """Heuristic values of several states, batched when possible"""
+        if self.heuristic_batch is not None:
+            return self.heuristic_batch(states)
+        return [self.heuristic(state) for state in states]
+
     def default_heuristic(self, state):
         score = 1000  # base cost
 
+        # Every term is kept up to date by the board as moves are played
+
         # 1. Foundation progress
-        total_foundation = sum(len(pile) for pile in state.foundations.values())
+        total_foundation = state.foundation_count()
         score -= total_foundation * 10
 
         # 2. Empty columns
-        empty_cols = sum(1 for col in state.tableau if not col)
-        score -= empty_cols * 3
+        score -= state.empty_columns() * 3
 
         # 3. Ordered sequences & suit consistency
-        for col in state.tableau:
-            for i in range(len(col) - 1):
-                above = col[i]
-                below = col[i + 1]
-                if above.value() == below.value() + 1:
-                    score -= 2
-                    if above.suit == below.suit:
-                        score -= 2
+        score -= state.ordered_pairs() * 2
+        score -= state.suited_pairs() * 2
 
         # 4. Available moves
-        score -= len(state.get_valid_moves()) * 1.5
+        score -= state.move_count() * 1.5
 
         return score
@@ -0,0 +1,323 @@
+# hda_star.py
+
+"""
+Hash-distributed A* (HDA*) over worker processes.
+
+Every position belongs to one worker, chosen by its Zobrist key. Each
+worker runs its own open list and closed table for the positions it owns;
+children owned by another worker are sent to it in batches. As the key
+ignores column order, a position and all its column permutations meet on
+the same worker, so duplicates are still caught with no shared memory.
+
+The workers advance in rounds: each expands up to round_size nodes, sends
+its batches straight to their owners and reports to the coordinator (the
+solver, in the main process). The next round starts once every worker has
+reported, and a worker first waits for exactly the batches sent to it in
+the previous round (batches carry their round number), so the coordinator
+always knows what is in flight. This is what makes termination exact:
+
+    - With the default heuristic, the search stops at the first goal found.
+    - With admissible=True, a goal of cost C is only returned once no open
+      node anywhere (including the nodes just sent) has f < C, so the
+      solution is a shortest one.
+    - When every open list is empty and nothing was sent, the reachable
+      space is exhausted: the deal is unsolvable.
+
+Closed tables are PositionMaps: a position's (depth, parent position) is
+only found for the same position, compared in full, never for another one
+sharing its key. The solution is rebuilt by asking each position's owner
+for its parent, back to the root, then replaying the chain from the
+initial board (positions met on the way may have their columns in another
+order than the moves expect).
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+
+from solvers.solver_base import Solver, PositionMap
+from solvers.astar_solver import AStarSolver
+from solvers.canonical import same_position
+from solvers.deadlock import is_dead
+from solvers.lower_bound import moves_left_bound
+from solvers.move_pruning import prune_moves
+from solvers.open_list import BucketQueue, DEFAULT_QUANTUM
+
+# Expansions per worker between two exchanges
+DEFAULT_ROUND_SIZE = 2000
+
+# Seconds to wait for a worker to exit before killing it
+JOIN_TIMEOUT = 5
+
+INFINITY = float("inf")
+
+
+def default_score(state):
+    """Scores a position with AStarSolver's heuristic."""
+    return AStarSolver.default_heuristic(None, state)
+
+
+class _Node:
+    """Open list entry of a worker: the move and parent position feed move pruning"""
+
+    __slots__ = ("f", "depth", "state", "move", "parent")
+
+    def __init__(self, f, depth, state, move, parent):
+        self.f = f
+        self.depth = depth
+        self.state = state
+        self.move = move
+        self.parent = parent
+
+
+class _Worker:
+    """State of one HDA* worker process"""
+
+    def __init__(self, number, inboxes, reports, settings):
+        self.number = number
+        self.inboxes = inboxes
+        self.reports = reports
+        (self.heuristic, self.weight, self.shortest, self.rules, self.prune_dead,
+         self.round_size, self.quantum, self.tie_break) = settings
+        self.open_list = BucketQueue(self.quantum, self.tie_break)
+        self.closed = PositionMap()  # position -> (depth, parent position)
+        self.batches = [[] for _ in inboxes]
+
+    def run(self):
+        """Serves messages until told to stop"""
+        inbox = self.inboxes[self.number]
+        received = {}  # round -> batches received that were sent during it
+        start = None   # ("round", number, expected batches, incumbent) still to play
+        while True:
+            message = inbox.get()
+            kind = message[0]
+            if kind == "batch":
+                _, sent_in, entries = message
+                for entry in entries:
+                    self.insert(*entry)
+                received[sent_in] = received.get(sent_in, 0) + 1
+            elif kind == "round":
+                start = message
+            elif kind == "trace":
+                self.reports.put(("trace", self.closed.get(message[1])[1]))
+            elif kind == "stop":
+                return
+
+            # A round starts once every batch of the round before is in
+            if start is not None and received.get(start[1] - 1, 0) == start[2]:
+                received.pop(start[1] - 1, None)
+                self.play_round(start[1], start[3])
+                start = None
+
+    def insert(self, f, depth, state, move, parent):
+        """Queues a position this worker owns, unless it was reached as cheaply before"""
+        known = self.closed.get(state)
+        if known is not None and known[0] <= depth:
+            return
+        self.closed[state] = (depth, parent)
+        self.open_list.push(f, _Node(f, depth, state, move, parent))
+
+    def play_round(self, number, incumbent):
+        """Expands up to round_size nodes and sends the children to their owners"""
+        workers = len(self.inboxes)
+        expanded = 0
+        goal = None  # (depth, position)
+        best = 0
+        sent_f = INFINITY
+        while self.open_list and expanded < self.round_size:
+            node = self.open_list.pop()
+            state = node.state
+            if self.closed.get(state)[0] < node.depth:
+                continue  # Reached again by a shorter path since it was queued
+            if node.depth >= min(incumbent, goal[0] if goal is not None else INFINITY):
+                continue  # Can't beat the goal already found
+
+            expanded += 1
+            best = max(best, state.foundation_count())
+            if state.is_goal_state():
+                goal = (node.depth, state)
+                if not self.shortest:
+                    break
+                continue
+
+            moves = state.get_valid_moves()
+            if self.rules:
+                parent_key = node.parent.key if node.parent is not None else None
+                moves = prune_moves(state, moves, node.move, parent_key, self.rules)
+            depth = node.depth + 1
+            for move in moves:
+                child = state.apply_move(move)
+                if self.prune_dead and is_dead(child):
+                    continue
+                f = depth + self.weight * self.heuristic(child)
+                owner = child.key % workers
+                if owner == self.number:
+                    self.insert(f, depth, child, move, state)
+                else:
+                    # Siblings share the parent object, so a batch pickles it once
+                    self.batches[owner].append((f, depth, child, move, state))
+                    sent_f = min(sent_f, f)
+
+        sent = [0] * workers
+        for owner, batch in enumerate(self.batches):
+            if batch:
+                self.inboxes[owner].put(("batch", number, batch))
+                sent[owner] = 1
+                self.batches[owner] = []
+
+        # Lowest f left here (stale entries dropped), for the admissible stopping rule
+        low_f = sent_f
+        while self.open_list:
+            node = self.open_list.pop()
+            if self.closed.get(node.state)[0] == node.depth:
+                self.open_list.push(node.f, node)
+                low_f = min(low_f, node.f)
+                break
+
+        self.reports.put(("done", expanded, len(self.open_list), goal, low_f, sent, best))
+
+
+def _hda_worker(number, inboxes, reports, settings):
+    """Process entry point of an HDA* worker"""
+    _Worker(number, inboxes, reports, settings).run()
+
+
+class HDAStarSolver(Solver):
+    """
+    A* spread over worker processes by state hash (see the module docstring).
+
+    After the search, `rounds` holds the number of exchange rounds and
+    `exhausted` tells whether the whole reachable space was searched
+    without finding the goal.
+    """
+
+    def __init__(self, initial_state, workers=None, weight=1.0, admissible=False, round_size=DEFAULT_ROUND_SIZE,
+                 tie_break="shallow", quantum=DEFAULT_QUANTUM, heuristic=None, verbose=False, **kwargs):
+        """
+        Args:
+            workers (int, optional): Worker processes (one per CPU if None).
+            weight (float): Weighted A* factor, as for AStarSolver.
+            admissible (bool): Score with moves_left_bound() and only stop once
+                               the solution is proven shortest (with weight 1).
+            round_size (int): Expansions per worker between two exchanges.
+            heuristic (function, optional): Module-level scoring function
+                                            replacing the default one.
+        """
+        super().__init__(initial_state, **kwargs)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.weight = weight
+        self.admissible = admissible
+        self.round_size = max(1, round_size)
+        self.tie_break = tie_break
+        self.quantum = quantum
+        if heuristic is None:
+            heuristic = moves_left_bound if admissible else default_score
+        self.heuristic = heuristic
+        self.shortest = admissible and weight == 1
+        self.verbose = verbose
+        self.rounds = 0
+        self.exhausted = False
+
+    def _search(self):
+        start_time = time.time()
+        workers = self.workers
+        inboxes = [multiprocessing.Queue() for _ in range(workers)]
+        reports = multiprocessing.Queue()
+        settings = (self.heuristic, self.weight, self.shortest, self.move_rules(), self.prune_dead,
+                    self.round_size, self.quantum, self.tie_break)
+        processes = [multiprocessing.Process(target=_hda_worker, args=(number, inboxes, reports, settings),
+                                             daemon=True)
+                     for number in range(workers)]
+        for process in processes:
+            process.start()
+
+        solution = None
+        try:
+            root = self.initial_state
+            owner = root.key % workers
+            inboxes[owner].put(("batch", 0, [(self.weight * self.heuristic(root), 0, root, None, None)]))
+            incoming = [0] * workers  # batches sent to each worker during the last round
+            incoming[owner] = 1
+            goal = None  # (depth, position) of the best goal found
+
+            while True:
+                self.rounds += 1
+                incumbent = goal[0] if goal is not None else INFINITY
+                for number, inbox in enumerate(inboxes):
+                    inbox.put(("round", self.rounds, incoming[number], incumbent))
+
+                incoming = [0] * workers
+                frontier = 0
+                low_f = INFINITY
+                for _ in range(workers):
+                    _, expanded, open_size, found, worker_low_f, sent, best = self._report(reports, processes)
+                    self.nodes_expanded += expanded
+                    self.best_foundations = max(self.best_foundations, best)
+                    frontier += open_size
+                    low_f = min(low_f, worker_low_f)
+                    incoming = [count + extra for count, extra in zip(incoming, sent)]
+                    if found is not None and (goal is None or found[0] < goal[0]):
+                        goal = found
+
+                # A GUI caller keeps its window alive through the callback
+                if self.progress_callback is not None:
+                    self.progress_callback(self)
+                yield self.progress(frontier)
+
+                if self.verbose:
+                    print(f"[Round {self.rounds}] expanded {self.nodes_expanded}, open {frontier}, "
+                          f"lowest f {low_f:.1f}, goal {goal[0] if goal else None}")
+
+                if goal is not None and (not self.shortest or low_f >= goal[0]):
+                    solution = self._trace(goal[1], inboxes, reports, processes)
+                    break
+                if frontier == 0 and not any(incoming):
+                    self.exhausted = self.unsolvable = goal is None
+                    break
+        finally:
+            for inbox in inboxes:
+                inbox.put(("stop",))
+            for process in processes:
+                process.join(JOIN_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+
+        if solution is None:
+            print("No solution found.")
+        else:
+            print(f"Goal found in {self.nodes_expanded} steps, {self.rounds} rounds, {workers} workers")
+            print(f"Time taken: {time.time() - start_time:.2f} seconds")
+        return solution
+
+    def _report(self, reports, processes):
+        """Waits for the next worker report, failing if a worker died"""
+        while True:
+            try:
+                return reports.get(timeout=1)
+            except queue.Empty:
+                if not all(process.is_alive() for process in processes):
+                    raise RuntimeError("an HDA* worker process died")
+
+    def _trace(self, goal, inboxes, reports, processes):
+        """Rebuilds the moves to the goal from the parent positions kept by the workers"""
+        chain = [goal]
+        state = goal
+        while True:
+            inboxes[state.key % len(inboxes)].put(("trace", state))
+            _, state = self._report(reports, processes)
+            if state is None:
+                break
+            chain.append(state)
+        chain.reverse()
+
+        moves = []
+        board = self.initial_state
+        for target in chain[1:]:
+            for move in board.get_valid_moves():
+                child = board.apply_move(move)
+                if same_position(child, target):
+                    moves.append(move)
+                    board = child
+                    break
+        return moves
@@ -0,0 +1,200 @@
+# ida_star_solver.py
+
+from solvers.solver_base import Solver
+from solvers.astar_solver import AStarSolver
+from solvers.board import MutableBoard
+from solvers.external_bfs import pack_state, record_size
+from solvers.lower_bound import moves_left_bound
+import time
+
+INFINITY = float("inf")
+
+
+class TranspositionTable:
+    """
+    Fixed-size, two-tier transposition table for IDA*.
+
+    Each bucket (chosen by key % size) holds two entries of the form
+    (key, position, g, h, iteration), position being the board packed as in
+    solvers/external_bfs.py. An entry only matches when both the key and the
+    packed position do, so two positions sharing a Zobrist key never share a
+    bound. g is the cheapest depth the position was reached
+    at during `iteration`, and h the best backed-up estimate of its remaining
+    cost. The first tier is depth-preferred: it keeps entries from the
+    current iteration over stale ones, and among current entries the
+    shallower one (larger subtree saved). Anything it refuses goes to the
+    second tier, which always replaces, so a hot position never gets locked
+    out of the table by an unlucky collision.
+
+    Like any transposition table this is a cache: a lost entry only costs
+    re-searching a subtree.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.preferred = [None] * size
+        self.recent = [None] * size
+        self.stores = 0
+        self.replacements = 0
+
+    def probe(self, key, position):
+        """Returns the entry stored for the position (with its key), or None"""
+        index = key % self.size
+        entry = self.preferred[index]
+        if entry is not None and entry[0] == key and entry[1] == position:
+            return entry
+        entry = self.recent[index]
+        if entry is not None and entry[0] == key and entry[1] == position:
+            return entry
+        return None
+
+    def store(self, key, position, g, h, iteration):
+        index = key % self.size
+        self.stores += 1
+        entry = self.preferred[index]
+        same = entry is not None and entry[0] == key and entry[1] == position
+        if entry is None or same or entry[4] != iteration or entry[2] >= g:
+            if entry is not None and not same:
+                self.replacements += 1
+            self.preferred[index] = (key, position, g, h, iteration)
+            # Drop a stale copy so probe() can't return an outdated entry
+            entry = self.recent[index]
+            if entry is not None and entry[0] == key and entry[1] == position:
+                self.recent[index] = None
+            return
+        self.recent[index] = (key, position, g, h, iteration)
+
+
+class IDAStarSolver(Solver):
+    """
+    Iterative-deepening A*: repeated depth-first searches bounded by f = g + h,
+    raising the bound to the smallest f that exceeded it after each pass.
+    The search walks a single MutableBoard, so memory is the current path
+    plus the fixed-size transposition table, whatever the deal.
+
+    With admissible=True the bound is moves_left_bound() (see
+    solvers/lower_bound.py), so the first solution found is a shortest one.
+    """
+
+    # Same scoring as AStarSolver so the two searches are comparable
+    default_heuristic = AStarSolver.default_heuristic
+
+    def __init__(self, initial_state, table_size=1 << 20, verbose=False, admissible=False, **kwargs):
+        super().__init__(initial_state, **kwargs)
+        self.heuristic = self.default_heuristic
+        self.table = TranspositionTable(table_size)
+        self.verbose = verbose
+        self.iteration = 0
+        self.size = record_size(len(self.initial_state.tableau))
+        self.admissible = admissible
+        if admissible:
+            self.heuristic = moves_left_bound
+            self.shortest = True
+
+    def _search(self):
+        start_time = time.time()
+        board = MutableBoard(self.initial_state)
+        bound = self.heuristic(board)
+        path = []
+        position = pack_state(board, self.size)
+
+        while True:
+            self.iteration += 1
+            if self.verbose:
+                print(f"Iteration {self.iteration} | bound: {bound:.2f} | expanded: {self.nodes_expanded}")
+
+            self.table.store(board.key, position, 0, bound, self.iteration)
+            result = yield from self.bounded_search(board, 0, bound, path, position=position)
+
+            if result is None:
+                end_time = time.time()
+                print(f"Goal found in {self.nodes_expanded} steps, {self.iteration} iterations")
+                print(f"Time taken: {end_time - start_time:.2f} seconds")
+                return path
+
+            if result == INFINITY:
+                print("No solution found.")
+                return None
+
+            bound = result
+
+    def bounded_search(self, board, g, bound, path, parent_key=None, position=None):
+        """
+        Bounded depth-first search below the current board. A generator, like
+        _search(): it yields progress snapshots and returns its result.
+        parent_key is the Zobrist key of the position before path[-1], and
+        position the current board packed for the table (packed if None).
+
+        Returns:
+            None if a goal was reached (path then holds the solution), otherwise
+            the smallest f value that exceeded the bound (INFINITY if none).
+        """
+        if self.tick(board, path):
+            yield self.progress(len(path))
+
+        if board.is_goal_state():
+            return None
+
+        if position is None:
+            position = pack_state(board, self.size)
+        h = self.heuristic(board)
+        entry = self.table.probe(board.key, position)
+        if entry is not None and entry[3] > h:
+            h = entry[3]
+
+        f = g + h
+        if f > bound:
+            return f
+
+        # Checked only once the bound lets the node through; the INFINITY
+        # stored in the table keeps later iterations from retrying it
+        if self.dead(board):
+            self.table.store(board.key, position, g, INFINITY, self.iteration)
+            return INFINITY
+
+        moves = self.legal_moves(board, path[-1] if path else None, parent_key)
+
+        # Likewise for a position with no move at all. This is the only other
+        # INFINITY stored: one caused by pruned or skipped moves depends on
+        # the path and the table contents, not on the position alone
+        if not moves and not board.get_valid_moves():
+            self.table.store(board.key, position, g, INFINITY, self.iteration)
+            return INFINITY
+
+        # Try the most promising children first so goals show up early in a pass
+        scored = []
+        for move in moves:
+            record = board.do_move(move)
+            scored.append((self.heuristic(board), len(scored), move))
+            board.undo_move(record)
+        scored.sort()
+
+        minimum = INFINITY
+        for _, _, move in scored:
+            record = board.do_move(move)
+            child_key = board.key
+            child_position = pack_state(board, self.size)
+
+            # Skip positions already reached this iteration at a lower or equal depth
+            entry = self.table.probe(child_key, child_position)
+            if entry is not None and entry[4] == self.iteration and entry[2] <= g + 1:
+                board.undo_move(record)
+                continue
+
+            self.table.store(child_key, child_position, g + 1, entry[3] if entry is not None else 0, self.iteration)
+            path.append(move)
+            result = yield from self.bounded_search(board, g + 1, bound, path, record[0], child_position)
+            if result is None:
+                return None
+            path.pop()
+            board.undo_move(record)
+
+            # Back up the subtree's estimate for later iterations. An INFINITY
+            # is either stored by the child itself (proven) or not a bound at
+            # all: every move below was pruned or already reached this iteration
+            if result < INFINITY:
+                self.table.store(child_key, child_position, g + 1, result - (g + 1), self.iteration)
+            if result < minimum:
+                minimum = result
+
+        return minimum
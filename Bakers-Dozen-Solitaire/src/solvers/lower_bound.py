@@ -0,0 +1,57 @@
+# lower_bound.py
+
+"""
+Admissible heuristic: a lower bound on the number of moves left.
+
+A card lying above a card of lower value must be played at least once
+more. It can't be promoted for free while that card is in play: automatic
+promotion takes a top card only when its value equals the lowest
+foundation height, and the card beneath keeps that height at or below its
+own, lower value. So it either moves to another column or is sent home
+by hand, one move each, and counting these cards never overestimates.
+
+This stands in for a pattern database, with nothing built offline or
+memory-mapped. A database over single columns would store, for each
+column, the fewest moves clearing it when every other column is relaxed
+into an unlimited free cell. Under that relaxation the only move is
+lifting the top card, which is needed exactly when a lower card lies
+beneath it, so the stored value is this count (tests/test_lower_bound.py
+checks that exhaustively on short columns). The count is computed instead
+and cached per column contents. A tighter bound needs patterns spanning
+several columns.
+
+One move changes the count by at most one (the card moved may stop or
+start counting; promoted cards never count), so the heuristic is also
+consistent.
+"""
+
+from functools import lru_cache
+
+from solvers.board import NUM_RANKS
+
+
+@lru_cache(maxsize=1 << 16)
+def _column_bound(column):
+    """Counts the cards of a column (a tuple) lying above a card of lower value."""
+    count = 0
+    lowest = NUM_RANKS  # lowest value beneath
+    for card in column:
+        value = card % NUM_RANKS
+        if value > lowest:
+            count += 1
+        elif value < lowest:
+            lowest = value
+    return count
+
+
+def moves_left_bound(state):
+    """
+    Lower bound on the moves needed to win from a position.
+
+    Args:
+        state (Board or MutableBoard): The position.
+
+    Returns:
+        int: A number of moves no solution can beat.
+    """
+    return sum(_column_bound(tuple(column)) for column in state.tableau)
@@ -0,0 +1,261 @@
+# monte_carlo.py
+
+"""
+Nested Monte Carlo search (NMCS).
+
+Instead of a heuristic, positions are judged by playing them out: a level 0
+search is one random playout, and a level n search plays a game move by
+move, trying every move with a level n - 1 search and following the best
+sequence found so far (not just the best last result). Sequences are scored
+by the cards they get home, then by their length, so the search keeps
+pushing towards the win and, among wins, towards short ones.
+
+Playouts walk one MutableBoard, so they cost a few microseconds per move,
+and moves go through prune_moves() with every rule, so safe foundation
+moves are always played and a playout never undoes its last move. (With
+all three rules, level 1 solves each of deals 0-29, mostly in fewer
+evaluations than with the reversal rule alone.) At the top level the
+candidate moves are evaluated in parallel worker processes.
+
+Every position a search moves from counts as an expansion, at any level and
+in playouts alike, so node budgets and progress reports track the real work
+rather than the handful of top-level evaluations.
+"""
+
+import multiprocessing
+import random
+import time
+
+from solvers.solver_base import Solver
+from solvers.board import MutableBoard, NUM_CARDS
+from solvers.move_pruning import prune_moves, ALL_RULES
+
+# Level 1 (a playout per candidate move) already solves most deals in
+# seconds; level 2 finds much shorter solutions at about 100x the cost
+DEFAULT_LEVEL = 1
+
+# Longest sequence a search plays; a random walk that long is going in circles
+DEFAULT_MAX_MOVES = 200
+
+
+def playout(board, rng, max_moves, last=None, parent_key=None, rules=ALL_RULES, tick=None):
+    """
+    Plays random moves until the game is won or stuck.
+
+    Args:
+        board (Board): Position to start from (left untouched).
+        rng (random.Random): Source of the random moves.
+        max_moves (int): Longest playout.
+        last (tuple, optional): The move that led to the board.
+        parent_key (int, optional): Zobrist key of the position before it.
+        rules (set): Move pruning rules, see solvers/move_pruning.py.
+        tick (callable, optional): Called once per position moved from.
+
+    Returns:
+        tuple: (score, moves) where score is (cards home, -len(moves)).
+    """
+    walker = MutableBoard(board)
+    moves = []
+    while len(moves) < max_moves and not walker.is_goal_state():
+        if tick is not None:
+            tick()
+        legal = prune_moves(walker, walker.get_valid_moves(), last, parent_key, rules)
+        if not legal:
+            break
+        last = legal[0] if len(legal) == 1 else rng.choice(legal)
+        parent_key = walker.do_move(last)[0]
+        moves.append(last)
+    return (walker.foundation_count(), -len(moves)), moves
+
+
+def nested_search(board, level, rng, max_moves, last=None, parent_key=None, rules=ALL_RULES, tick=None):
+    """
+    Level `level` nested Monte Carlo search.
+
+    Args:
+        board (Board): Position to start from.
+        level (int): Nesting level, 0 for a single playout.
+        rng (random.Random): Source of the random moves.
+        max_moves (int): Longest sequence.
+        last (tuple, optional): The move that led to the board.
+        parent_key (int, optional): Zobrist key of the position before it.
+        rules (set): Move pruning rules, see solvers/move_pruning.py.
+        tick (callable, optional): Called once per position moved from, nested searches included.
+
+    Returns:
+        tuple: (score, moves), as for playout().
+    """
+    if level <= 0:
+        return playout(board, rng, max_moves, last, parent_key, rules, tick)
+
+    best_score = None
+    best_moves = []
+    played = []
+    while len(played) < max_moves and not board.is_goal_state():
+        if tick is not None:
+            tick()
+        legal = prune_moves(board, board.get_valid_moves(), last, parent_key, rules)
+        if not legal:
+            break
+        for move in legal:
+            score, moves = nested_search(board.apply_move(move), level - 1, rng, max_moves - len(played) - 1,
+                                         move, board.key, rules, tick)
+            # Scores below count moves from the child: make them count from the start
+            score = (score[0], score[1] - len(played) - 1)
+            if best_score is None or score > best_score:
+                best_score = score
+                best_moves = played + [move] + moves
+
+        # Follow the best sequence known, which always extends the moves played
+        if len(best_moves) == len(played):
+            break
+        last = best_moves[len(played)]
+        parent_key = board.key
+        board = board.apply_move(last)
+        played.append(last)
+
+    if best_score is None:
+        return (board.foundation_count(), -len(played)), played
+    return best_score, best_moves
+
+
+def evaluate_move(task, tick=None):
+    """
+    Worker entry point: scores a top-level candidate move.
+
+    Args:
+        task (tuple): (child board, level, seed, max_moves, move, parent key, pruning rules).
+        tick (callable, optional): Called once per position moved from (in process only).
+
+    Returns:
+        tuple: (score, moves, expansions): score and moves from the child, see
+               nested_search(), and the number of positions moved from.
+    """
+    child, level, seed, max_moves, move, parent_key, rules = task
+    expansions = 0
+
+    def count():
+        nonlocal expansions
+        expansions += 1
+        if tick is not None:
+            tick()
+
+    score, moves = nested_search(child, level, random.Random(seed), max_moves, move, parent_key, rules, count)
+    return score, moves, expansions
+
+
+class NestedMonteCarloSolver(Solver):
+    """
+    Nested Monte Carlo search, restarted with fresh random seeds until a
+    win is found or `iterations` runs are over.
+
+    The best sequence found so far (most cards home, then fewest moves) is
+    kept in best_line for progress reports, even when no run wins.
+    nodes_expanded counts the positions moved from at every level. Run in
+    process, the progress callback (and so any budget) is checked inside the
+    nested searches; with worker processes, after each evaluation comes back.
+    """
+
+    # Playouts use every rule (see the module docstring)
+    pruning_rules = ALL_RULES
+
+    def __init__(self, initial_state, level=DEFAULT_LEVEL, iterations=10, max_moves=DEFAULT_MAX_MOVES, workers=1,
+                 seed=None, verbose=False, **kwargs):
+        """
+        Args:
+            level (int): Nesting level of the top-level search (1 or more).
+            iterations (int, optional): Runs before giving up (None runs until solved).
+            max_moves (int): Longest sequence played.
+            workers (int): Processes evaluating the top-level moves (1 evaluates in process).
+            seed (int, optional): Seed of the search, for reproducible runs.
+        """
+        super().__init__(initial_state, **kwargs)
+        self.level = max(1, level)
+        self.iterations = iterations
+        self.max_moves = max_moves
+        self.workers = max(1, workers)
+        self.rng = random.Random(seed)
+        self.verbose = verbose
+        self.best_score = None
+
+    def _search(self):
+        start_time = time.time()
+        if self.initial_state.is_goal_state():
+            return []
+        pool = multiprocessing.Pool(self.workers) if self.workers > 1 else None
+        solution = None
+        try:
+            iteration = 0
+            while self.iterations is None or iteration < self.iterations:
+                iteration += 1
+                yield from self._run(pool)
+                if self.verbose:
+                    print(f"Run {iteration}: best {self.best_foundations} cards in {len(self.best_line)} moves")
+                if self.best_foundations == NUM_CARDS:
+                    solution = list(self.best_line)
+                    break
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+        if solution is None:
+            print("No solution found.")
+        else:
+            print(f"Goal found in {self.nodes_expanded} steps, {len(solution)} moves")
+            print(f"Time taken: {time.time() - start_time:.2f} seconds")
+        return solution
+
+    def _run(self, pool):
+        """One top-level search, the level - 1 evaluations spread over the pool"""
+        board = self.initial_state
+        last = parent_key = None
+        played = []
+        best_moves = []
+        run_best = None
+        while len(played) < self.max_moves and not board.is_goal_state():
+            if self.tick():
+                yield self.progress(len(played))
+            tasks = []
+            for move in self.legal_moves(board, last, parent_key):
+                child = board.apply_move(move)
+                if not self.dead(child):
+                    tasks.append((child, self.level - 1, self.rng.getrandbits(64), self.max_moves - len(played) - 1,
+                                  move, board.key, self.move_rules()))
+            if not tasks:
+                break
+
+            if pool is not None:
+                results = pool.imap(evaluate_move, tasks)
+            else:
+                results = (evaluate_move(task, self.tick) for task in tasks)
+            reports = self.nodes_expanded // self.progress_interval
+            for task, (score, moves, expansions) in zip(tasks, results):
+                if pool is not None:
+                    self.nodes_expanded += expansions
+                    # Worker expansions arrive in bulk: report once per interval crossed
+                    if self.nodes_expanded // self.progress_interval > reports \
+                            and self.progress_callback is not None:
+                        self.progress_callback(self)
+                if self.nodes_expanded // self.progress_interval > reports:
+                    reports = self.nodes_expanded // self.progress_interval
+                    yield self.progress(len(played))
+                score = (score[0], score[1] - len(played) - 1)
+                if run_best is None or score > run_best:
+                    run_best = score
+                    best_moves = played + [task[4]] + moves
+                    self.keep_best(score, best_moves)
+
+            if len(best_moves) == len(played):
+                break
+            last = best_moves[len(played)]
+            parent_key = board.key
+            board = board.apply_move(last)
+            played.append(last)
+
+    def keep_best(self, score, moves):
+        """Records a sequence if it beats every one found so far"""
+        if self.best_score is None or score > self.best_score:
+            self.best_score = score
+            self.best_foundations = score[0]
+            self.best_line = list(moves)
@@ -0,0 +1,149 @@
+# move_pruning.py
+
+"""
+Move pruning and move ordering, applied to the legal moves of a position
+before any child is built.
+
+Dominance rules used by prune_moves():
+
+    Safe foundation moves are forced. A column top whose value is at most
+    one above the lowest foundation can go home, and every card that could
+    ever be placed on it is either home already or is the next card of its
+    own foundation, which it can reach directly. Keeping it in play is
+    never better, so when such a move exists it is the only child. It can
+    cost a move, though: the card might have been promoted for free later.
+
+    Reversing moves are dropped. Right after ("tableau", a, b), moving the
+    card from b back to a gives back the parent, unless the move exposed a
+    card that was promoted (dealt columns aren't ordered). The move is
+    dropped only when the Zobrist key it would produce, worked out from the
+    two columns, is the parent's key.
+
+    One target per source column. All the targets of a column top show the
+    same value, one above it; the children differ only by which of those
+    cards gets covered. Only the target whose card is furthest from its
+    foundation (the one missed least while covered) is kept. The rule is
+    skipped for a card that already lies on a card one rank higher, so from
+    the kept child the card can always move on to any other target, and
+    that move gives exactly the dropped child: the card uncovered can't be
+    promoted (the moved card, one rank lower, is still in play, so the
+    lowest foundation is below it) and nothing else changes. Every dropped
+    child is therefore one kept move further away, never out of reach.
+
+The first and last rules keep the search complete but can lengthen a
+solution, and all but the reversal rule change which children a heuristic
+gets to rank. A best-first search can expand far more nodes with them (on
+deal 1, GreedySolver needs 12,271 expansions with the reversal rule alone
+and more than 100,000 with all three). So each solver picks its rules
+(Solver.pruning_rules), and those that promise shortest solutions only
+drop reversing moves.
+
+order_moves() sorts moves so that a depth-first search tries the likely
+good ones first.
+"""
+
+from solvers.board import NUM_CARDS, NUM_RANKS, _z_tableau
+
+# Dominance rules, see the module docstring
+REVERSAL = "reversal"
+FORCED_FOUNDATION = "forced_foundation"
+ONE_TARGET = "one_target"
+
+ALL_RULES = frozenset((REVERSAL, FORCED_FOUNDATION, ONE_TARGET))
+
+# Rules that never drop a move of a shortest solution
+SHORTEST_RULES = frozenset((REVERSAL,))
+
+
+def prune_moves(board, moves, last=None, parent_key=None, rules=ALL_RULES):
+    """
+    Drops dominated moves.
+
+    Args:
+        board (Board or MutableBoard): The position.
+        moves (list): Its legal moves, as from get_valid_moves().
+        last (tuple, optional): The move that led to the position.
+        parent_key (int, optional): Zobrist key of the position before it.
+        rules (set): Rules to apply, among ALL_RULES.
+
+    Returns:
+        list: The moves worth trying, in their original order.
+    """
+    tableau = board.tableau
+    foundations = board.foundations
+
+    if FORCED_FOUNDATION in rules:
+        safe = min(foundations) + 1
+        for move in moves:
+            if move[0] == "foundation" and tableau[move[1]][-1] % NUM_RANKS <= safe:
+                return [move]
+
+    reverse = None
+    if REVERSAL in rules and last is not None and last[0] == "tableau" and parent_key is not None:
+        reverse = ("tableau", last[2], last[1])
+        if reverse not in moves or _key_after(board, last[2], last[1]) != parent_key:
+            reverse = None
+    one_target = ONE_TARGET in rules
+    pruned = []
+    kept = {}  # source column -> position of its tableau move in pruned
+    for move in moves:
+        if move == reverse:
+            continue
+        if one_target and move[0] == "tableau" and not _on_target(tableau[move[1]]):
+            position = kept.get(move[1])
+            if position is not None:
+                if _slack(tableau, foundations, move[2]) > _slack(tableau, foundations, pruned[position][2]):
+                    pruned[position] = move
+                continue
+            kept[move[1]] = len(pruned)
+        pruned.append(move)
+    return pruned
+
+
+def _key_after(board, from_col, to_col):
+    """Zobrist key after moving the top of from_col onto to_col, if nothing gets promoted"""
+    source = board.tableau[from_col]
+    target = board.tableau[to_col]
+    card = source[-1]
+    return (board.key ^ _z_tableau(card, source[-2] if len(source) > 1 else NUM_CARDS)
+            ^ _z_tableau(card, target[-1] if target else NUM_CARDS))
+
+
+def _on_target(column):
+    """Checks whether the top card of a column lies on a card one rank higher"""
+    return len(column) > 1 and column[-2] % NUM_RANKS == column[-1] % NUM_RANKS + 1
+
+
+def _slack(tableau, foundations, col):
+    """How far the top card of a column is from being next on its foundation"""
+    card = tableau[col][-1]
+    return card % NUM_RANKS - foundations[card // NUM_RANKS]
+
+
+def order_moves(board, moves):
+    """
+    Sorts moves best first for depth-first searches: foundation moves, then
+    moves uncovering a card that can go home next, then moves out of the
+    shortest columns (closest to being cleared). Ties keep their order.
+
+    Args:
+        board (Board or MutableBoard): The position.
+        moves (list): Moves to sort.
+
+    Returns:
+        list: The sorted moves.
+    """
+    tableau = board.tableau
+    foundations = board.foundations
+
+    def rank(move):
+        if move[0] == "foundation":
+            return 0, 0
+        column = tableau[move[1]]
+        if len(column) > 1:
+            under = column[-2]
+            if under % NUM_RANKS == foundations[under // NUM_RANKS]:
+                return 1, len(column)
+        return 2, len(column)
+
+    return sorted(moves, key=rank)
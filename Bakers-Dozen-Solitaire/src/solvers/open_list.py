@@ -0,0 +1,92 @@
+# open_list.py
+
+"""
+Bucket-queue open list for best-first searches.
+
+The A* and Greedy heuristics are integers plus a multiple of 1.5, so every
+priority falls on a 0.5 grid. Instead of a binary heap of (f, node) pairs
+(which falls back to comparing SearchNodes on every tie), nodes go into a
+bucket per grid step. Pushing and popping are deque operations; the small
+heap of bucket keys is only touched when a bucket is created or emptied,
+and there are a few hundred distinct priorities against millions of nodes.
+
+Ties inside a priority are broken by tie_break:
+    "shallow"  smallest depth first (what the heapq version did)
+    "deep"     largest depth first, which dives towards a goal sooner
+    "fifo"     oldest node first
+    "lifo"     newest node first
+"""
+
+from collections import deque
+from heapq import heappush, heappop
+
+TIE_BREAKS = ("shallow", "deep", "fifo", "lifo")
+
+# Grid step of the default heuristics (multiples of 0.5 around 1000)
+DEFAULT_QUANTUM = 0.5
+
+
+class BucketQueue:
+    """
+    Min-priority queue of search nodes over quantized priorities.
+
+    Priorities are rounded to the nearest multiple of quantum, so with the
+    default heuristics (and integer or half-integer A* weights) no two
+    different priorities share a bucket.
+    """
+
+    def __init__(self, quantum=DEFAULT_QUANTUM, tie_break="shallow"):
+        """
+        Initializes an empty open list.
+
+        Args:
+            quantum (float): Grid step of the priorities.
+            tie_break (str): One of TIE_BREAKS.
+        """
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"tie_break must be one of {TIE_BREAKS}, got {tie_break!r}")
+        self.quantum = quantum
+        self.tie_break = tie_break
+        self._buckets = {}  # bucket key -> deque of nodes
+        self._keys = []     # heap of the keys of non-empty buckets
+        self._size = 0
+
+    def push(self, priority, node):
+        """
+        Adds a node.
+
+        Args:
+            priority (float): Its priority, lower pops first.
+            node (SearchNode): The node (its depth is used by the depth tie-breaks).
+        """
+        key = round(priority / self.quantum)
+        if self.tie_break == "shallow":
+            key = (key, node.depth)
+        elif self.tie_break == "deep":
+            key = (key, -node.depth)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = deque()
+            heappush(self._keys, key)
+        bucket.append(node)
+        self._size += 1
+
+    def pop(self):
+        """
+        Removes and returns a node of the lowest priority.
+
+        Returns:
+            SearchNode: The node.
+        """
+        key = self._keys[0]
+        bucket = self._buckets[key]
+        node = bucket.pop() if self.tie_break == "lifo" else bucket.popleft()
+        if not bucket:
+            heappop(self._keys)
+            del self._buckets[key]
+        self._size -= 1
+        return node
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,355 @@
+# parallel_dfs.py
+
+"""
+Depth-first search spread over worker processes with work stealing.
+
+The coordinator (the solver, in the main process) expands the top of the
+move tree breadth-first until there are a few subtrees per worker, and puts
+the move sequence leading to each of them on a shared task queue. A worker
+takes a task, replays its moves on a MutableBoard and searches the subtree
+depth-first, the way DFSSolver does.
+
+Subtrees differ wildly in size, so the initial split alone leaves workers
+idle. An idle worker raises a shared `hungry` count; busy workers check it
+every CHECK_INTERVAL expansions and, when it is set, give away half the
+untried moves of the shallowest level of their stack (the largest subtrees
+they hold) as new tasks. A shared count of outstanding tasks (queued or
+running) tells the workers when the whole tree is done.
+
+The first worker to reach the goal sets a shared event: every other worker
+stops within CHECK_INTERVAL expansions, and the coordinator stops waiting.
+
+Each worker keeps its own visited set. With shared_filter=True, the workers
+also share a direct-mapped table in shared memory. The slot is chosen by
+Zobrist key, and holds the whole last position written there, packed as in
+solvers/external_bfs.py (sorted columns, so column order is ignored). A hit
+is a byte comparison of the full position, so the filter forgets positions
+but never mistakes one for another sharing its slot or key. Slots are read
+and written under one of LOCK_STRIPES locks, so a half-written slot is
+never compared.
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+
+from solvers.solver_base import Solver, VisitedSet
+from solvers.board import MutableBoard
+from solvers.deadlock import is_dead
+from solvers.external_bfs import pack_state, record_size
+from solvers.dfs_solver import DFSSolver
+from solvers.move_pruning import prune_moves, order_moves
+
+# Subtrees per worker in the initial split
+TASKS_PER_WORKER = 8
+
+# Expansions between two checks of the stop event and of idle workers
+CHECK_INTERVAL = 256
+
+# Slots of the shared dedup filter (one packed position, 68 bytes, each)
+DEFAULT_FILTER_SIZE = 1 << 18
+
+# Locks guarding the shared filter's slots, slot number modulo this
+LOCK_STRIPES = 64
+
+# Seconds an idle worker waits on the task queue between two checks
+POLL_INTERVAL = 0.05
+
+# Seconds to wait for a worker to exit before killing it
+JOIN_TIMEOUT = 5
+
+
+class _Worker:
+    """State of one parallel DFS worker process"""
+
+    def __init__(self, shared, settings):
+        self.tasks, self.reports, self.found, self.outstanding, self.hungry, table, self.locks = shared
+        (self.initial_state, self.max_depth, self.rules, self.prune_dead,
+         self.progress_interval) = settings
+        self.visited = VisitedSet()
+        self.record_size = record_size(len(self.initial_state.tableau))
+        self.table = memoryview(table).cast("B") if table is not None else None
+        self.slots = len(self.table) // self.record_size if table is not None else 0
+        self.count = 0      # expansions so far
+        self.expanded = 0   # expansions not reported yet
+        self.best = -1
+        self.best_line = []
+
+    def run(self):
+        """Takes tasks until the tree is done or a solution is found"""
+        waiting = False
+        while not self.found.is_set():
+            try:
+                prefix = self.tasks.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if not waiting:
+                    waiting = True
+                    self._add(self.hungry, 1)
+                if self.outstanding.value == 0:
+                    break
+                continue
+            if waiting:
+                waiting = False
+                self._add(self.hungry, -1)
+
+            solution = self.search(prefix)
+            if solution is not None:
+                self.found.set()
+                self.report()
+                self.reports.put(("solution", solution))
+                return
+            self._add(self.outstanding, -1)
+
+        self.report()
+        self.reports.put(("exit",))
+
+    def search(self, prefix):
+        """Searches the subtree reached by the prefix moves; returns the moves to the goal or None"""
+        board = MutableBoard(self.initial_state)
+        records = [board.do_move(move) for move in prefix]
+        if (self.prune_dead and is_dead(board)) or not self.claim(board):
+            return None
+
+        root_depth = len(prefix)
+        path = list(prefix)
+        pending = []  # untried moves of each depth, next one last
+        expand = True
+        while True:
+            if expand:
+                self.count += 1
+                self.expanded += 1
+                if self.count % CHECK_INTERVAL == 0:
+                    if self.found.is_set():
+                        return None
+                    if self.hungry.value > 0:
+                        self.donate(path, pending, root_depth)
+                if self.count % self.progress_interval == 0:
+                    self.report()
+
+                foundations = board.foundation_count()
+                if foundations > self.best:
+                    self.best = foundations
+                    self.best_line = list(path)
+                if board.is_goal_state():
+                    return path
+
+                moves = []
+                if len(path) < self.max_depth:
+                    moves = board.get_valid_moves()
+                    if self.rules:
+                        moves = prune_moves(board, moves, path[-1] if path else None,
+                                            records[-1][0] if records else None, self.rules)
+                    moves = order_moves(board, moves)
+                    moves.reverse()
+                pending.append(moves)
+
+            expand = False
+            untried = pending[-1]
+            while untried:
+                move = untried.pop()
+                record = board.do_move(move)
+                if not (self.prune_dead and is_dead(board)) and self.claim(board):
+                    path.append(move)
+                    records.append(record)
+                    expand = True
+                    break
+                board.undo_move(record)
+
+            if not expand:
+                pending.pop()
+                if not pending:
+                    return None
+                path.pop()
+                board.undo_move(records.pop())
+
+    def claim(self, state):
+        """
+        Marks a position (a MutableBoard, compared in place and only copied
+        when new) as visited; False if it was already (here or, with the
+        filter, anywhere).
+        """
+        if state in self.visited:
+            return False
+        self.visited.add(state.snapshot())
+        if self.table is not None:
+            slot = state.key % self.slots
+            start = slot * self.record_size
+            end = start + self.record_size
+            record = pack_state(state, self.record_size)
+            with self.locks[slot % LOCK_STRIPES]:
+                if self.table[start:end] == record:
+                    return False
+                self.table[start:end] = record
+        return True
+
+    def donate(self, path, pending, root_depth):
+        """Gives half the untried moves of the shallowest level that has some to idle workers"""
+        for level, untried in enumerate(pending):
+            if untried:
+                count = (len(untried) + 1) // 2
+                given = untried[:count]  # the moves this worker would have tried last
+                del untried[:count]
+                # Counted before being queued, so the outstanding count never drops to 0 early
+                self._add(self.outstanding, count)
+                base = path[:root_depth + level]
+                for move in given:
+                    self.tasks.put(base + [move])
+                return
+
+    def report(self):
+        """Sends the expansions made since the last report to the coordinator"""
+        if self.expanded:
+            self.reports.put(("stats", self.expanded, self.best, self.best_line))
+            self.expanded = 0
+
+    @staticmethod
+    def _add(counter, amount):
+        with counter.get_lock():
+            counter.value += amount
+
+
+def _dfs_worker(shared, settings):
+    """Process entry point of a parallel DFS worker"""
+    _Worker(shared, settings).run()
+
+
+class ParallelDFSSolver(Solver):
+    """
+    Depth-first search over worker processes (see the module docstring).
+
+    The first solution found wins, so, as with DFSSolver, it is usually far
+    from the shortest. After the search, `tasks` holds the number of
+    subtrees of the initial split.
+    """
+
+    # Same move pruning as DFSSolver
+    pruning_rules = DFSSolver.pruning_rules
+
+    def __init__(self, initial_state, max_depth=100, workers=None, split_depth=3, shared_filter=False,
+                 filter_size=DEFAULT_FILTER_SIZE, verbose=False, **kwargs):
+        """
+        Args:
+            max_depth (int): Longest line searched, as for DFSSolver.
+            workers (int, optional): Worker processes (one per CPU if None).
+            split_depth (int): Deepest level the initial split expands.
+            shared_filter (bool): Share a dedup filter between the workers.
+            filter_size (int): Slots of the shared filter.
+        """
+        super().__init__(initial_state, **kwargs)
+        self.max_depth = max_depth
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.split_depth = max(0, split_depth)
+        self.shared_filter = shared_filter
+        self.filter_size = max(1, filter_size)
+        self.verbose = verbose
+        self.tasks = 0
+
+    def _search(self):
+        start_time = time.time()
+        solution, prefixes = self._split()
+        self.tasks = len(prefixes)
+        if solution is None and prefixes:
+            solution = yield from self._run(prefixes)
+
+        if solution is None:
+            print("No solution found within depth limit.")
+        else:
+            print(f"Goal reached in {self.nodes_expanded} steps, {self.tasks} tasks, {self.workers} workers")
+            print(f"Time taken: {time.time() - start_time:.2f} seconds")
+        return solution
+
+    def _split(self):
+        """
+        Expands the top of the tree breadth-first.
+
+        Returns:
+            tuple: (solution or None, move sequences leading to the subtrees left to search).
+        """
+        self.visited.add(self.initial_state)
+        if self.initial_state.is_goal_state():
+            return [], []
+
+        level = [([], self.initial_state, None, None)]  # (moves, state, last move, parent key)
+        for _ in range(min(self.split_depth, self.max_depth)):
+            if len(level) >= self.workers * TASKS_PER_WORKER:
+                break
+            next_level = []
+            for moves, state, last, parent_key in level:
+                self.tick(state, moves)
+                for move in order_moves(state, self.legal_moves(state, last, parent_key)):
+                    child = state.apply_move(move)
+                    if child in self.visited or self.dead(child):
+                        continue
+                    self.visited.add(child)
+                    line = moves + [move]
+                    if child.is_goal_state():
+                        return line, []
+                    next_level.append((line, child, move, state.key))
+            level = next_level
+
+        if self.verbose:
+            print(f"Split into {len(level)} tasks")
+        return None, [moves for moves, _, _, _ in level]
+
+    def _run(self, prefixes):
+        """Searches the subtrees in the worker processes; returns the solution or None"""
+        tasks = multiprocessing.Queue()
+        reports = multiprocessing.Queue()
+        found = multiprocessing.Event()
+        outstanding = multiprocessing.Value("i", len(prefixes))
+        hungry = multiprocessing.Value("i", 0)
+        table = None
+        locks = None
+        if self.shared_filter:
+            table = multiprocessing.RawArray("B", self.filter_size * record_size(len(self.initial_state.tableau)))
+            locks = [multiprocessing.Lock() for _ in range(LOCK_STRIPES)]
+        for prefix in prefixes:
+            tasks.put(prefix)
+
+        shared = (tasks, reports, found, outstanding, hungry, table, locks)
+        settings = (self.initial_state, self.max_depth, self.move_rules(), self.prune_dead, self.progress_interval)
+        processes = [multiprocessing.Process(target=_dfs_worker, args=(shared, settings), daemon=True)
+                     for _ in range(self.workers)]
+        for process in processes:
+            process.start()
+
+        solution = None
+        try:
+            running = len(processes)
+            while running:
+                message = self._report(reports, processes)
+                kind = message[0]
+                if kind == "stats":
+                    _, expanded, best, line = message
+                    self.nodes_expanded += expanded
+                    if best > self.best_foundations:
+                        self.best_foundations = best
+                        self.best_line = line
+                    # A GUI caller keeps its window alive through the callback
+                    if self.progress_callback is not None:
+                        self.progress_callback(self)
+                    yield self.progress(outstanding.value)
+                elif kind == "solution":
+                    solution = message[1]
+                    break
+                else:
+                    running -= 1
+        finally:
+            found.set()
+            # Tasks left queued must not keep this process from exiting
+            tasks.cancel_join_thread()
+            for process in processes:
+                process.join(JOIN_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+        return solution
+
+    def _report(self, reports, processes):
+        """Waits for the next worker message, failing if a worker crashed"""
+        while True:
+            try:
+                return reports.get(timeout=1)
+            except queue.Empty:
+                if any(process.exitcode not in (None, 0) for process in processes):
+                    raise RuntimeError("a parallel DFS worker process died")
@@ -0,0 +1,158 @@
+# portfolio.py
+
+"""
+Portfolio runner: races several solvers on the same deal, one process each.
+
+Solver run time varies wildly from deal to deal, and no single algorithm is
+fastest on all of them. Running a portfolio across cores and keeping the
+first solution cuts the tail latency to that of the best solver for the
+deal. As soon as one worker reports a solution the others are terminated.
+"""
+
+import contextlib
+import multiprocessing
+import os
+import queue
+import time
+
+from solvers.solver_base import Solver, SearchStopped
+from solvers.dfs_solver import DFSSolver
+from solvers.greedy_solver import GreedySolver
+from solvers.astar_solver import AStarSolver
+from solvers.astar_2_solver import a_star, get_solutions
+
+# Seconds between two checks of the result queue while the workers run
+POLL_INTERVAL = 0.05
+
+
+def run_astar_2(initial_state):
+    """Adapts astar_2_solver.a_star() to the portfolio: returns a move list or None"""
+    node = a_star(initial_state)
+    return get_solutions(node) if node.state.is_goal_state() else None
+
+
+# (name, solver, kwargs). solver is either a Solver subclass or a plain
+# function taking the initial state and returning a list of moves.
+DEFAULT_PORTFOLIO = [
+    ("DFS", DFSSolver, {}),
+    ("Greedy", GreedySolver, {"verbose": False}),
+    ("A*", AStarSolver, {"verbose": False}),
+    ("A* (w=2)", AStarSolver, {"verbose": False, "weight": 2.0}),
+    ("A* (w=5)", AStarSolver, {"verbose": False, "weight": 5.0}),
+    ("A* 2", run_astar_2, {}),
+]
+
+
+def _portfolio_worker(name, solver, kwargs, initial_state, results):
+    """
+    Process entry point: runs one solver and reports (name, moves, nodes,
+    seconds, error). error is None unless the solver crashed, in which case
+    it holds the exception type and message; a search stopped by its
+    progress callback (SearchStopped) is only reported as unsolved.
+    """
+    start_time = time.time()
+    nodes_expanded = None
+    error = None
+
+    # The solvers report progress on stdout; with several of them racing the
+    # output would only interleave, so workers run silently.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            if isinstance(solver, type) and issubclass(solver, Solver):
+                instance = solver(initial_state, **kwargs)
+                moves = instance.solve()
+                nodes_expanded = instance.nodes_expanded
+            else:
+                moves = solver(initial_state, **kwargs)
+        except SearchStopped:
+            moves = None
+        except Exception as exception:
+            moves = None
+            error = f"{type(exception).__name__}: {exception}"
+
+    results.put((name, moves, nodes_expanded, time.time() - start_time, error))
+
+
+class PortfolioSolver(Solver):
+    """
+    Runs every solver of a portfolio in its own process and returns the first
+    solution found. Drop-in replacement for a single solver, e.g.
+    run_solver_and_replay(PortfolioSolver, board_source).
+
+    After the search, `winner` holds the name of the solver whose solution was
+    returned and `results` the (name, moves, nodes, seconds, error) reports
+    received before the race ended. A solver that crashed is always reported,
+    verbose or not, and its error is kept in `errors` (name -> error text).
+    """
+
+    def __init__(self, initial_state, portfolio=None, timeout=None, verbose=True, **kwargs):
+        super().__init__(initial_state, **kwargs)
+        self.portfolio = DEFAULT_PORTFOLIO if portfolio is None else portfolio
+        self.timeout = timeout
+        self.verbose = verbose
+        self.winner = None
+        self.results = []
+        self.errors = {}
+
+    def _search(self):
+        start_time = time.time()
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=_portfolio_worker,
+                args=(name, solver, kwargs, self.initial_state, results),
+                daemon=True,
+            )
+            for name, solver, kwargs in self.portfolio
+        ]
+        for worker in workers:
+            worker.start()
+
+        solution = None
+        try:
+            while len(self.results) < len(workers):
+                if self.timeout is not None and time.time() - start_time >= self.timeout:
+                    if self.verbose:
+                        print(f"Portfolio timed out after {self.timeout} seconds")
+                    break
+
+                # Report while waiting so a GUI caller keeps its window alive;
+                # the frontier is the number of solvers still running. Closing
+                # the search here terminates the workers (see finally).
+                if self.progress_callback is not None:
+                    self.progress_callback(self)
+                yield self.progress(len(workers) - len(self.results))
+                try:
+                    report = results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+
+                self.results.append(report)
+                name, moves, nodes_expanded, seconds, error = report
+                if error is not None:
+                    self.errors[name] = error
+                    print(f"{name} failed: {error}")
+                elif self.verbose:
+                    outcome = f"{len(moves)} moves" if moves is not None else "no solution"
+                    print(f"{name}: {outcome} in {seconds:.2f} seconds")
+
+                if moves is not None:
+                    self.winner = name
+                    self.nodes_expanded = nodes_expanded or 0
+                    solution = moves
+                    break
+        finally:
+            # First solution wins: cancel everyone still searching
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+            for worker in workers:
+                worker.join()
+            results.close()
+
+        if solution is None:
+            print("No solution found.")
+        else:
+            print(f"Goal found by {self.winner}")
+            print(f"Time taken: {time.time() - start_time:.2f} seconds")
+        return solution
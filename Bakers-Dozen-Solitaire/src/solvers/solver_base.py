@@ -1,20 +1,183 @@
 # solver_base.py
 
-from copy import deepcopy
-from collections import deque
 from abc import ABC, abstractmethod
+import time
+from solvers.board import as_board
+from solvers.canonical import canonical_form, same_position
+from solvers.deadlock import is_dead
+from solvers.move_pruning import prune_moves, SHORTEST_RULES
+
+# Every node at a depth multiple of this keeps its board; others rebuild
+# theirs by replaying moves from the nearest ancestor that kept one.
+DEFAULT_CHECKPOINT_INTERVAL = 4
+
+# Expansions between two calls of a solver's progress callback.
+DEFAULT_PROGRESS_INTERVAL = 1000
+
+class SearchStopped(Exception):
+    """
+    Raised from a progress callback to stop a search early, e.g. over a
+    budget. Callers that run solvers treat it as "no solution", unlike any
+    other exception, which is a bug in the solver.
+    """
+
 
 class Solver(ABC):
-    def __init__(self, initial_state):
-        self.initial_state = deepcopy(initial_state)
-        self.visited = set()
+    """
+    Base class for the search solvers. Solvers are pure logic: they never
+    import pygame, so they also run headless. A GUI passes progress_callback
+    (called with the solver every progress_interval expansions) to keep its
+    event queue pumped during long searches.
+
+    search() is the streaming form of solve(): a generator yielding a
+    SearchProgress snapshot every progress_interval expansions and a final
+    one (done=True) carrying the solution. The search only advances while
+    the caller asks for the next snapshot, so it can be paused by not
+    iterating, resumed by iterating again and cancelled with close() (or by
+    dropping the generator). The best line found so far is in every
+    snapshot, so a caller can stop at a good-enough partial solution.
+
+    With prune_dead (the default), positions that can provably never be won
+    (see solvers/deadlock.py) are never expanded, and a dead initial deal is
+    rejected before searching, setting `unsolvable`.
+
+    With move_pruning (the default), legal_moves() drops dominated moves
+    before any child is built, by the solver's pruning_rules (see
+    solvers/move_pruning.py); move_pruning may also be a set of rules to use
+    instead. Subclasses that promise shortest solutions set `shortest` to
+    keep them.
+    """
+
+    # Whether the solver finds shortest solutions, which move pruning must keep
+    shortest = False
+
+    # Move pruning rules used by default. Only dropping reversing moves is
+    # harmless to every search; solvers that gain from the others opt in
+    pruning_rules = SHORTEST_RULES
+
+    def __init__(self, initial_state, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL,
+                 progress_callback=None, progress_interval=DEFAULT_PROGRESS_INTERVAL, prune_dead=True,
+                 move_pruning=True):
+        self.initial_state = as_board(initial_state)
+        self.visited = VisitedSet()
         self.nodes_expanded = 0
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.progress_callback = progress_callback
+        self.progress_interval = max(1, progress_interval)
+        self.prune_dead = prune_dead
+        self.move_pruning = move_pruning
+        self.unsolvable = False
+        # Most advanced position expanded so far and the moves reaching it
+        self.best_foundations = -1
+        self.best_line = []
+        self.solution = None
+        self.start_time = None
 
-    @abstractmethod
     def solve(self):
-        """Override in subclasses: returns a list of moves that solve the game"""
+        """Runs the search to the end: returns a list of moves that solve the game, or None"""
+        for _ in self.search():
+            pass
+        return self.solution
+
+    def search(self):
+        """
+        Runs the search step by step.
+
+        Yields:
+            SearchProgress: A snapshot every progress_interval expansions, then a
+                            final one with done=True once the search is over.
+        """
+        self.start_time = time.time()
+        if self.dead(self.initial_state):
+            print("Deal is provably unsolvable.")
+            self.unsolvable = True
+        else:
+            self.solution = yield from self._search()
+        yield self.progress(0, done=True)
+
+    @abstractmethod
+    def _search(self):
+        """
+        Override in subclasses: generator that yields self.progress(...) whenever
+        tick() says a report is due, and returns the solution moves (or None).
+        """
         pass
 
+    def dead(self, state):
+        """Checks whether a position can be skipped as provably unwinnable"""
+        return self.prune_dead and is_dead(state)
+
+    def legal_moves(self, state, last=None, parent_key=None):
+        """
+        Moves to try from a position: its legal moves, minus the dominated
+        ones when move_pruning is on.
+
+        Args:
+            state (Board or MutableBoard): The position.
+            last (tuple, optional): The move that led to it.
+            parent_key (int, optional): Zobrist key of the position before that move.
+
+        Returns:
+            list: Move tuples.
+        """
+        moves = state.get_valid_moves()
+        rules = self.move_rules()
+        if rules:
+            moves = prune_moves(state, moves, last, parent_key, rules)
+        return moves
+
+    def move_rules(self):
+        """Returns the move pruning rules in force (empty when move_pruning is off)"""
+        if not self.move_pruning:
+            return frozenset()
+        rules = self.pruning_rules if self.move_pruning is True else frozenset(self.move_pruning)
+        return rules & SHORTEST_RULES if self.shortest else rules
+
+    def tick(self, state=None, line=None):
+        """
+        Counts one node expansion, keeps track of the best position so far and
+        reports progress when due.
+
+        Args:
+            state (Board, optional): The board being expanded.
+            line (SearchNode or list, optional): Its node, or the moves reaching it.
+
+        Returns:
+            bool: True when a progress snapshot is due.
+        """
+        self.nodes_expanded += 1
+        if state is not None:
+            count = state.foundation_count()
+            if count > self.best_foundations:
+                self.best_foundations = count
+                self.best_line = self.extract_solution(line) if isinstance(line, SearchNode) else list(line or ())
+        if self.nodes_expanded % self.progress_interval == 0:
+            if self.progress_callback is not None:
+                self.progress_callback(self)
+            return True
+        return False
+
+    def progress(self, frontier, done=False):
+        """
+        Takes a snapshot of the search.
+
+        Args:
+            frontier (int): Nodes waiting to be expanded (or the current depth, for depth-first searches).
+            done (bool): Whether the search is over.
+
+        Returns:
+            SearchProgress: The snapshot.
+        """
+        elapsed = time.time() - self.start_time if self.start_time is not None else 0.0
+        return SearchProgress(self.nodes_expanded, frontier, self.best_foundations, self.best_line,
+                              elapsed, done, self.solution if done else None)
+
+    def make_node(self, state, parent=None, prev_move=None, f=0):
+        """Creates a SearchNode, keeping its board only on checkpoint depths"""
+        depth = parent.depth + 1 if parent is not None else 0
+        keep_state = depth % self.checkpoint_interval == 0
+        return SearchNode(state, parent, prev_move, depth, f, keep_state)
+
     def extract_solution(self, goal_node):
         """Backtrack from goal node to root to get list of moves"""
         moves = []
@@ -26,24 +189,217 @@ class Solver(ABC):
         return moves
 
 
+class SearchProgress:
+    """
+    Snapshot of a running search, as yielded by Solver.search().
+
+    Attributes:
+        nodes_expanded (int): Expansions so far.
+        frontier (int): Nodes waiting to be expanded (current depth for DFS and IDA*).
+        foundations (int): Cards on the foundations in the best position expanded so far.
+        best_line (list): Moves from the initial board to that position.
+        elapsed (float): Seconds since the search started.
+        nodes_per_sec (float): Expansion rate over the whole search.
+        done (bool): Whether the search is over.
+        solution (list or None): The solution, once done (None if there is none).
+    """
+
+    __slots__ = ("nodes_expanded", "frontier", "foundations", "best_line", "elapsed", "nodes_per_sec",
+                 "done", "solution")
+
+    def __init__(self, nodes_expanded, frontier, foundations, best_line, elapsed, done=False, solution=None):
+        self.nodes_expanded = nodes_expanded
+        self.frontier = frontier
+        self.foundations = foundations
+        self.best_line = best_line
+        self.elapsed = elapsed
+        self.nodes_per_sec = nodes_expanded / elapsed if elapsed > 0 else 0.0
+        self.done = done
+        self.solution = solution
+
+    def __repr__(self):
+        return (f"SearchProgress(expanded={self.nodes_expanded}, frontier={self.frontier}, "
+                f"foundations={self.foundations}, {self.nodes_per_sec:.0f} nodes/s, done={self.done})")
+
+
+class VisitedSet:
+    """
+    Set of positions keyed on their 64-bit Zobrist key.
+
+    Entries are Boards or SearchNodes (whose board is rebuilt on demand).
+    Membership can also be tested with a MutableBoard, so a depth-first
+    walker only snapshots the positions it stores.
+    The key ignores column order, so boards that only differ by a column
+    permutation count as the same state. Lookups are a single int dict
+    probe; boards are only compared when a stored one shares the key (a
+    duplicate or a genuine collision), first directly and then up to column
+    order. Colliding positions are kept together in a list under the key.
+
+    A SearchNode between checkpoints has to replay moves to get its board, so
+    callers holding the node's board pass it along (`state`): only stored
+    nodes are then ever rebuilt.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._size = 0
+
+    def __contains__(self, item):
+        entry = self._entries.get(item.key)
+        if entry is None:
+            return False
+        board = _board_of(item)
+        if type(entry) is list:
+            return any(_same(stored, board) for stored in entry)
+        return _same(entry, board)
+
+    def add(self, item, state=None):
+        """
+        Adds a position.
+
+        Args:
+            item (Board or SearchNode): Entry to store.
+            state (Board, optional): The node's board, when the caller has it.
+        """
+        entry = self._entries.get(item.key)
+        if entry is None:
+            self._entries[item.key] = item
+            self._size += 1
+            return
+        board = state if state is not None else _board_of(item)
+        if type(entry) is list:
+            if any(_same(stored, board) for stored in entry):
+                return
+            entry.append(item)
+        elif _same(entry, board):
+            return
+        else:
+            self._entries[item.key] = [entry, item]
+        self._size += 1
+
+    def __len__(self):
+        return self._size
+
+
+class PositionMap:
+    """
+    Map from positions to values, keyed like VisitedSet: one int dict probe
+    on the Zobrist key, then a board comparison (up to column order), so two
+    colliding positions never share a value. Entries are Boards or
+    SearchNodes; storing a value again replaces the entry with the new item.
+    Colliding entries are kept together in a list under the key. As with
+    VisitedSet, get() and set() take the item's board when the caller has it.
+    """
+
+    def __init__(self):
+        self._entries = {}  # key -> (item, value), or a list of them on collisions
+        self._size = 0
+
+    def get(self, item, default=None, state=None):
+        """Returns the value stored for the item's position (board `state` if given), or default"""
+        entry = self._entries.get(item.key)
+        if entry is None:
+            return default
+        entries = entry if type(entry) is list else (entry,)
+        for stored, value in entries:
+            if stored is item:
+                return value
+        board = state if state is not None else _board_of(item)
+        for stored, value in entries:
+            if _same(stored, board):
+                return value
+        return default
+
+    def __setitem__(self, item, value):
+        self.set(item, value)
+
+    def set(self, item, value, state=None):
+        """
+        Stores a value for the item's position.
+
+        Args:
+            item (Board or SearchNode): Entry to store.
+            value: Its value.
+            state (Board, optional): The node's board, when the caller has it.
+        """
+        entry = self._entries.get(item.key)
+        if entry is None:
+            self._entries[item.key] = (item, value)
+        elif type(entry) is list:
+            board = state if state is not None else _board_of(item)
+            for index, (stored, _) in enumerate(entry):
+                if stored is item or _same(stored, board):
+                    entry[index] = (item, value)
+                    return
+            entry.append((item, value))
+        elif entry[0] is item or _same(entry[0], state if state is not None else _board_of(item)):
+            self._entries[item.key] = (item, value)
+            return
+        else:
+            self._entries[item.key] = [entry, (item, value)]
+        self._size += 1
+
+    def __len__(self):
+        return self._size
+
+
+def _board_of(item):
+    """The board of an entry: a SearchNode's (rebuilt if needed), or the Board or MutableBoard itself"""
+    return item.state if isinstance(item, SearchNode) else item
+
+
+def _same(stored, board):
+    """Compares a stored entry (rebuilt if it is a node) with a board"""
+    stored = _board_of(stored)
+    return stored == board or same_position(stored, board)
+
+
 class SearchNode:
-    def __init__(self, state, parent=None, prev_move=None, depth=0):
-        self.state = deepcopy(state)
+    """
+    Search tree node holding a parent pointer and the move that produced it.
+
+    Only checkpoint nodes (and the root) keep their Board; the state property
+    rebuilds any other board by replaying moves from the nearest ancestor that
+    kept one. Depth doubles as the path cost g, and f stores the priority the
+    solver assigned when the node was created.
+    """
+
+    __slots__ = ("parent", "prev_move", "depth", "f", "key", "_state")
+
+    def __init__(self, state, parent=None, prev_move=None, depth=0, f=0, keep_state=True):
         self.parent = parent
         self.prev_move = prev_move
         self.depth = depth
+        self.f = f
+        self.key = state.key
+        self._state = state if keep_state or parent is None else None
+
+    @property
+    def state(self):
+        """Returns this node's board, rebuilding it from the nearest cached ancestor"""
+        if self._state is not None:
+            return self._state
+
+        moves = []
+        node = self
+        while node._state is None:
+            moves.append(node.prev_move)
+            node = node.parent
+
+        board = node._state
+        for move in reversed(moves):
+            board = board.apply_move(move)
+        return board
 
     def __eq__(self, other):
-        return self.serialize() == other.serialize()
+        return self is other or (self.key == other.key and same_position(self.state, other.state))
 
     def __lt__(self, other):
         return self.depth < other.depth
 
     def __hash__(self):
-        return hash(self.serialize())
+        return self.key
 
     def serialize(self):
-        """Returns a hashable unique string for the current game state"""
-        tableau_str = ''.join([''.join(f"{c.suit[0]}{c.rank}" for c in col) for col in self.state.tableau])
-        foundation_str = ''.join(f"{k[0]}{len(v)}" for k, v in self.state.foundations.items())
-        return tableau_str + "|" + foundation_str
+        """Returns a hashable key for the current game state, ignoring column order"""
+        return canonical_form(self.state)
@@ -0,0 +1,93 @@
+# conftest.py
+
+import os
+import random
+
+import pytest
+
+from solvers.board import deal_board, load_board, parse_card_code
+
+BOARDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "boards")
+
+# Solvable board files, small enough for every solver
+FIXTURE_BOARDS = ("algorithm_test.txt", "very_easy.txt", "near_goal_test.txt")
+
+# Deals walked at random by walk_positions, and moves played on each
+WALK_SEEDS = (0, 1, 2, 3)
+WALK_LENGTH = 60
+
+
+def cards(text):
+    """Parses space-separated card names (e.g. "10S AH") into a tuple of packed cards"""
+    return tuple(parse_card_code(token) for token in text.split())
+
+
+def replay(board, moves):
+    """Plays moves from a board, checking each is legal; returns every position along the way"""
+    line = [board]
+    for move in moves:
+        assert move in board.get_valid_moves()
+        board = board.apply_move(move)
+        line.append(board)
+    return line
+
+
+@pytest.fixture(name="cards")
+def cards_fixture():
+    """cards(), to build small positions by hand"""
+    return cards
+
+
+@pytest.fixture(params=FIXTURE_BOARDS)
+def fixture_board(request):
+    """Each solvable fixture board, as a Board"""
+    return load_board(os.path.join(BOARDS_DIR, request.param))
+
+
+@pytest.fixture
+def boards_dir():
+    """Path of the boards directory"""
+    return BOARDS_DIR
+
+
+@pytest.fixture
+def board_file():
+    """Loads a board file of the boards directory by name"""
+    return lambda name: load_board(os.path.join(BOARDS_DIR, name))
+
+
+@pytest.fixture
+def solution_line():
+    """Replays a solution, checking that it wins; returns every position along it"""
+    def check(board, moves):
+        assert moves is not None
+        line = replay(board, moves)
+        assert line[-1].is_goal_state()
+        return line
+    return check
+
+
+@pytest.fixture(scope="session")
+def walk_positions():
+    """Positions met along random moves from a few deals, with promotions and emptied columns"""
+    positions = []
+    for seed in WALK_SEEDS:
+        rng = random.Random(seed)
+        board = deal_board(seed)
+        positions.append(board)
+        for _ in range(WALK_LENGTH):
+            moves = board.get_valid_moves()
+            if not moves:
+                break
+            board = board.apply_move(rng.choice(moves))
+            positions.append(board)
+    return positions
+
+
+@pytest.fixture
+def game_state_deal(monkeypatch):
+    """generate_random_game_state, dealing real pygame Cards (their images load relative to src/)"""
+    pytest.importorskip("pygame")
+    monkeypatch.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from deck import generate_random_game_state
+    return generate_random_game_state
@@ -0,0 +1,65 @@
+# test_astar_2.py
+
+from heapq import heappop
+from itertools import count as counter
+
+from solvers.astar_2_solver import AStar2Solver, TreeNode, a_star_search, ordered_insert
+from solvers.batch_heuristic import evaluate_batch
+from solvers.board import Board
+from solvers.solver_base import DEFAULT_CHECKPOINT_INTERVAL
+
+
+def test_node_budget_returns_the_most_advanced_node(board_file, capsys):
+    board = board_file("algorithm_test.txt")
+    steps = a_star_search(board, progress_interval=1, max_nodes=5)
+    snapshots = list(steps)
+
+    assert [snapshot.nodes_expanded for snapshot in snapshots] == [1, 2, 3, 4, 5, 5]
+    assert snapshots[-1].done and snapshots[-1].solution is None
+    assert "Max nodes reached (5)" in capsys.readouterr().out
+
+
+def test_solver_counts_the_expansions_of_the_search(board_file, capsys):
+    board = board_file("algorithm_test.txt")
+    *_, last = a_star_search(board)
+    reports = []
+    solver = AStar2Solver(board, progress_interval=7, progress_callback=lambda s: reports.append(s.nodes_expanded))
+
+    assert solver.solve() == last.solution
+    assert solver.nodes_expanded == last.nodes_expanded
+    assert reports == list(range(7, last.nodes_expanded + 1, 7))
+
+
+def test_solver_exhausting_the_search_proves_the_deal_unsolvable(cards, capsys):
+    # 2H covers AH and has nowhere to go
+    board = Board((cards("AH 2H"), ()), (0, 13, 13, 13))
+    solver = AStar2Solver(board, prune_dead=False)
+    capped = AStar2Solver(board, max_nodes=1, prune_dead=False)
+
+    assert solver.solve() is None and solver.unsolvable
+    # Stopped by the cap, it proves nothing
+    assert capped.solve() is None and not capped.unsolvable
+
+
+def test_nodes_between_checkpoints_rebuild_their_board(walk_positions):
+    board = walk_positions[0]
+    node = TreeNode(board)
+    expected = [board]
+    for level in range(1, 2 * DEFAULT_CHECKPOINT_INTERVAL):
+        move = expected[-1].get_valid_moves()[0]
+        expected.append(expected[-1].apply_move(move))
+        node = TreeNode(expected[-1], node, move, level)
+        assert (node._state is None) == (level % DEFAULT_CHECKPOINT_INTERVAL != 0)
+        assert node.state == expected[-1]
+
+
+def test_open_list_pops_by_score_then_insertion(walk_positions):
+    nodes = [TreeNode(board, level=level % 3) for level, board in enumerate(walk_positions)]
+    queue = []
+    tiebreak = counter()
+    ordered_insert(queue, nodes[:40], tiebreak)
+    ordered_insert(queue, nodes[40:], tiebreak)
+
+    popped = [heappop(queue) for _ in range(len(nodes))]
+    assert [node for _, _, node in popped] == \
+        [node for _, node in sorted(zip(evaluate_batch(nodes), nodes), key=lambda entry: entry[0])]
@@ -0,0 +1,31 @@
+# test_batch_heuristic.py
+
+from solvers.astar_2_solver import TreeNode, evaluate
+from solvers.astar_solver import AStarSolver
+from solvers.batch_heuristic import default_heuristic_batch, evaluate_batch
+
+
+def test_batched_astar_expands_the_same_nodes(fixture_board, solution_line, capsys):
+    scalar = AStarSolver(fixture_board, verbose=False)
+    batched = AStarSolver(fixture_board, verbose=False, batch_heuristic=True)
+
+    assert solution_line(fixture_board, batched.solve()) == solution_line(fixture_board, scalar.solve())
+    assert batched.nodes_expanded == scalar.nodes_expanded
+
+
+def test_default_batch_equals_the_scalar_heuristic(walk_positions):
+    scores = default_heuristic_batch(walk_positions)
+
+    assert scores == [AStarSolver.default_heuristic(None, board) for board in walk_positions]
+
+
+def test_evaluate_batch_equals_evaluate(walk_positions, capsys):
+    nodes = [TreeNode(board, level=level % 7) for level, board in enumerate(walk_positions)]
+
+    assert evaluate_batch(nodes) == [evaluate(node) for node in nodes]
+    assert evaluate_batch(nodes, walk_positions) == evaluate_batch(nodes)
+
+
+def test_empty_batch():
+    assert default_heuristic_batch([]) == []
+    assert evaluate_batch([]) == []
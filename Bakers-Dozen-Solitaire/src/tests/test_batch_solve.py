@@ -0,0 +1,95 @@
+# test_batch_solve.py
+
+import csv
+import json
+import os
+import shutil
+
+import pytest
+
+from batch_solve import RESULT_FIELDS, main, read_finished, run_deal
+from solvers.board import RANKS, SUITS
+
+
+def write_won_board(path):
+    """A board file with every card on the foundations"""
+    with open(path, "w") as f:
+        f.write("FOUNDATIONS:\n")
+        for suit in SUITS:
+            f.write(f"{suit}: " + " ".join(rank + suit[0] for rank in RANKS) + "\n")
+
+
+def test_solves_a_board_file(boards_dir):
+    record, search_time = run_deal((f"file:{os.path.join(boards_dir, 'algorithm_test.txt')}", "greedy", None, None))
+
+    assert record["status"] == "solved" and record["solved"]
+    assert record["moves"] > 0
+    assert search_time is not None
+
+
+def test_won_board_is_solved_in_no_moves(tmp_path):
+    path = tmp_path / "won.txt"
+    write_won_board(path)
+
+    record, _ = run_deal((f"file:{path}", "greedy", None, None))
+
+    assert record["status"] == "solved"
+    assert record["moves"] == 0
+
+
+@pytest.mark.parametrize("solver", ["greedy", "astar2"])
+def test_node_budget_stops_the_search(solver):
+    record, _ = run_deal(("seed:1", solver, None, 50))
+
+    assert record["status"] == "node_limit"
+    assert record["nodes_expanded"] == 50
+    assert record["moves"] is None
+
+
+def test_resume_skips_recorded_deals(tmp_path, boards_dir, capsys):
+    boards = tmp_path / "boards"
+    boards.mkdir()
+    shutil.copy(os.path.join(boards_dir, "very_easy.txt"), boards)
+    write_won_board(boards / "won.txt")
+    output = tmp_path / "results.jsonl"
+
+    # An earlier run recorded very_easy.txt, then got cut off mid-line
+    recorded = {"deal": f"file:{boards / 'very_easy.txt'}", "solver": "greedy", "status": "solved",
+                "solved": True, "moves": 1, "nodes_expanded": 1, "time": 0.0}
+    output.write_text(json.dumps(recorded) + "\n" + '{"deal": "file:')
+
+    main(["--boards", str(boards), "--solver", "greedy", "--workers", "1", "--output", str(output)])
+
+    # The truncated line was dropped and only won.txt was solved
+    lines = output.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[1])["deal"] == f"file:{boards / 'won.txt'}"
+    assert read_finished(str(output)) == {(f"file:{boards / name}", "greedy") for name in ("very_easy.txt", "won.txt")}
+
+
+def test_resume_reruns_a_truncated_csv_row(tmp_path, boards_dir, capsys):
+    boards = tmp_path / "boards"
+    boards.mkdir()
+    shutil.copy(os.path.join(boards_dir, "very_easy.txt"), boards)
+    write_won_board(boards / "won.txt")
+    output = tmp_path / "results.csv"
+
+    # Cut off in the middle of the time field: the row still parses as finished
+    easy, won = (f"file:{boards / name}" for name in ("very_easy.txt", "won.txt"))
+    output.write_text(",".join(RESULT_FIELDS) + "\r\n" + f"{easy},greedy,solved,True,1,1,0.0,\r\n"
+                      + f"{won},greedy,solved,True,0,0,0.")
+
+    main(["--boards", str(boards), "--solver", "greedy", "--workers", "1", "--output", str(output)])
+
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["deal"] for row in rows] == [easy, won]
+    assert rows[1]["moves"] == "0" and rows[1]["error"] == ""
+
+
+def test_crash_is_recorded_with_its_exception(tmp_path, capsys):
+    record, search_time = run_deal((f"file:{tmp_path / 'missing.txt'}", "greedy", None, None))
+
+    assert record["status"] == "error" and search_time is None
+    assert record["error"].startswith("FileNotFoundError: ")
+    assert "Traceback" in capsys.readouterr().err
@@ -0,0 +1,24 @@
+# test_beam.py
+
+from solvers.beam_solver import BeamSolver
+from solvers.board import deal_board
+
+
+def test_worker_processes_give_the_same_search(board_file, capsys):
+    board = board_file("algorithm_test.txt")
+    alone = BeamSolver(board, beam_width=4)
+    pooled = BeamSolver(board, beam_width=4, workers=2)
+
+    assert pooled.solve() == alone.solve()
+    assert pooled.nodes_expanded == alone.nodes_expanded
+
+
+def test_failed_beam_restarts_wider(solution_line, capsys):
+    # Deal 1 is lost by a beam of 1 and won by a beam of 4
+    board = deal_board(1)
+    narrow = BeamSolver(board, beam_width=1, max_depth=200)
+    assert narrow.solve() is None and not narrow.unsolvable
+
+    solver = BeamSolver(board, beam_width=1, max_width=16, max_depth=200)
+    solution_line(board, solver.solve())
+    assert solver.width == 4
@@ -0,0 +1,51 @@
+# test_benchmark.py
+
+import os
+
+import pytest
+
+from benchmark import benchmark_run, compare, corpus, MIN_COMPARED_TIME
+
+
+def record(deal="seed:0", solved=True, **metrics):
+    values = {"time": 1.0, "nodes_expanded": 1000, "peak_rss_kb": 5000, "moves": 80}
+    values.update(metrics)
+    return dict(solver="astar", deal=deal, solved=solved, status="solved" if solved else "node_limit", **values)
+
+
+@pytest.mark.parametrize("name", ["algorithm_test.txt", "very_easy.txt", "near_goal_test.txt"])
+def test_run_records_a_solution_with_throughput(name, boards_dir):
+    result = benchmark_run((f"file:{os.path.join(boards_dir, name)}", "astar", None, None))
+
+    assert result["solved"] and result["moves"] > 0
+    assert result["nodes_per_sec"] > 0
+    assert result["peak_rss_kb"] is None or result["peak_rss_kb"] >= 0
+
+
+def test_corpus_lists_board_files_then_seeds(boards_dir):
+    deals = corpus(boards_dir, seeds=range(2))
+
+    assert f"file:{os.path.join(boards_dir, 'very_easy.txt')}" in deals
+    assert deals[-2:] == ["seed:0", "seed:1"]
+
+
+def test_metric_growth_past_the_threshold_is_a_regression():
+    baseline = [record(nodes_expanded=1000, moves=80)]
+
+    assert compare([record(nodes_expanded=1090, moves=80)], baseline, 0.1) == []
+    regressions = compare([record(nodes_expanded=1200, moves=100)], baseline, 0.1)
+    assert len(regressions) == 2
+    assert "nodes_expanded 1000 -> 1200" in regressions[0]
+
+
+def test_lost_solution_is_a_regression():
+    regressions = compare([record(solved=False, moves=None)], [record()], 0.1)
+
+    assert regressions == ["astar on seed:0: no longer solved (node_limit)"]
+
+
+def test_noise_and_unmatched_runs_are_ignored():
+    fast = MIN_COMPARED_TIME / 4
+    baseline = [record(time=fast), record(deal="seed:1")]
+
+    assert compare([record(time=fast * 3), record(deal="seed:2", time=100.0)], baseline, 0.1) == []
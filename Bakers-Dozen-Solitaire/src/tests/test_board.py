@@ -0,0 +1,71 @@
+# test_board.py
+
+import random
+
+import pytest
+
+from solvers.board import Board, MutableBoard, deal_board, heuristic_totals, top_index, zobrist_key
+
+# Deals replayed move by move against GameState
+SEEDS = (0, 1, 2, 3)
+
+
+def test_incremental_fields_match_scratch(walk_positions):
+    for board in walk_positions:
+        assert board.key == zobrist_key(board.tableau, board.foundations)
+        assert board.totals == heuristic_totals(board.tableau)
+        assert board.index == top_index([column[-1] if column else -1 for column in board.tableau])
+
+
+def test_key_ignores_column_order():
+    board = deal_board(5)
+    swapped = Board(tuple(reversed(board.tableau)), board.foundations)
+
+    assert swapped.key == board.key
+    assert swapped != board
+
+
+def test_mutable_board_round_trip(walk_positions):
+    for board in walk_positions:
+        mutable = MutableBoard(board)
+        for move in board.get_valid_moves():
+            record = mutable.do_move(move)
+            child = mutable.snapshot()
+            expected = board.apply_move(move)
+            assert child == expected
+            assert (child.key, child.totals, child.index) == (expected.key, expected.totals, expected.index)
+
+            mutable.undo_move(record)
+            restored = mutable.snapshot()
+            assert restored == board
+            assert (restored.key, restored.totals, restored.index) == (board.key, board.totals, board.index)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_board_follows_game_state(game_state_deal, seed):
+    game_state = game_state_deal(seed)
+    board = deal_board(seed)
+    rng = random.Random(seed)
+    for _ in range(60):
+        packed = Board.from_game_state(game_state)
+        assert packed == board
+        assert packed.key == board.key
+        assert tuple(game_state.index) == board.index
+        moves = game_state.get_valid_moves()
+        assert moves == board.get_valid_moves()
+        if not moves:
+            break
+
+        # Every move is undone exactly, score included
+        for move in moves:
+            score = game_state.score
+            steps = game_state.do_move(move)
+            assert Board.from_game_state(game_state) == board.apply_move(move)
+            game_state.undo_move(steps)
+            assert Board.from_game_state(game_state) == board
+            assert tuple(game_state.index) == board.index
+            assert game_state.score == score
+
+        move = rng.choice(moves)
+        game_state.do_move(move)
+        board = board.apply_move(move)
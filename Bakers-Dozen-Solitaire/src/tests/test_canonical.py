@@ -0,0 +1,37 @@
+# test_canonical.py
+
+import random
+
+from solvers.board import Board
+from solvers.canonical import canonical_form, same_position
+from solvers.greedy_solver import GreedySolver
+from solvers.solver_base import VisitedSet
+
+
+def permuted(board, seed):
+    columns = list(board.tableau)
+    random.Random(seed).shuffle(columns)
+    return Board(tuple(columns), board.foundations)
+
+
+def test_permuted_fixture_is_solved_in_its_own_column_order(fixture_board, solution_line, capsys):
+    board = permuted(fixture_board, 0)
+    solution_line(board, GreedySolver(board, verbose=False).solve())
+
+
+def test_column_orders_collapse_to_one_state(walk_positions):
+    visited = VisitedSet()
+    for seed in range(20):
+        visited.add(permuted(walk_positions[0], seed))
+
+    assert len(visited) == 1
+    assert len({canonical_form(permuted(walk_positions[0], seed)) for seed in range(20)}) == 1
+
+
+def test_same_columns_with_other_foundations_differ(cards):
+    board = Board((cards("5S"), cards("6C")), (0, 0, 0, 0))
+    other = Board((cards("6C"), cards("5S")), (1, 0, 0, 0))
+
+    assert same_position(board, Board(tuple(reversed(board.tableau)), board.foundations))
+    assert not same_position(board, other)
+    assert canonical_form(board) != canonical_form(other)
@@ -0,0 +1,56 @@
+# test_deadlock.py
+
+import pytest
+
+from solvers.astar_solver import AStarSolver
+from solvers.board import Board, SUITS, RANKS
+from solvers.deadlock import is_dead, stuck_cards
+from solvers.dfs_solver import DFSSolver
+from solvers.greedy_solver import GreedySolver
+
+
+@pytest.fixture
+def deal_with(cards):
+    """A full deck: `column`, then every other card in one column per suit, King at the bottom"""
+    def deal(column):
+        rest = tuple(tuple(card for card in cards(" ".join(rank + suit[0] for rank in reversed(RANKS)))
+                           if card not in column)
+                     for suit in SUITS)
+        return Board((column,) + rest, (0,) * len(SUITS))
+    return deal
+
+
+def test_card_covering_all_its_targets_is_stuck(cards, deal_with):
+    # 3H lies on 2H and all four 4s are buried beneath it
+    column = cards("4H 4D 4C 4S 2H 3H")
+    board = deal_with(column)
+
+    assert stuck_cards(board) == [column[-1]]
+    assert is_dead(board)
+
+
+def test_free_target_releases_the_card(cards, deal_with):
+    # 4S is in the Spades column now, where it comes out as the low Spades go home
+    board = deal_with(cards("4H 4D 4C 2H 3H"))
+
+    assert stuck_cards(board) == []
+    assert not is_dead(board)
+
+
+def test_cards_holding_each_other_are_stuck(cards):
+    # 5H only fits on a 6 buried under 7D, and 7D only on an 8 buried under 5H
+    board = Board((cards("8S 8C 8H 8D 4H 5H"), cards("6S 6C 6H 6D 2D 7D")), (0,) * len(SUITS))
+
+    assert sorted(stuck_cards(board)) == sorted(cards("5H 7D"))
+    assert is_dead(board)
+
+
+def test_ordered_deal_is_not_dead(deal_with):
+    assert not is_dead(deal_with(()))
+
+
+@pytest.mark.parametrize("solver_class", [AStarSolver, DFSSolver, GreedySolver])
+def test_never_prunes_a_solved_position(fixture_board, solver_class, solution_line, capsys):
+    solution = solver_class(fixture_board, prune_dead=False).solve()
+
+    assert not any(is_dead(board) for board in solution_line(fixture_board, solution))
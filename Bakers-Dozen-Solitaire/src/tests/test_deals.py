@@ -0,0 +1,51 @@
+# test_deals.py
+
+import pytest
+
+from batch_solve import load_deal
+from solvers.board import deal_board, deal_number_board, parse_card_code, NUM_CARDS, NUM_RANKS
+from solvers.monte_carlo import NestedMonteCarloSolver
+
+
+def check_deal(board):
+    """A fresh deal: the whole deck in 13 columns of 4, Kings at the bottom"""
+    assert sorted(card for column in board.tableau for card in column) == list(range(NUM_CARDS))
+    assert [len(column) for column in board.tableau] == [4] * 13
+    assert board.foundations == (0, 0, 0, 0)
+    for column in board.tableau:
+        values = [card % NUM_RANKS for card in column]
+        kings = values.count(NUM_RANKS - 1)
+        assert all(value == NUM_RANKS - 1 for value in values[:kings])
+
+
+@pytest.mark.parametrize("deal", [deal_board, deal_number_board])
+def test_deals_are_reproducible(deal):
+    for number in range(5):
+        board = deal(number)
+        check_deal(board)
+        assert board == deal(number)
+        assert board.key == deal(number).key
+    assert deal(1) != deal(2)
+
+
+def test_numbered_deal_follows_the_lcg():
+    # First step from state 1: (214013 + 2531011) >> 16 = 41, i.e. 3S, dealt to column 0
+    assert parse_card_code("3S") == 41
+    assert 41 in deal_number_board(1).tableau[0]
+
+
+@pytest.mark.parametrize("number", [-1, 1 << 31])
+def test_numbered_deal_out_of_range(number):
+    with pytest.raises(ValueError):
+        deal_number_board(number)
+
+
+def test_deal_ids_rebuild_the_same_board(board_file, boards_dir):
+    assert load_deal("seed:3") == deal_board(3)
+    assert load_deal("deal:3") == deal_number_board(3)
+    assert load_deal(f"file:{boards_dir}/very_easy.txt") == board_file("very_easy.txt")
+
+
+def test_seeded_deal_is_solved(solution_line, capsys):
+    board = deal_board(0)
+    solution_line(board, NestedMonteCarloSolver(board, seed=0).solve())
@@ -0,0 +1,63 @@
+# test_external_bfs.py
+
+import pytest
+
+from solvers.board import Board
+from solvers.bfs_solver import BFSSolver
+from solvers.external_bfs import ExternalBFSSolver, pack_state, unpack_state, record_size
+
+
+@pytest.mark.parametrize("name", ["very_easy.txt", "near_goal_test.txt"])
+def test_finds_a_shortest_solution(name, board_file, solution_line, tmp_path, capsys):
+    board = board_file(name)
+    solver = ExternalBFSSolver(board, buffer_size=16, work_dir=str(tmp_path))
+    moves = solver.solve()
+
+    solution_line(board, moves)
+    assert len(moves) == len(BFSSolver(board).solve())
+    assert not list(tmp_path.iterdir())
+
+
+def test_rebuilding_the_path_expands_nothing(board_file, capsys):
+    # The rebuild rereads layer files; only the states of expanded layers count
+    reports = []
+    solver = ExternalBFSSolver(board_file("near_goal_test.txt"), progress_interval=1,
+                               progress_callback=lambda s: reports.append(s.nodes_expanded))
+    solver.solve()
+
+    assert solver.nodes_expanded <= sum(solver.layer_sizes)
+    assert reports[-1] == solver.nodes_expanded
+    assert reports.count(solver.nodes_expanded) > 1
+
+
+@pytest.mark.parametrize("max_depth", [None, 5])
+def test_best_line_reaches_the_reported_foundations(max_depth, board_file, capsys):
+    # The line is rebuilt from the layer files, also when the depth limit ends the search
+    board = board_file("near_goal_test.txt")
+    snapshots = list(ExternalBFSSolver(board, max_depth=max_depth, progress_interval=5).search())
+
+    assert snapshots[-1].best_line
+    for snapshot in snapshots:
+        position = board
+        for move in snapshot.best_line:
+            assert move in position.get_valid_moves()
+            position = position.apply_move(move)
+        assert position.foundation_count() == snapshot.foundations
+
+
+def test_packing_ignores_column_order(cards):
+    board = Board((cards("5S AH"), (), cards("6C 5D")), (0, 0, 0, 0))
+    size = record_size(3)
+    swapped = Board((cards("6C 5D"), cards("5S AH"), ()), (0, 0, 0, 0))
+
+    assert pack_state(board, size) == pack_state(swapped, size)
+    assert sorted(unpack_state(pack_state(board, size), 3).tableau) == sorted(board.tableau)
+
+
+def test_exhausted_search_proves_the_deal_unsolvable(cards, capsys):
+    # 2H covers AH and has nowhere to go
+    board = Board((cards("AH 2H"), ()), (0, 13, 13, 13))
+    solver = ExternalBFSSolver(board, prune_dead=False)
+
+    assert solver.solve() is None
+    assert solver.exhausted and solver.layer_sizes == [1]
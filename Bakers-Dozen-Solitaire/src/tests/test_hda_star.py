@@ -0,0 +1,26 @@
+# test_hda_star.py
+
+import pytest
+
+from solvers.bfs_solver import BFSSolver
+from solvers.board import Board
+from solvers.hda_star import HDAStarSolver
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_admissible_finds_a_shortest_solution(workers, board_file, solution_line, capsys):
+    board = board_file("near_goal_test.txt")
+    solver = HDAStarSolver(board, workers=workers, admissible=True, round_size=20)
+
+    moves = solver.solve()
+    solution_line(board, moves)
+    assert len(moves) == len(BFSSolver(board).solve())
+    assert solver.rounds > 1
+
+
+def test_exhausted_search_proves_the_deal_unsolvable(cards, capsys):
+    # 2H covers AH and has nowhere to go
+    solver = HDAStarSolver(Board((cards("AH 2H"), ()), (0, 13, 13, 13)), workers=2, prune_dead=False)
+
+    assert solver.solve() is None
+    assert solver.exhausted and solver.unsolvable
@@ -0,0 +1,37 @@
+# test_headless.py
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from solvers.dfs_solver import DFSSolver
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SOLVERS_DIR = os.path.join(SRC_DIR, "solvers")
+
+
+def test_solvers_never_import_pygame():
+    modules = sorted(name[:-3] for name in os.listdir(SOLVERS_DIR) if name.endswith(".py") and name != "__init__.py")
+    script = "import sys\n" + "".join(f"import solvers.{module}\n" for module in modules) + \
+             "assert 'pygame' not in sys.modules, 'pygame imported'\n"
+    result = subprocess.run([sys.executable, "-c", script], cwd=SRC_DIR, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_progress_callback_runs_every_interval(board_file, capsys):
+    seen = []
+    solver = DFSSolver(board_file("algorithm_test.txt"), progress_interval=10,
+                       progress_callback=lambda s: seen.append(s.nodes_expanded))
+    solver.solve()
+
+    assert seen and seen == list(range(10, solver.nodes_expanded + 1, 10))
+
+
+def test_loaded_board_counts_foundation_cards(board_file):
+    board = board_file("near_goal_test.txt")
+
+    assert board.foundations[:3] == (6, 8, 4)
+    assert sum(map(len, board.tableau)) + sum(board.foundations) == 52
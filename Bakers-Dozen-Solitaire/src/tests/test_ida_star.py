@@ -0,0 +1,28 @@
+# test_ida_star.py
+
+from solvers.bfs_solver import BFSSolver
+from solvers.external_bfs import pack_state, record_size
+from solvers.ida_star_solver import IDAStarSolver, TranspositionTable
+
+
+def test_admissible_finds_a_shortest_solution(board_file, solution_line, capsys):
+    board = board_file("near_goal_test.txt")
+    solution = IDAStarSolver(board, admissible=True).solve()
+
+    solution_line(board, solution)
+    assert len(solution) == len(BFSSolver(board).solve())
+
+
+def test_table_entries_belong_to_one_position(walk_positions):
+    table = TranspositionTable(16)
+    size = record_size(len(walk_positions[0].tableau))
+    first, second = (pack_state(board, size) for board in walk_positions[:2])
+
+    # Two positions forced onto the same key don't see each other's bound
+    table.store(7, first, 3, 12, 1)
+    assert table.probe(7, second) is None
+    assert table.probe(7, first)[2:] == (3, 12, 1)
+
+    table.store(7, second, 5, 20, 1)
+    assert table.probe(7, first)[3] == 12
+    assert table.probe(7, second)[3] == 20
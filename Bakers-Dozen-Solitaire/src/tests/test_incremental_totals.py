@@ -0,0 +1,36 @@
+# test_incremental_totals.py
+
+from solvers.board import Board, NUM_RANKS
+from solvers.greedy_solver import GreedySolver
+
+
+def scratch_terms(board):
+    """The heuristic terms counted card by card, the way they were before the totals"""
+    ordered = suited = 0
+    for column in board.tableau:
+        for under, card in zip(column, column[1:]):
+            if under % NUM_RANKS == card % NUM_RANKS + 1:
+                ordered += 1
+                suited += under // NUM_RANKS == card // NUM_RANKS
+    empty = sum(not column for column in board.tableau)
+    return ordered, suited, empty, len(board.get_valid_moves())
+
+
+def terms(board):
+    return board.ordered_pairs(), board.suited_pairs(), board.empty_columns(), board.move_count()
+
+
+def test_terms_stay_exact_along_a_solution(fixture_board, solution_line, capsys):
+    line = solution_line(fixture_board, GreedySolver(fixture_board, verbose=False).solve())
+
+    for board in line:
+        assert terms(board) == scratch_terms(board)
+
+
+def test_terms_after_a_cascade_empties_columns(cards):
+    # 5S goes on 6D; AH, 2H and AD then go home, emptying two columns
+    board = Board((cards("2H AD"), cards("AH 5S"), cards("6D")), (0, 0, 1, 1))
+    child = board.apply_move(("tableau", 1, 2))
+
+    assert child.tableau == ((), (), cards("6D 5S"))
+    assert terms(child) == scratch_terms(child) == (1, 0, 2, 0)
@@ -0,0 +1,63 @@
+# test_lower_bound.py
+
+import itertools
+
+import pytest
+
+from solvers.astar_solver import AStarSolver
+from solvers.bfs_solver import BFSSolver
+from solvers.board import NUM_RANKS
+from solvers.lower_bound import moves_left_bound, _column_bound
+
+
+def relaxed_moves(values):
+    """
+    Fewest moves clearing one column when every other column is an unlimited
+    free cell and a card goes home for free once no lower value is left:
+    what a single-column pattern database would store.
+    """
+    column = list(values)
+    cells = []
+    moves = 0
+    while column or cells:
+        lowest = min(column + cells)
+        if lowest in cells:
+            cells.remove(lowest)
+        elif column[-1] == lowest:
+            column.pop()
+        else:
+            cells.append(column.pop())  # The only move there is
+            moves += 1
+    return moves
+
+
+@pytest.mark.parametrize("length", range(7))
+def test_column_bound_equals_the_single_column_relaxation(length):
+    # Values from a small range, repeats included (cards of different suits)
+    for values in itertools.product(range(5), repeat=length):
+        column = tuple(value + NUM_RANKS * (i % 4) for i, value in enumerate(values))
+        assert _column_bound(column) == relaxed_moves(values), values
+
+
+@pytest.mark.parametrize("name", ["very_easy.txt", "near_goal_test.txt"])
+def test_never_overestimates_along_a_shortest_solution(name, board_file, solution_line, capsys):
+    board = board_file(name)
+    line = solution_line(board, BFSSolver(board).solve())
+
+    # Every suffix of a shortest solution is a shortest solution from its position
+    for done, position in enumerate(line):
+        assert moves_left_bound(position) <= len(line) - 1 - done
+
+
+def test_changes_by_at_most_one_per_move(walk_positions):
+    for board in walk_positions:
+        for move in board.get_valid_moves():
+            assert abs(moves_left_bound(board.apply_move(move)) - moves_left_bound(board)) <= 1
+
+
+def test_admissible_astar_finds_a_shortest_solution(board_file, solution_line, capsys):
+    board = board_file("near_goal_test.txt")
+    moves = AStarSolver(board, verbose=False, admissible=True).solve()
+
+    solution_line(board, moves)
+    assert len(moves) == len(BFSSolver(board).solve())
@@ -0,0 +1,40 @@
+# test_monte_carlo.py
+
+import random
+
+import pytest
+
+from solvers.board import deal_board
+from solvers.monte_carlo import NestedMonteCarloSolver, playout
+from solvers.solver_base import SearchStopped
+
+
+class Budget(SearchStopped):
+    pass
+
+
+def stop_at(limit):
+    """Progress callback raising Budget once `limit` expansions are reached"""
+    def check(solver):
+        if solver.nodes_expanded >= limit:
+            raise Budget
+    return check
+
+
+def test_playout_ticks_once_per_position_moved_from():
+    ticks = []
+    score, moves = playout(deal_board(0), random.Random(0), 30, tick=lambda: ticks.append(1))
+
+    assert len(moves) == 30
+    assert len(ticks) == 30
+
+
+@pytest.mark.parametrize("level", [1, 2])
+def test_budget_is_checked_inside_nested_searches(level, capsys):
+    # A single level 1 evaluation already plays far more than 25 moves
+    solver = NestedMonteCarloSolver(deal_board(0), level=level, seed=0, progress_interval=1,
+                                    progress_callback=stop_at(25))
+
+    with pytest.raises(Budget):
+        solver.solve()
+    assert solver.nodes_expanded == 25
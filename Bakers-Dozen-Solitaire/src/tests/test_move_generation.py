@@ -0,0 +1,44 @@
+# test_move_generation.py
+
+import random
+
+from solvers.board import NUM_RANKS, Board
+
+
+def baseline_moves(board):
+    """The move rules as GameState first wrote them: every column top against every other top"""
+    moves = []
+    for from_col, column in enumerate(board.tableau):
+        if not column:
+            continue
+        card = column[-1]
+        if card % NUM_RANKS == board.foundations[card // NUM_RANKS]:
+            moves.append(("foundation", from_col))
+        for to_col, target in enumerate(board.tableau):
+            if to_col != from_col and target and card % NUM_RANKS == target[-1] % NUM_RANKS - 1:
+                moves.append(("tableau", from_col, to_col))
+    return moves
+
+
+def test_generate_moves_matches_baseline(walk_positions):
+    for board in walk_positions:
+        assert board.get_valid_moves() == baseline_moves(board)
+
+
+def test_game_state_index_follows_moves(game_state_deal):
+    game_state = game_state_deal(7)
+    rng = random.Random(7)
+    for _ in range(80):
+        board = Board.from_game_state(game_state)
+        assert tuple(game_state.index) == board.index
+        moves = game_state.get_valid_moves()
+        assert moves == baseline_moves(board)
+        if not moves:
+            break
+
+        # Undoing a move puts every top back in the index
+        steps = game_state.do_move(rng.choice(moves))
+        game_state.undo_move(steps)
+        assert tuple(game_state.index) == board.index
+
+        game_state.do_move(rng.choice(moves))
@@ -0,0 +1,137 @@
+# test_move_pruning.py
+
+import random
+
+import pytest
+
+from solvers.board import Board, SUITS, NUM_RANKS
+from solvers.bfs_solver import BFSSolver
+from solvers.canonical import same_position
+from solvers.dfs_solver import DFSSolver
+from solvers.greedy_solver import GreedySolver
+from solvers.move_pruning import prune_moves, ALL_RULES, SHORTEST_RULES
+
+# Small positions checked for completeness, and the cards left in play in each
+SMALL_POSITIONS = 120
+SMALL_CARDS = (8, 16)
+
+
+def is_subsequence(kept, moves):
+    remaining = iter(moves)
+    return all(move in remaining for move in kept)
+
+
+def small_position(rng):
+    """Random position with a few cards left in play, none of them due for promotion"""
+    while True:
+        heights = [NUM_RANKS] * len(SUITS)
+        for _ in range(rng.randint(*SMALL_CARDS)):
+            suit = rng.choice([suit for suit, height in enumerate(heights) if height > 0])
+            heights[suit] -= 1
+        left = [suit * NUM_RANKS + value for suit, height in enumerate(heights) for value in range(height, NUM_RANKS)]
+        rng.shuffle(left)
+        columns = [[] for _ in range(rng.randint(3, 8))]
+        for card in left:
+            rng.choice(columns).append(card)
+        if all(not column or column[-1] % NUM_RANKS != min(heights) for column in columns):
+            return Board(tuple(tuple(column) for column in columns), tuple(heights))
+
+
+@pytest.mark.parametrize("rules", [ALL_RULES, SHORTEST_RULES])
+def test_keeps_a_subset_in_order(walk_positions, rules):
+    for board in walk_positions:
+        moves = board.get_valid_moves()
+        kept = prune_moves(board, moves, rules=rules)
+        assert is_subsequence(kept, moves)
+        assert bool(kept) == bool(moves)
+
+
+def test_safe_foundation_move_is_forced(cards):
+    board = Board((cards("5S AH"), cards("6C 5D"), cards("6H")), (0,) * len(SUITS))
+    moves = board.get_valid_moves()
+
+    assert prune_moves(board, moves) == [("foundation", 0)]
+    assert prune_moves(board, moves, rules=SHORTEST_RULES) == moves
+
+
+def test_one_target_per_source_column(cards):
+    # 6S is further from its foundation than 6C, so covering it costs less
+    board = Board((cards("5H"), cards("6S"), cards("6C")), (0, 0, 4, 0))
+    moves = board.get_valid_moves()
+
+    assert moves == [("tableau", 0, 1), ("tableau", 0, 2)]
+    assert prune_moves(board, moves) == [("tableau", 0, 1)]
+    assert prune_moves(board, moves, rules=SHORTEST_RULES) == moves
+
+
+def test_card_on_a_target_keeps_every_target(cards):
+    # From the kept child of the test above, 5H can still go on to 6C
+    board = Board((cards("6S 5H"), cards("6C")), (0, 0, 4, 0))
+    moves = board.get_valid_moves()
+
+    assert prune_moves(board, moves) == moves == [("tableau", 0, 1)]
+
+
+def test_reversal_is_dropped_only_when_it_gives_back_the_parent(walk_positions):
+    dropped = 0
+    for parent in walk_positions:
+        for move in parent.get_valid_moves():
+            if move[0] != "tableau":
+                continue
+            child = parent.apply_move(move)
+            moves = child.get_valid_moves()
+            kept = prune_moves(child, moves, move, parent.key, SHORTEST_RULES)
+            for lost in set(moves) - set(kept):
+                assert lost == ("tableau", move[2], move[1])
+                assert same_position(child.apply_move(lost), parent)
+                dropped += 1
+    assert dropped
+
+
+def test_reversal_after_a_promotion_is_kept(cards):
+    # Moving 5S uncovers 2H, which goes home: moving 5S back doesn't undo that
+    parent = Board((cards("6C 2H 5S"), cards("6D")), (1, 1, 1, 1))
+    move = ("tableau", 0, 1)
+    child = parent.apply_move(move)
+    reverse = ("tableau", 1, 0)
+
+    assert child.foundations == (2, 1, 1, 1)
+    assert reverse in child.get_valid_moves()
+    assert reverse in prune_moves(child, child.get_valid_moves(), move, parent.key, SHORTEST_RULES)
+
+
+def test_pruned_search_solves_from_every_position_of_a_solution(fixture_board, solution_line, capsys):
+    solution = DFSSolver(fixture_board, move_pruning=False).solve()
+
+    for board in solution_line(fixture_board, solution):
+        solution_line(board, DFSSolver(board, move_pruning=ALL_RULES).solve())
+
+
+def test_pruned_search_is_complete_on_small_positions(capsys):
+    # Exhaustive searches: a pruned one must win exactly where a full one does
+    rng = random.Random(0)
+    solvable = 0
+    for _ in range(SMALL_POSITIONS):
+        board = small_position(rng)
+        full = DFSSolver(board, max_depth=10 ** 6, prune_dead=False, move_pruning=False).solve()
+        pruned = DFSSolver(board, max_depth=10 ** 6, prune_dead=False, move_pruning=ALL_RULES).solve()
+        assert (pruned is None) == (full is None), board
+        solvable += full is not None
+    assert 0 < solvable < SMALL_POSITIONS
+
+
+def test_best_first_search_only_drops_reversing_moves(board_file):
+    fixture_board = board_file("very_easy.txt")
+    assert GreedySolver(fixture_board).move_rules() == SHORTEST_RULES
+    assert GreedySolver(fixture_board, move_pruning=ALL_RULES).move_rules() == ALL_RULES
+    assert not GreedySolver(fixture_board, move_pruning=False).move_rules()
+
+
+@pytest.mark.parametrize("name", ["very_easy.txt", "near_goal_test.txt"])
+def test_shortest_pruning_keeps_the_optimal_length(name, board_file, capsys):
+    # Breadth-first search of algorithm_test.txt takes minutes
+    fixture_board = board_file(name)
+    pruned = BFSSolver(fixture_board).solve()
+    full = BFSSolver(fixture_board, move_pruning=False).solve()
+
+    assert len(pruned) == len(full)
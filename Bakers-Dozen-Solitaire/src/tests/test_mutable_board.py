@@ -0,0 +1,60 @@
+# test_mutable_board.py
+
+from solvers.board import Board, MutableBoard
+from solvers.dfs_solver import DFSSolver
+
+
+def test_solution_walks_to_the_goal_and_back(fixture_board, capsys):
+    moves = DFSSolver(fixture_board).solve()
+    board = MutableBoard(fixture_board)
+    records = []
+    for move in moves:
+        assert move in board.get_valid_moves()
+        records.append(board.do_move(move))
+    assert board.is_goal_state()
+
+    for record in reversed(records):
+        board.undo_move(record)
+    restored = board.snapshot()
+    assert restored == fixture_board
+    assert (restored.key, restored.totals, restored.index) == \
+        (fixture_board.key, fixture_board.totals, fixture_board.index)
+
+
+def test_promotion_cascade_is_undone_exactly(cards):
+    # Moving 5S uncovers AH, then 2H and AD follow it home
+    board = Board((cards("2H AD"), cards("6C AH 5S"), cards("6D")), (0, 0, 1, 1))
+    mutable = MutableBoard(board)
+    record = mutable.do_move(("tableau", 1, 2))
+
+    assert mutable.snapshot() == board.apply_move(("tableau", 1, 2))
+    assert [step[1] for step in record[3]] == [2, None, None, None]
+    mutable.undo_move(record)
+    assert mutable.snapshot() == board
+    assert mutable.key == board.key
+
+
+def test_move_from_an_empty_column_changes_nothing(cards):
+    board = Board(((), cards("5S")), (0, 0, 0, 0))
+    mutable = MutableBoard(board)
+    record = mutable.do_move(("foundation", 0))
+
+    assert record[3] == []
+    mutable.undo_move(record)
+    assert mutable.snapshot() == board
+
+
+def test_dfs_copies_only_the_positions_it_stores(board_file, monkeypatch, capsys):
+    played = []
+    snapshots = []
+    do_move, snapshot = MutableBoard.do_move, MutableBoard.snapshot
+    monkeypatch.setattr(MutableBoard, "do_move", lambda board, move: played.append(move) or do_move(board, move))
+    monkeypatch.setattr(MutableBoard, "snapshot", lambda board: snapshots.append(1) or snapshot(board))
+    # Without move pruning, reversals lead back to positions already visited
+    solver = DFSSolver(board_file("test_replay_state.txt"), move_pruning=False)
+    solver.solve()
+
+    # The root is stored as given; every other entry is one snapshot, and
+    # the children already visited were rejected without one
+    assert len(snapshots) == len(solver.visited) - 1
+    assert len(played) > len(snapshots)
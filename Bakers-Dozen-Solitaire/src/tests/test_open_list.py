@@ -0,0 +1,67 @@
+# test_open_list.py
+
+import random
+
+import pytest
+
+from solvers.astar_solver import AStarSolver
+from solvers.greedy_solver import GreedySolver
+from solvers.open_list import BucketQueue, TIE_BREAKS
+
+
+class Node:
+    def __init__(self, depth, number):
+        self.depth = depth
+        self.number = number
+
+
+def pushed(seed, count=300):
+    """Nodes in push order, with priorities on the 0.5 grid and many ties"""
+    rng = random.Random(seed)
+    return [(rng.randint(0, 20) * 0.5, Node(rng.randint(0, 5), number)) for number in range(count)]
+
+
+def drain(queue):
+    nodes = []
+    while queue:
+        nodes.append(queue.pop())
+    return nodes
+
+
+@pytest.mark.parametrize("tie_break, order", [
+    ("shallow", lambda priority, node: (priority, node.depth, node.number)),
+    ("deep", lambda priority, node: (priority, -node.depth, node.number)),
+    ("fifo", lambda priority, node: (priority, node.number)),
+    ("lifo", lambda priority, node: (priority, -node.number)),
+])
+def test_pops_in_priority_then_tie_break_order(tie_break, order):
+    entries = pushed(0)
+    queue = BucketQueue(tie_break=tie_break)
+    for priority, node in entries:
+        queue.push(priority, node)
+
+    assert len(queue) == len(entries)
+    assert drain(queue) == [node for priority, node in sorted(entries, key=lambda entry: order(*entry))]
+
+
+def test_interleaved_pushes_keep_the_minimum_first():
+    queue = BucketQueue()
+    waiting = {}  # number -> priority of the nodes still queued
+    for priority, node in pushed(1):
+        queue.push(priority, node)
+        waiting[node.number] = priority
+        if node.number % 3 == 0:
+            lowest = min(waiting.values())
+            assert waiting.pop(queue.pop().number) == lowest
+    assert len(queue) == len(waiting)
+
+
+def test_unknown_tie_break_is_rejected():
+    with pytest.raises(ValueError):
+        BucketQueue(tie_break="random")
+
+
+@pytest.mark.parametrize("tie_break", TIE_BREAKS)
+def test_solvers_solve_with_every_tie_break(tie_break, fixture_board, solution_line, capsys):
+    for solver_class in (AStarSolver, GreedySolver):
+        solution_line(fixture_board, solver_class(fixture_board, verbose=False, tie_break=tie_break).solve())
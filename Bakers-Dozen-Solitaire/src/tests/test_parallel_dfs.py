@@ -0,0 +1,44 @@
+# test_parallel_dfs.py
+
+import threading
+
+from solvers.board import Board, MutableBoard
+from solvers.external_bfs import record_size
+from solvers.parallel_dfs import ParallelDFSSolver, _Worker, LOCK_STRIPES
+
+
+def filter_worker(initial_state, table):
+    """A worker with only the shared filter set up, as the processes see it"""
+    shared = (None, None, None, None, None, table, [threading.Lock() for _ in range(LOCK_STRIPES)])
+    return _Worker(shared, (initial_state, 100, frozenset(), True, 1000))
+
+
+def test_idle_workers_steal_from_a_single_task(board_file, solution_line, capsys):
+    board = board_file("algorithm_test.txt")
+    solver = ParallelDFSSolver(board, workers=3, split_depth=0)
+
+    solution_line(board, solver.solve())
+    assert solver.tasks == 1
+
+
+def test_tree_without_a_goal_ends(cards, capsys):
+    # 5S can shuttle between 6C and 6D, but 2H covers AH for good
+    board = Board((cards("AH 2H"), cards("6C 5S"), cards("6D")), (0, 13, 13, 13))
+    solver = ParallelDFSSolver(board, workers=2, split_depth=1, prune_dead=False)
+
+    assert solver.solve() is None
+    assert solver.tasks > 0
+
+
+def test_shared_filter_never_confuses_colliding_positions(walk_positions):
+    # Workers claim the MutableBoard they walk
+    first, second = (MutableBoard(Board(board.tableau, board.foundations, key=7)) for board in walk_positions[:2])
+    table = bytearray(4 * record_size(len(first.tableau)))
+    one, other = filter_worker(first, table), filter_worker(first, table)
+
+    assert one.claim(first)
+    assert other.claim(second)      # Same slot, another position: not a hit
+    assert not one.claim(second)    # Seen by this worker
+    assert not other.claim(second)
+    assert filter_worker(first, table).claim(first)  # Overwritten in the table: forgotten
+    assert not filter_worker(first, table).claim(first)  # Written back: a hit for any worker
@@ -0,0 +1,33 @@
+# test_portfolio.py
+
+from solvers.greedy_solver import GreedySolver
+from solvers.portfolio import PortfolioSolver, run_astar_2
+from solvers.solver_base import SearchStopped
+
+
+def crash(initial_state):
+    raise ValueError("bad heuristic")
+
+
+def give_up(initial_state):
+    raise SearchStopped()
+
+
+def test_first_solution_wins(fixture_board, solution_line, capsys):
+    portfolio = [("Greedy", GreedySolver, {"verbose": False}), ("A* 2", run_astar_2, {})]
+    solver = PortfolioSolver(fixture_board, portfolio=portfolio)
+
+    solution_line(fixture_board, solver.solve())
+    assert solver.winner in ("Greedy", "A* 2")
+    assert not solver.errors
+
+
+def test_crashes_are_reported_and_stops_are_not(board_file, capsys):
+    board = board_file("algorithm_test.txt")
+    portfolio = [("Crash", crash, {}), ("Stop", give_up, {})]
+    solver = PortfolioSolver(board, portfolio=portfolio, verbose=False)
+
+    assert solver.solve() is None
+    assert solver.errors == {"Crash": "ValueError: bad heuristic"}
+    assert "Crash failed: ValueError: bad heuristic" in capsys.readouterr().out
+    assert sorted(report[4] or "" for report in solver.results) == ["", "ValueError: bad heuristic"]
@@ -0,0 +1,67 @@
+# test_search_stream.py
+
+import pytest
+
+from solvers.astar_solver import AStarSolver
+from solvers.board import Board
+from solvers.dfs_solver import DFSSolver
+from solvers.ida_star_solver import IDAStarSolver
+
+
+@pytest.mark.parametrize("solver_class", [AStarSolver, DFSSolver, IDAStarSolver])
+def test_last_snapshot_carries_the_solution(solver_class, fixture_board, solution_line, capsys):
+    solver = solver_class(fixture_board, verbose=False, progress_interval=5)
+    snapshots = list(solver.search())
+
+    assert [snapshot.done for snapshot in snapshots] == [False] * (len(snapshots) - 1) + [True]
+    assert snapshots[-1].solution == solver.solution
+    solution_line(fixture_board, solver.solution)
+    counts = [snapshot.nodes_expanded for snapshot in snapshots]
+    assert counts == sorted(counts)
+
+
+def test_best_line_reaches_the_reported_foundations(board_file, capsys):
+    board = board_file("algorithm_test.txt")
+    for snapshot in AStarSolver(board, verbose=False, progress_interval=3).search():
+        position = board
+        for move in snapshot.best_line:
+            position = position.apply_move(move)
+        assert position.foundation_count() == snapshot.foundations
+
+
+def test_pause_then_resume_gives_the_same_solution(board_file, capsys):
+    board = board_file("algorithm_test.txt")
+    paused = AStarSolver(board, verbose=False, progress_interval=3)
+    search = paused.search()
+    first = next(search)
+
+    # Nothing runs between two requests, even while another search does
+    other = AStarSolver(board, verbose=False).solve()
+    assert paused.nodes_expanded == first.nodes_expanded
+
+    for snapshot in search:
+        pass
+    assert snapshot.done
+    assert snapshot.solution == other
+
+
+def test_closing_the_generator_cancels_the_search(board_file, capsys):
+    solver = AStarSolver(board_file("algorithm_test.txt"), verbose=False, progress_interval=3)
+    search = solver.search()
+    first = next(search)
+    search.close()
+
+    assert not first.done
+    assert solver.solution is None
+    assert solver.nodes_expanded == first.nodes_expanded
+    with pytest.raises(StopIteration):
+        next(search)
+
+
+def test_dead_deal_yields_one_final_snapshot(cards, capsys):
+    # 2H covers AH and has nowhere to go
+    solver = AStarSolver(Board((cards("AH 2H"), ()), (0, 13, 13, 13)), verbose=False)
+    snapshots = list(solver.search())
+
+    assert len(snapshots) == 1 and snapshots[0].done
+    assert snapshots[0].solution is None and solver.unsolvable
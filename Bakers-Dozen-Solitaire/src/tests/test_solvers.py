@@ -0,0 +1,50 @@
+# test_solvers.py
+
+# What every solver must do; each solver's own test file covers the rest
+
+import pytest
+
+from solvers.astar_2_solver import AStar2Solver
+from solvers.astar_solver import AStarSolver
+from solvers.beam_solver import BeamSolver
+from solvers.bfs_solver import BFSSolver
+from solvers.board import Board, SUITS, NUM_RANKS
+from solvers.dfs_solver import DFSSolver
+from solvers.external_bfs import ExternalBFSSolver
+from solvers.greedy_solver import GreedySolver
+from solvers.hda_star import HDAStarSolver
+from solvers.ida_star_solver import IDAStarSolver
+from solvers.monte_carlo import NestedMonteCarloSolver
+from solvers.parallel_dfs import ParallelDFSSolver
+
+# (solver class, constructor arguments); the process-based ones run two workers
+SOLVERS = [
+    pytest.param(DFSSolver, {}, id="dfs"),
+    pytest.param(GreedySolver, {"verbose": False}, id="greedy"),
+    pytest.param(AStarSolver, {"verbose": False}, id="astar"),
+    pytest.param(AStar2Solver, {}, id="astar2"),
+    pytest.param(IDAStarSolver, {}, id="ida"),
+    pytest.param(BeamSolver, {}, id="beam"),
+    pytest.param(NestedMonteCarloSolver, {"seed": 0}, id="nmcs"),
+    pytest.param(HDAStarSolver, {"workers": 2, "round_size": 50}, id="hda"),
+    pytest.param(ParallelDFSSolver, {"workers": 2}, id="parallel_dfs"),
+    pytest.param(ParallelDFSSolver, {"workers": 2, "shared_filter": True}, id="parallel_dfs_filter"),
+]
+
+# Breadth-first searches take minutes on algorithm_test.txt
+BREADTH_FIRST = [
+    pytest.param(BFSSolver, {}, id="bfs"),
+    pytest.param(ExternalBFSSolver, {}, id="xbfs"),
+]
+
+
+@pytest.mark.parametrize("solver_class, kwargs", SOLVERS)
+def test_solves_fixture_boards(solver_class, kwargs, fixture_board, solution_line, capsys):
+    solution_line(fixture_board, solver_class(fixture_board, **kwargs).solve())
+
+
+@pytest.mark.parametrize("solver_class, kwargs", SOLVERS + BREADTH_FIRST)
+def test_won_board_is_solved_in_no_moves(solver_class, kwargs, capsys):
+    won = Board(((),) * 13, (NUM_RANKS,) * len(SUITS))
+
+    assert solver_class(won, **kwargs).solve() == []
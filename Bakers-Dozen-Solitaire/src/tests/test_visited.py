@@ -0,0 +1,68 @@
+# test_visited.py
+
+from solvers.board import Board
+from solvers.canonical import canonical_form
+from solvers.solver_base import VisitedSet, PositionMap, SearchNode
+
+
+def forced_collision(walk_positions):
+    """Two different positions carrying the same Zobrist key"""
+    first, second = walk_positions[0], walk_positions[1]
+    return (Board(first.tableau, first.foundations, key=7),
+            Board(second.tableau, second.foundations, key=7))
+
+
+def test_visited_set_counts_each_position_once(walk_positions):
+    visited = VisitedSet()
+    forms = set()
+    for board in walk_positions:
+        for child in [board] + [board.apply_move(move) for move in board.get_valid_moves()]:
+            assert (child in visited) == (canonical_form(child) in forms)
+            visited.add(child)
+            forms.add(canonical_form(child))
+    assert len(visited) == len(forms)
+
+
+def test_visited_set_keeps_colliding_positions_apart(walk_positions):
+    first, second = forced_collision(walk_positions)
+    visited = VisitedSet()
+    visited.add(first)
+
+    assert first.key == second.key
+    assert second not in visited
+    visited.add(second)
+    visited.add(SearchNode(first))  # A node is compared by its board
+    assert first in visited and second in visited
+    assert len(visited) == 2
+
+
+def test_position_map_keeps_colliding_values_apart(walk_positions):
+    first, second = forced_collision(walk_positions)
+    depths = PositionMap()
+    depths[first] = 3
+
+    assert depths.get(second) is None
+    depths[second] = 5
+    depths[first] = 2
+    assert (depths.get(first), depths.get(second)) == (2, 5)
+    assert len(depths) == 2
+
+
+def test_passed_board_spares_rebuilding_the_node(walk_positions, monkeypatch):
+    parent = walk_positions[0]
+    move = parent.get_valid_moves()[0]
+    child = parent.apply_move(move)
+    node = SearchNode(child, SearchNode(parent), move, 1, keep_state=False)
+    visited = VisitedSet()
+    visited.add(child)
+    depths = PositionMap()
+    depths[child] = 1
+
+    def rebuilt(board, move):
+        raise AssertionError("node board rebuilt")
+    monkeypatch.setattr(Board, "apply_move", rebuilt)
+
+    visited.add(node, child)
+    depths.set(node, 2, child)
+    assert len(visited) == 1
+    assert depths.get(node, state=child) == 2 and len(depths) == 1